@@ -1,8 +1,26 @@
+import time
 import sys
 import os
-from PySide6.QtWidgets import *
-from PySide6.QtGui import *
-from PySide6.QtCore import *
+import math
+import argparse
+import bisect
+from contextlib import contextmanager, nullcontext
+import hashlib
+import json
+import struct
+import threading
+from array import array
+from collections import Counter, OrderedDict, namedtuple
+from functools import lru_cache
+from PySide6.QtCore import QLineF, QObject, QPointF, QRectF, QSize, Qt, QTimer, Signal, qVersion
+from PySide6.QtGui import (QBrush, QColor, QCursor, QFont, QImage, QKeySequence, QPainter, QPalette, QPen, QPixmap,
+                           QShortcut, QStaticText, QTransform)
+from PySide6.QtWidgets import (QApplication, QCheckBox, QComboBox, QGraphicsEllipseItem, QGraphicsItem,
+                               QGraphicsOpacityEffect, QGraphicsPixmapItem, QGraphicsProxyWidget, QGraphicsScene,
+                               QGraphicsTextItem, QGraphicsView, QLineEdit, QListView)
+
+# Référence du rapport de démarrage (--startup-report), prise après les imports : leur durée n'y est pas comptée
+_STARTUP_T0 = time.perf_counter()
 
 #Visual Practice rev0.8 © Guillaume Sahuc 2026/01
 #https://github.com/microDevSys/VisualPractice
@@ -30,6 +48,111 @@ DEGREE_COLORS = [
 FIRST_NOTE= DEGREE_COLORS[0]  # Couleur du 1er degré (tonique)
 FRET_LABELS = [0, 3, 5, 7, 9, 12, 15, 17, 19, 21, 24]
 STRING_TUNINGS = ['E', 'B', 'G', 'D', 'A', 'E', 'B', 'F#', 'C#', 'G#']
+STRING_COUNTS = range(4, 11)  # nombres de cordes proposés dans le menu (et acceptés pour un accordage)
+# Accordages proposés en plus de "Standard" (STRING_TUNINGS), de la corde la plus aiguë à la plus grave
+STANDARD_TUNING = "Standard"
+TUNING_PRESETS = {
+    "Drop D": ['E', 'B', 'G', 'D', 'A', 'D'],
+    "Half step down": ['Eb', 'Bb', 'Gb', 'Db', 'Ab', 'Eb'],
+    "Drop C": ['D', 'A', 'F', 'C', 'G', 'C'],
+    "DADGAD": ['D', 'A', 'G', 'D', 'A', 'D'],
+    "Open D": ['D', 'A', 'F#', 'D', 'A', 'D'],
+    "Open G": ['D', 'B', 'G', 'D', 'G', 'D'],
+    "Open E": ['E', 'B', 'G#', 'E', 'B', 'E'],
+    "Baritone B": ['B', 'F#', 'D', 'A', 'E', 'B'],
+    "7 strings Drop A": ['E', 'B', 'G', 'D', 'A', 'E', 'A'],
+    "Bass": ['G', 'D', 'A', 'E'],
+    "Bass 5 strings": ['G', 'D', 'A', 'E', 'B'],
+    "Bass 6 strings": ['C', 'G', 'D', 'A', 'E', 'B'],
+}
+# Accordages de l'utilisateur : {"nom": ["E", "B", ...], ...} (dossier courant ou dossier du script)
+TUNINGS_CONFIG_FILE = "visual_practice_tunings.json"
+# Nombre maximal d'items libres conservés par type dans le pool entre deux redessins
+POOL_MAX_ITEMS = 3000
+# Rendu du nom des notes : "painted" (dessiné par NoteItem) ou "item" (un NoteTextItem enfant par note)
+NOTE_LABEL_MODE = "painted"
+# Cache des diagrammes rendus en image (mode --pixmap-cache)
+PIXMAP_CACHE_MAX_MB = 256
+PIXMAP_MAX_SCALE = 4  # résolution maximale de rendu lors du zoom (mode --pixmap-hires)
+# Instrumentation (--profile ou variable d'environnement VP_PROFILE=1)
+PROFILE_ENV_VAR = "VP_PROFILE"
+PROFILE_LOG_FILE = "visual_practice_profile.jsonl"
+PROFILE_FRAME_WINDOW_S = 1.0  # les temps de dessin sont agrégés et écrits une fois par fenêtre
+# Regroupement des changements de réglages : délai avant reconstruction et durée max d'une tranche
+UPDATE_DELAY_MS = 40
+UPDATE_SLICE_MS = 8  # 0 = reconstruction en une seule fois
+# Précalcul des dispositions des patterns voisins dans le menu (0 = désactivé)
+PREFETCH_DEPTH = 2
+PREFETCH_CACHE_SIZE = 64
+# Niveaux de détail selon l'échelle de la vue (levelOfDetailFromTransform, 1.0 = taille réelle)
+LOD_LABEL_MIN = 0.45   # en dessous : noms des notes non dessinés
+LOD_DOT_MIN = 0.25     # en dessous : notes réduites à un disque plein de la couleur du degré
+LOD_OUTLINE_MAX = 0.12 # en dessous : manche réduit à son contour
+# Galeries (patterns "Gallery -...") : manches matérialisés au-delà de la zone visible, de chaque côté
+GALLERY_MARGIN_NECKS = 1
+SCENE_MARGIN = 100  # marge autour du contenu (en-tête + manches) pour le rectangle de la scène
+# Réglages de l'application : {"render_profile": "fast", "render_profiles": {"nom": {...}}, "zoom_min": 0.1, ...}
+CONFIG_FILE = "visual_practice.json"
+# Profil de rendu de la vue (voir RENDER_PROFILES), remplacé par la configuration puis par --render-profile
+RENDER_PROFILE = "default"
+RENDER_BENCHMARK_FRAMES = 240  # images par profil pour --render-benchmark
+
+ZOOM_STEP = 1.05  # facteur de zoom par cran de molette (120 unités de angleDelta)
+ZOOM_MIN_SCALE = 0.05  # bornes de l'échelle de la vue, remplacées par "zoom_min" / "zoom_max" de la configuration
+ZOOM_MAX_SCALE = 4.0
+ZOOM_FRAME_MS = 16  # le zoom cumulé par la molette est appliqué au plus une fois par image
+ZOOM_EASING = 0.35  # part de l'écart restant (en échelle logarithmique) rattrapée à chaque image
+
+# Recherche des doigtés d'accords (voir find_chord_voicings)
+VOICING_MAX_SPAN = 4  # écart maximal entre la case frettée la plus basse et la plus haute, en cases comprises
+VOICING_MAX_FINGERS = 4  # doigts disponibles, un barré sur la case la plus basse comptant pour un seul
+VOICING_MAX_INNER_MUTED = 1  # cordes étouffées entre deux cordes jouées
+VOICING_MIN_STRINGS = 3
+VOICING_MAX_RESULTS = 48  # doigtés gardés par accord après classement
+VOICING_PER_POSITION = 2  # doigtés gardés par case de départ, pour chaque niveau de qualité
+VOICING_OPEN_MAX_FRET = 3  # doigtés de première position (accords ouverts) : toutes les cases frettées jusqu'ici
+VOICING_OPEN_SHAPES = 12  # accords ouverts gardés en tête, en plus de VOICING_PER_POSITION par position
+VOICING_SEARCH_LIMIT = 20000  # doigtés complets examinés au plus par accord (borne le pire cas à 10 cordes)
+VOICING_MAX_FRET = 12  # doigtés cherchés jusqu'à cette case : au-delà, les mêmes formes à l'octave
+VOICING_SHAPE_COLOR = "#96FFA500"  # forme du doigté affiché (#AARRGGBB)
+
+# Positions de gammes (voir ScalePositionIndex) : une position par degré de la gamme sur la corde la plus grave
+POSITION_BOX_SPAN = 5  # cases d'une position "box" (un doigt par case + une extension)
+POSITION_MAX_FRET = 24  # les positions sont indexées pour le plus long manche proposé
+POSITION_KINDS = {"box": "Box", "nps": "Per string"}  # type de position -> nom affiché
+POSITIONS_CACHE_FILE = "visual_practice_positions.json"  # dossier courant s'il y est, sinon à côté du script
+POSITIONS_CACHE_VERSION = 2  # format du fichier et calcul des positions : à augmenter quand l'un d'eux change
+
+# Synthèse sonore (NumPy, optionnel) : --audio et touche P
+SYNTH_SAMPLE_RATE = 44100
+SYNTH_NOTE_SECONDS = 1.5  # durée d'une note, décroissance comprise
+SYNTH_STEP_SECONDS = 0.25  # écart entre deux notes d'une gamme ou d'un arpège
+SYNTH_STRUM_SECONDS = 0.04  # écart entre deux cordes d'un doigté gratté
+SYNTH_HARMONICS = 16
+SYNTH_PLUCK_POSITION = 0.2  # point d'attaque de la corde (fraction de sa longueur) : règle le timbre
+SYNTH_DECAY = 2.5  # amortissement de la fondamentale (1/s), plus rapide pour les harmoniques aiguës
+SYNTH_BANK_SIZE = 128  # notes synthétisées gardées en mémoire (LRU)
+SYNTH_HIGHEST_STRING_MIDI = 64  # corde la plus aiguë : la plus haute note de son nom jusqu'au mi aigu (E4)
+
+# Détection de hauteur dans un enregistrement (NumPy, optionnel) : --detect-notes et --follow
+PITCH_WINDOW = 4096  # échantillons par trame d'analyse : au moins deux périodes de la note la plus grave
+PITCH_HOP = 1024  # écart entre deux trames (23 ms à 44.1 kHz)
+PITCH_BLOCK_FRAMES = 256  # trames analysées ensemble : le fichier est lu par blocs de taille fixe
+PITCH_MIN_HZ = 40.0  # un peu sous la corde grave d'une 8 cordes (F#1, 46 Hz)
+PITCH_MAX_HZ = 1400.0  # case 24 de la corde aiguë (E6, 1319 Hz)
+PITCH_MIN_CLARITY = 0.7  # pic d'autocorrélation normalisé en dessous duquel la trame n'a pas de hauteur
+PITCH_PEAK_RATIO = 0.9  # premier pic à 90 % du plus haut : évite de prendre l'octave inférieure
+PITCH_MAX_RIVAL_RATIO = 0.6  # pic plus haut avant la période retenue : plusieurs notes mêlées, pas de hauteur
+PITCH_MIN_RMS = 0.01  # trames plus faibles (-40 dBFS) considérées comme silencieuses
+PITCH_MIN_FRAMES = 2  # trames consécutives de même hauteur pour former une note
+HIGHLIGHT_COLOR = "#7CFC00"  # disque des notes entendues
+OUT_OF_SCALE_COLOR = "#FF4040"  # titre des manches qui ne contiennent pas la note entendue
+FOLLOW_MAX_WAIT_MS = 50  # réveil au plus tard entre deux notes : recale le suivi sur une horloge audio qui dérive
+FOLLOW_STATS_MS = 500  # période d'affichage du retard des notes allumées
+
+# Suivi de fichiers MIDI (--follow FICHIER.mid) et de flux MIDI bruts (--follow-port)
+MIDI_PERCUSSION_CHANNEL = 9  # canal 10 : batterie General MIDI, sans hauteur à montrer sur le manche
+MIDI_SEND_VELOCITY = 100  # vélocité des notes envoyées par --send-midi
 
 # Liste des notes avec dièses et bémols
 notes_sharp = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
@@ -43,21 +166,6 @@ enharmonic_notes = {
     "E#": "F"  # Mi dièse est équivalent à Fa
 }
 
-enharmonic_tunings_notes = {
-    "F#": "Gb",  # Fa dièse est équivalent à Sol bémol
-    "C#": "Db",  # Do dièse est équivalent à Ré bémol
-    "G#": "Ab" # Sol dièse est équivalent à La bémol
-}
-
-enharmonic_accidentals_notes = {
-    "Eb" : "D#",
-    "Ab" : "G#", 
-    "Db" : "C#",
-    "Gb" : "F#",
-    "Cb" : "B",
-    "Fb" : "E"
-}
-
 # Schéma des intervalles pour différents types de gammes
 SCALE_TYPES = {
     "major": [2, 2, 1, 2, 2, 2, 1],  # Gamme majeure (Ionien)
@@ -158,24 +266,132 @@ cycle_of_fifths_minor = [
     "Eb minor", "Bb minor", "F minor",  "C minor",  "G minor", "D minor",     # Bémols
 ]
 
-def get_note_by_interval(root_note, interval, use_sharps=True):
-    # Vérifie si la note de départ est enharmonique
-    if root_note in enharmonic_notes:
-        root_note = enharmonic_notes[root_note]
-    
+# =============================================================================
+# NOYAU THÉORIQUE : ENSEMBLES DE CLASSES DE HAUTEUR SUR 12 BITS
+# =============================================================================
+# Gammes et accords sont des masques 12 bits (bit n = classe de hauteur n, 0 = C) construits une fois
+# sur C ; transposer revient à faire tourner le masque. Les noms de notes ne sont produits qu'à
+# l'affichage (notes_sharp / notes_flat selon l'armure) ou par l'orthographe diatonique ci-dessous.
+
+# Classe de hauteur (0 = C ... 11 = B) de chaque nom de note, dièses, bémols et enharmoniques
+NOTE_TO_PITCH_CLASS = {note: index for index, note in enumerate(notes_sharp)}
+NOTE_TO_PITCH_CLASS.update({note: index for index, note in enumerate(notes_flat)})
+NOTE_TO_PITCH_CLASS.update({"Cb": 11, "Fb": 4, "B#": 0, "E#": 5})
+
+# Orthographe par lettre : classe de hauteur des notes naturelles et altération selon l'écart
+NATURAL_NOTES = ["C", "D", "E", "F", "G", "A", "B"]
+NATURAL_PITCH_CLASSES = [0, 2, 4, 5, 7, 9, 11]
+ACCIDENTALS = {0: "", 1: "#", 2: "##", -1: "b", -2: "bb"}
+
+def get_pitch_class(note):
+    """Classe de hauteur d'un nom de note (ValueError si le nom est inconnu)."""
+    try:
+        return NOTE_TO_PITCH_CLASS[note]
+    except KeyError:
+        raise ValueError(f"Note inconnue : {note}") from None
+
+def intervals_to_offsets(intervals):
+    """Écarts depuis la fondamentale d'un schéma d'intervalles (ex: [2, 2, 1, ...] -> (0, 2, 4, ...))."""
+    offsets = []
+    offset = 0
+    for step in intervals:
+        offsets.append(offset % 12)
+        offset += step
+    return tuple(offsets)
+
+def offsets_to_mask(offsets):
+    mask = 0
+    for offset in offsets:
+        mask |= 1 << (offset % 12)
+    return mask
+
+def transpose_mask(mask, semitones):
+    """Transpose un ensemble de classes de hauteur par rotation du masque 12 bits."""
+    semitones %= 12
+    return ((mask << semitones) | (mask >> (12 - semitones))) & 0xFFF
+
+def mask_to_pitch_classes(mask, root=0):
+    """Classes de hauteur d'un masque, dans l'ordre croissant à partir de root."""
+    return tuple((root + offset) % 12 for offset in range(12) if mask >> ((root + offset) % 12) & 1)
+
+# Masques sur C de chaque gamme et de chaque accord
+SCALE_MASKS = {name: offsets_to_mask(intervals_to_offsets(steps)) for name, steps in SCALE_TYPES.items()}
+CHORD_MASKS = {name: offsets_to_mask(intervals) for name, intervals in CHORDS_INTERVALS.items()}
+
+@lru_cache(maxsize=None)
+def get_scale_mask(scale_type, root):
+    """Masque d'une gamme de SCALE_TYPES sur la classe de hauteur root."""
+    return transpose_mask(SCALE_MASKS[scale_type], root)
+
+@lru_cache(maxsize=None)
+def get_chord_mask(chord_type, root):
+    """Masque d'un accord de CHORDS_INTERVALS sur la classe de hauteur root."""
+    return transpose_mask(CHORD_MASKS[chord_type], root)
+
+def spell_pitch_classes(pitch_classes, use_sharps=True):
+    """Noms des classes de hauteur, en dièses ou en bémols (orthographe chromatique de l'affichage)."""
     notes = notes_sharp if use_sharps else notes_flat
-    if notes == notes_flat and  "#" in root_note:
-        root_note = enharmonic_tunings_notes[root_note]
-    if notes == notes_sharp and  "b" in root_note:
-        root_note = enharmonic_accidentals_notes[root_note]
+    return [notes[pitch_class] for pitch_class in pitch_classes]
 
-    # Trouve l'index de la note de départ
-    start_index = notes.index(root_note)
-    
-    # Calcule l'index de la note résultante
-    result_index = (start_index + interval) % len(notes)
-    # Retourne la note correspondante
-    return notes[result_index]
+def spell_diatonic(tonic_letter, tonic_pitch_class, offsets):
+    """
+    Orthographe diatonique : une lettre par degré, altérée pour atteindre la bonne hauteur.
+
+    :param tonic_letter: Index de la lettre de la tonique dans NATURAL_NOTES.
+    :param tonic_pitch_class: Classe de hauteur de la tonique.
+    :param offsets: Écarts des 7 degrés depuis la tonique.
+    :return: Liste des noms (ex: C# majeur -> C#, D#, E#, F#, G#, A#, B#).
+    """
+    names = []
+    for degree, offset in enumerate(offsets):
+        letter = (tonic_letter + degree) % 7
+        alteration = (tonic_pitch_class + offset - NATURAL_PITCH_CLASSES[letter]) % 12
+        if alteration > 6:
+            alteration -= 12
+        names.append(NATURAL_NOTES[letter] + ACCIDENTALS[alteration])
+    return names
+
+# Tonalités du tableau des accords par degré : nombre de dièses (>= 0) ou de bémols (< 0) de l'armure
+CHORDS_SCALES_SIGNATURES = [0, 1, 2, 3, 4, 5, 6, 7, -4, -3, -2, -1]
+
+def build_chords_scales(signatures=CHORDS_SCALES_SIGNATURES):
+    """
+    Accords de chaque degré des gammes majeures et mineures naturelles, pour chaque armure.
+
+    La tonique avance d'une quinte (4 lettres, 7 demi-tons) par dièse ; la relative mineure est
+    une sixte plus haut (5 lettres, 9 demi-tons). La qualité de chaque accord est reconnue en
+    comparant son masque aux accords de trois notes de CHORDS_INTERVALS.
+
+    :return: Dictionnaire {"C Major": [("C", "major"), ("D", "minor"), ...], ...}
+    """
+    triad_types = {}
+    for chord_type, intervals in CHORDS_INTERVALS.items():
+        if len(intervals) == 3:
+            triad_types.setdefault(CHORD_MASKS[chord_type], chord_type)
+    chords_scales = {}
+    for mode, letter_shift, pitch_shift in (("Major", 0, 0), ("Minor", 5, 9)):
+        offsets = intervals_to_offsets(SCALE_TYPES[mode.lower()])
+        for signature in signatures:
+            tonic_letter = (4 * signature + letter_shift) % 7
+            tonic_pitch_class = (7 * signature + pitch_shift) % 12
+            names = spell_diatonic(tonic_letter, tonic_pitch_class, offsets)
+            chords = []
+            for degree in range(7):
+                # Tierces superposées : degrés degree, degree + 2 et degree + 4
+                triad = [offsets[(degree + step) % 7] for step in (0, 2, 4)]
+                triad_mask = offsets_to_mask(offset - triad[0] for offset in triad)
+                chords.append((names[degree], triad_types[triad_mask]))
+            chords_scales[f"{names[0]} {mode}"] = chords
+    return chords_scales
+
+# Accords de chaque degré des gammes majeures et mineures
+Chords_scales = build_chords_scales()
+
+@lru_cache(maxsize=None)
+def get_note_by_interval(root_note, interval, use_sharps=True):
+    """Note située `interval` demi-tons au-dessus de root_note, nommée en dièses ou en bémols."""
+    notes = notes_sharp if use_sharps else notes_flat
+    return notes[(get_pitch_class(root_note) + interval) % 12]
 
 def get_notes_by_mode(root, mode):
     """
@@ -204,43 +420,74 @@ def get_notes_by_mode(root, mode):
     
     return notes
 
+@lru_cache(maxsize=None)
+def get_scale_pitch_classes(root, intervals):
+    """Classes de hauteur d'une gamme dans l'ordre du schéma, à partir de la classe root."""
+    return tuple((root + offset) % 12 for offset in intervals_to_offsets(intervals))
+
 def generate_scale(start_note, intervals, use_sharps=True):
     """Génère une gamme à partir d'une note de départ et d'un schéma d'intervalles."""
-    if start_note in enharmonic_notes:
-        start_note = enharmonic_notes[start_note]
-    
-    notes = notes_sharp if use_sharps else notes_flat
-    scale = []
-
-    start_index = notes.index(start_note)
-    
-    for step in intervals:
-        scale.append(notes[start_index % len(notes)])
-        start_index += step
-    
-    return scale
+    return spell_pitch_classes(get_scale_pitch_classes(get_pitch_class(start_note), tuple(intervals)), use_sharps)
 
 def get_key_signature(tonality):
     """Récupère les informations sur l'armure d'une tonalité."""
     return key_signatures.get(tonality, key_signatures_minor.get(tonality, {"use_sharps": True, "accidentals": []}))
 
+@lru_cache(maxsize=None)
+def _scales_in_cycle(scale_type, is_minor):
+    cycle = cycle_of_fifths_minor if is_minor else cycle_of_fifths_major
+    return tuple((tonality, tuple(generate_scale(tonality.split()[0], SCALE_TYPES[scale_type],
+                                                 get_key_signature(tonality)["use_sharps"])))
+                 for tonality in cycle)
+
 def generate_scales_in_cycle(scale_type, is_minor=False):
     """
     Génère toutes les gammes dans l'ordre du cycle des quintes.
     """
     if scale_type not in SCALE_TYPES:
         raise ValueError(f"Type de gamme inconnu : {scale_type}")
-    
-    cycle = cycle_of_fifths_minor if is_minor else cycle_of_fifths_major
-    all_scales = {}
-    
-    for tonality in cycle:
-        key_info = get_key_signature(tonality)
-        use_sharps = key_info["use_sharps"]
-        scale = generate_scale(tonality.split()[0], SCALE_TYPES[scale_type], use_sharps)
-        all_scales[tonality] = scale
-    
-    return all_scales
+    return {tonality: list(scale) for tonality, scale in _scales_in_cycle(scale_type, is_minor)}
+
+@lru_cache(maxsize=None)
+def get_fretboard_table(string_tunings, num_frets):
+    """
+    Table des classes de hauteur du manche, construite une seule fois par (accordage, nombre de cases).
+
+    :param string_tunings: Tuple des notes à vide (ex: ('E', 'B', 'G', 'D', 'A', 'E')).
+    :param num_frets: Nombre de cases.
+    :return: array('B') à plat, index = corde * (num_frets + 1) + case.
+    """
+    width = num_frets + 1
+    table = array("B")
+    for open_note in string_tunings:
+        open_pitch_class = NOTE_TO_PITCH_CLASS[open_note]
+        table.extend((open_pitch_class + fret) % 12 for fret in range(width))
+    return table
+
+@lru_cache(maxsize=None)
+def get_pattern_lookup(note_pattern):
+    """
+    Masque d'appartenance 12 bits et degré de chaque classe de hauteur d'un pattern.
+
+    :param note_pattern: Tuple de notes (gamme ou accord).
+    :return: (mask, degrees) où degrees[classe] est l'index de la note dans le pattern, ou None.
+    """
+    mask = 0
+    degrees = [None] * 12
+    for index, note in enumerate(note_pattern):
+        pitch_class = NOTE_TO_PITCH_CLASS[note]
+        if degrees[pitch_class] is None:
+            degrees[pitch_class] = index
+        mask |= 1 << pitch_class
+    return mask, tuple(degrees)
+
+@lru_cache(maxsize=4096)
+def get_masked_positions(string_tunings, num_frets, mask):
+    """Positions (corde, case, classe de hauteur) du manche retenues par un masque 12 bits."""
+    table = get_fretboard_table(string_tunings, num_frets)
+    width = num_frets + 1
+    return tuple((index // width, index % width, pitch_class)
+                 for index, pitch_class in enumerate(table) if mask >> pitch_class & 1)
 
 def create_styled_combo_box(font, palette, items=None, current_text=None):
     """Helper function to create a styled combo box with common settings."""
@@ -259,12 +506,18 @@ def create_styled_combo_box(font, palette, items=None, current_text=None):
 
 class SpaceComboBox(QComboBox):
     """QComboBox qui avance/recul de façon circulaire avec Haut, Bas ou Espace."""
+    # Gauche / Droite : -1 / +1, laissés à l'application (parcours des doigtés et des positions)
+    stepped = Signal(int)
+
     def keyPressEvent(self, event):
         count = self.count()
         if not count:
             return
 
-        if event.key() == Qt.Key_Up:
+        if event.key() in (Qt.Key_Left, Qt.Key_Right):
+            self.stepped.emit(-1 if event.key() == Qt.Key_Left else 1)
+
+        elif event.key() == Qt.Key_Up:
             # recule et boucle au dernier si on est au premier
             self.setCurrentIndex((self.currentIndex() - 1) % count)
 
@@ -279,7 +532,215 @@ class SpaceComboBox(QComboBox):
         else:
             super().keyPressEvent(event)
 
+_NO_PHASE = nullcontext()
+
+def format_counter(value):
+    """Valeur d'un compteur pour la surimpression (un dict, par type d'item par exemple, est totalisé)."""
+    if isinstance(value, dict):
+        value = sum(value.values())
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+class PerformanceMonitor:
+    """
+    Instrumentation optionnelle : durée de chaque phase de update_scene, nombre d'items par type,
+    temps de dessin et intervalle entre images de la vue, compteurs des caches et pools (add_counters).
+
+    Les mesures sont affichées en surimpression dans la vue (touche F3) et écrites en JSON lines.
+    """
+    def __init__(self, log_path=PROFILE_LOG_FILE):
+        self.log_file = open(log_path, "a", encoding="utf-8") if log_path else None
+        self.overlay_visible = True
+        self.current = None  # mesures de la mise à jour en cours
+        self.last_update = {}
+        self.paint_times = []
+        self.frame_intervals = []
+        self.last_frame_time = None
+        self.window_start = time.perf_counter()
+        self.last_frames = {}
+        self.counters = {}  # nom -> fonction renvoyant un dict de compteurs (méthode stats() d'un cache...)
+
+    def add_counters(self, name, stats):
+        """Relève stats() à chaque fin de mise à jour (journal) et à chaque dessin de la surimpression."""
+        self.counters[name] = stats
+
+    def write(self, record):
+        if self.log_file:
+            self.log_file.write(json.dumps(record) + "\n")
+            self.log_file.flush()
+
+    def begin_update(self, pattern_name):
+        self.current = {"event": "update", "time": time.time(), "pattern": pattern_name, "phases_ms": {}}
+        self.update_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Ajoute la durée du bloc à la phase `name` de la mise à jour en cours."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                phases = self.current["phases_ms"]
+                phases[name] = phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def end_update(self, scene):
+        if self.current is None:
+            return
+        self.current["total_ms"] = (time.perf_counter() - self.update_start) * 1000
+        self.current["items"] = dict(Counter(type(item).__name__ for item in scene.items() if item.isVisible()))
+        self.current["counters"] = {name: stats() for name, stats in self.counters.items()}
+        self.last_update = self.current
+        self.current = None
+        self.write(self.last_update)
+
+    def record_paint(self, paint_seconds):
+        now = time.perf_counter()
+        self.paint_times.append(paint_seconds * 1000)
+        if self.last_frame_time is not None:
+            self.frame_intervals.append((now - self.last_frame_time) * 1000)
+        self.last_frame_time = now
+        if now - self.window_start >= PROFILE_FRAME_WINDOW_S:
+            self.last_frames = {
+                "event": "frames",
+                "time": time.time(),
+                "frames": len(self.paint_times),
+                "paint_mean_ms": sum(self.paint_times) / len(self.paint_times),
+                "paint_max_ms": max(self.paint_times),
+                "frame_interval_mean_ms": (sum(self.frame_intervals) / len(self.frame_intervals)
+                                           if self.frame_intervals else None),
+                # Dessins des manches (NeckItem.paint) pendant la fenêtre
+                "neck_paint": NeckItem.paint_stats(),
+            }
+            NeckItem.reset_paint_stats()
+            self.write(self.last_frames)
+            self.paint_times = []
+            self.frame_intervals = []
+            self.window_start = now
+
+    def overlay_lines(self):
+        lines = []
+        if self.last_update:
+            lines.append(f"update {self.last_update['total_ms']:.1f} ms  ({self.last_update['pattern']})")
+            lines += [f"  {name:<22} {duration:5.1f} ms" for name, duration in self.last_update["phases_ms"].items()]
+            lines += [f"  {name:<22} {count:5d}" for name, count in sorted(self.last_update["items"].items())]
+        if self.last_frames:
+            lines.append(f"paint {self.last_frames['paint_mean_ms']:.1f} ms avg / "
+                         f"{self.last_frames['paint_max_ms']:.1f} ms max, {self.last_frames['frames']} frames")
+            neck_paint = self.last_frames["neck_paint"]
+            lines.append(f"  necks {neck_paint['paint_count']} paints, {neck_paint['paint_time_ms']:.1f} ms")
+        for name, stats in self.counters.items():
+            lines.append(f"{name:<10} " + "  ".join(f"{key} {format_counter(value)}" for key, value in stats().items()))
+        return lines
+
+    def close(self):
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+
+# Profils de rendu : mode de mise à jour de la vue, index de la scène, cache du fond, optimisations,
+# anticrénelage ("on", "off" ou "idle" : coupé pendant un déplacement ou un zoom de la vue) et viewport OpenGL
+RENDER_PROFILES = {
+    "default": {"update_mode": "minimal", "index": "bsp", "cache_background": False, "optimizations": [],
+                "antialiasing": "on", "opengl": False},
+    "fast": {"update_mode": "smart", "index": "bsp", "cache_background": True,
+             "optimizations": ["DontSavePainterState", "DontAdjustForAntialiasing"],
+             "antialiasing": "idle", "opengl": False},
+    "lowest": {"update_mode": "smart", "index": "bsp", "cache_background": True,
+               "optimizations": ["DontSavePainterState", "DontAdjustForAntialiasing"],
+               "antialiasing": "off", "opengl": False},
+    "full": {"update_mode": "full", "index": "none", "cache_background": False, "optimizations": [],
+             "antialiasing": "on", "opengl": False},
+    # Sans carte graphique : LIBGL_ALWAYS_SOFTWARE=1 (Mesa llvmpipe)
+    "opengl": {"update_mode": "full", "index": "bsp", "cache_background": False, "optimizations": [],
+               "antialiasing": "on", "opengl": True},
+}
+VIEWPORT_UPDATE_MODES = {
+    "minimal": QGraphicsView.MinimalViewportUpdate,
+    "smart": QGraphicsView.SmartViewportUpdate,
+    "bounding": QGraphicsView.BoundingRectViewportUpdate,
+    "full": QGraphicsView.FullViewportUpdate,
+}
+SCENE_INDEX_METHODS = {"bsp": QGraphicsScene.BspTreeIndex, "none": QGraphicsScene.NoIndex}
+VIEW_OPTIMIZATION_FLAGS = ["DontSavePainterState", "DontAdjustForAntialiasing"]
+
+def load_config(file_name=CONFIG_FILE):
+    """
+    Réglages de CONFIG_FILE (dossier courant ou dossier du script), {} s'il est absent.
+
+    :return: (réglages, liste des messages d'erreur)
+    """
+    path = find_data_file(file_name)
+    if path is None:
+        return {}, []
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as error:
+        return {}, [f"{path}: cannot read settings: {error}"]
+    if not isinstance(config, dict):
+        return {}, [f"{path}: settings must be a JSON object"]
+    return config, []
+
+def get_render_profiles(config):
+    """
+    RENDER_PROFILES complété par les profils "render_profiles" de la configuration.
+
+    Un profil de la configuration reprend les valeurs de "default" pour les réglages qu'il omet.
+
+    :return: (profils, liste des messages d'erreur)
+    """
+    profiles = dict(RENDER_PROFILES)
+    errors = []
+    for name, values in config.get("render_profiles", {}).items():
+        profile = dict(RENDER_PROFILES["default"], **values) if isinstance(values, dict) else None
+        if profile is None or profile["update_mode"] not in VIEWPORT_UPDATE_MODES \
+                or profile["index"] not in SCENE_INDEX_METHODS \
+                or profile["antialiasing"] not in ("on", "off", "idle") \
+                or not set(profile["optimizations"]) <= set(VIEW_OPTIMIZATION_FLAGS):
+            errors.append(f"ignoring render profile {name!r}: invalid settings")
+        else:
+            profiles[name] = profile
+    return profiles, errors
+
+def get_zoom_range(config):
+    """
+    Bornes de l'échelle de la vue : ZOOM_MIN_SCALE / ZOOM_MAX_SCALE ou "zoom_min" / "zoom_max" de la configuration.
+
+    :return: ((échelle minimale, échelle maximale), liste des messages d'erreur)
+    """
+    zoom_min = config.get("zoom_min", ZOOM_MIN_SCALE)
+    zoom_max = config.get("zoom_max", ZOOM_MAX_SCALE)
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (zoom_min, zoom_max)) \
+            or not 0 < zoom_min < zoom_max:
+        return (ZOOM_MIN_SCALE, ZOOM_MAX_SCALE), [f"ignoring zoom range {zoom_min!r}..{zoom_max!r}: "
+                                                  f"expected 0 < zoom_min < zoom_max"]
+    return (float(zoom_min), float(zoom_max)), []
+
+def create_opengl_viewport():
+    """
+    Viewport QOpenGLWidget multi-échantillonné, ou None si QtOpenGLWidgets n'est pas disponible ou si
+    aucun contexte OpenGL ne peut être créé (ex: QT_QPA_PLATFORM=offscreen).
+    """
+    try:
+        from PySide6.QtGui import QOpenGLContext, QSurfaceFormat
+        from PySide6.QtOpenGLWidgets import QOpenGLWidget
+    except ImportError:
+        return None
+    # Contexte d'essai : un QOpenGLWidget sans contexte ne se dessine pas (avertissements de QPainter)
+    if not QOpenGLContext().create():
+        return None
+    viewport = QOpenGLWidget()
+    surface_format = QSurfaceFormat()
+    surface_format.setSamples(4)
+    viewport.setFormat(surface_format)
+    return viewport
+
 class ZoomableGraphicsView(QGraphicsView):
+    zoomChanged = Signal(float)  # échelle horizontale de la vue après un zoom
+    visibleAreaChanged = Signal()  # défilement, zoom ou redimensionnement
+    sceneClicked = Signal(QPointF)  # clic sans déplacement (pas un glisser de la vue), en coordonnées de scène
+    frameDrawn = Signal()  # fin de chaque dessin de la vue
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setRenderHint(QPainter.Antialiasing)
@@ -288,55 +749,303 @@ class ZoomableGraphicsView(QGraphicsView):
         self.setDragMode(QGraphicsView.ScrollHandDrag)  
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        # Scène plus petite que la vue (rectangle calculé sur le contenu) : rester ancré en haut à gauche
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.monitor = None  # PerformanceMonitor optionnel
+        self.on_first_paint = None  # appelé une fois, après le premier dessin de la vue
+        self.press_position = None
+        self.antialiasing = "on"  # politique d'anticrénelage du profil de rendu
+        self.interacting = False
+        self.dragging = False
+        # Zoom à la molette : les crans sont cumulés dans zoom_target puis rattrapés image par image
+        self.min_scale = ZOOM_MIN_SCALE
+        self.max_scale = ZOOM_MAX_SCALE
+        self.zoom_target = None  # échelle visée par le geste en cours (None = pas de zoom en cours)
+        self.zoom_anchor = None  # (point de la vue, point de la scène) maintenus l'un sur l'autre pendant le zoom
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setInterval(ZOOM_FRAME_MS)
+        self.zoom_timer.timeout.connect(self.step_zoom)
 
-    def wheelEvent(self, event):
-        zoom_factor = 1.05
-        if event.angleDelta().y() > 0:
-            self.scale(zoom_factor, zoom_factor)
+    def apply_render_profile(self, profile):
+        """
+        Applique un profil de RENDER_PROFILES à la vue et à sa scène.
+
+        :return: False si le viewport OpenGL demandé n'a pas pu être créé (la vue reste en raster).
+        """
+        self.setViewportUpdateMode(VIEWPORT_UPDATE_MODES[profile["update_mode"]])
+        if self.scene() is not None:
+            self.scene().setItemIndexMethod(SCENE_INDEX_METHODS[profile["index"]])
+        self.setCacheMode(QGraphicsView.CacheBackground if profile["cache_background"] else QGraphicsView.CacheNone)
+        for flag_name in VIEW_OPTIMIZATION_FLAGS:
+            self.setOptimizationFlag(getattr(QGraphicsView, flag_name), flag_name in profile["optimizations"])
+        self.antialiasing = profile["antialiasing"]
+        self.setRenderHint(QPainter.Antialiasing, self.antialiasing == "on"
+                           or (self.antialiasing == "idle" and not self.interacting))
+        # Les grilles sont dessinées à part (cache par item) : elles ne suivent que le réglage "off"
+        NeckItem.antialiasing = self.antialiasing != "off"
+        if profile["opengl"]:
+            viewport = create_opengl_viewport()
+            if viewport is None:
+                return False
+            self.setViewport(viewport)
+        return True
+
+    def set_interacting(self, interacting):
+        """Début / fin d'un déplacement de la vue : politique "idle", anticrénelage coupé pendant le geste."""
+        self.interacting = interacting
+        if self.antialiasing == "idle":
+            self.setRenderHint(QPainter.Antialiasing, not interacting)
+            if not interacting:
+                self.viewport().update()
+
+    def update_interacting(self):
+        """Le geste dure tant que la vue est glissée ou qu'un zoom à la molette n'est pas terminé."""
+        interacting = self.dragging or self.zoom_timer.isActive()
+        if interacting != self.interacting:
+            self.set_interacting(interacting)
+
+    def paintEvent(self, event):
+        if self.monitor is None:
+            super().paintEvent(event)
         else:
-            self.scale(1 / zoom_factor, 1 / zoom_factor)
+            start = time.perf_counter()
+            super().paintEvent(event)
+            self.monitor.record_paint(time.perf_counter() - start)
+        self.frameDrawn.emit()
+        if self.on_first_paint is not None:
+            callback, self.on_first_paint = self.on_first_paint, None
+            callback()
+
+    def drawForeground(self, painter, rect):
+        if self.monitor is None or not self.monitor.overlay_visible:
+            return
+        # Surimpression en coordonnées de la vue, indépendante du zoom
+        painter.save()
+        painter.resetTransform()
+        painter.setFont(get_shared_font("Courier New", NOTE_FONT_SIZE))
+        lines = self.monitor.overlay_lines()
+        width = max((painter.fontMetrics().horizontalAdvance(line) for line in lines), default=0)
+        painter.fillRect(QRectF(5, 5, width + 14, 18 * len(lines) + 10), QColor(0, 0, 0, 180))
+        painter.setPen(QColor(0, 255, 0))
+        for i, line in enumerate(lines):
+            painter.drawText(QPointF(12, 24 + 18 * i), line)
+        painter.restore()
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        if self.monitor is not None and self.monitor.overlay_visible:
+            # Le défilement décale les pixels déjà dessinés : la surimpression doit être redessinée
+            self.viewport().update()
+        self.visibleAreaChanged.emit()
+
+    def mousePressEvent(self, event):
+        self.press_position = event.position().toPoint()
+        super().mousePressEvent(event)
+        if event.button() == Qt.LeftButton and self.dragMode() == QGraphicsView.ScrollHandDrag:
+            self.dragging = True
+            self.update_interacting()
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self.dragging:
+            self.dragging = False
+            self.update_interacting()
+        position = event.position().toPoint()
+        if self.press_position is not None \
+                and (position - self.press_position).manhattanLength() < QApplication.startDragDistance():
+            self.sceneClicked.emit(self.mapToScene(position))
+        self.press_position = None
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visibleAreaChanged.emit()
+
+    def visible_scene_rect(self):
+        """Zone de la scène actuellement affichée."""
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def toggle_overlay(self):
+        if self.monitor is not None:
+            self.monitor.overlay_visible = not self.monitor.overlay_visible
+            self.viewport().update()
+
+    def set_zoom(self, scale):
+        """Échelle fixée immédiatement (bornée), en abandonnant le zoom à la molette en cours."""
+        self.zoom_timer.stop()
+        self.zoom_target = None
+        self.zoom_anchor = None
+        self.resetTransform()
+        scale = min(max(scale, self.min_scale), self.max_scale)
+        self.scale(scale, scale)
+        self.update_interacting()
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta().y()
+        if delta == 0:
+            return
+        # Crans cumulés : une rafale d'événements (pavé tactile, molette libre) ne coûte qu'un dessin par image
+        target = self.zoom_target if self.zoom_target is not None else self.transform().m11()
+        self.zoom_target = min(max(target * ZOOM_STEP ** (delta / 120), self.min_scale), self.max_scale)
+        position = event.position()
+        self.zoom_anchor = (position.toPoint(), self.mapToScene(position.toPoint()))
+        if not self.zoom_timer.isActive():
+            self.zoom_timer.start()
+            self.update_interacting()
+        event.accept()
+
+    def step_zoom(self):
+        """Une image du zoom : rapproche l'échelle de zoom_target, le point sous la souris restant fixe."""
+        ratio = self.zoom_target / self.transform().m11()
+        finished = abs(math.log(ratio)) < 1e-3
+        zoom_factor = ratio if finished else ratio ** ZOOM_EASING
+        self.setTransformationAnchor(QGraphicsView.NoAnchor)
+        self.scale(zoom_factor, zoom_factor)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        view_point, scene_point = self.zoom_anchor
+        shift = self.mapFromScene(scene_point) - view_point
+        self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() + shift.x())
+        self.verticalScrollBar().setValue(self.verticalScrollBar().value() + shift.y())
+        if finished:
+            self.zoom_timer.stop()
+            self.zoom_target = None
+            self.zoom_anchor = None
+            self.update_interacting()
+        self.zoomChanged.emit(self.transform().m11())
+        self.visibleAreaChanged.emit()
+
+@lru_cache(maxsize=None)
+def get_shared_font(family, point_size):
+    """Police en gras partagée par tous les items d'une même famille et taille."""
+    font = QFont(family) if family else QFont()
+    font.setPointSize(point_size)
+    font.setBold(True)
+    return font
+
+@lru_cache(maxsize=None)
+def get_degree_pen(color):
+    """Contour partagé pour une couleur de degré (None = contour par défaut)."""
+    pen = QPen()
+    if color is not None:
+        pen.setWidth(3)
+        pen.setColor(QColor(color))
+    return pen
+
+@lru_cache(maxsize=None)
+def get_shared_brush(color):
+    """Remplissage partagé pour une couleur donnée."""
+    return QBrush(QColor(color))
+
+def get_note_color(is_first_note, degree_index, show_all_colors):
+    """Couleur du contour d'une note selon son degré et le mode de couleur (None = pas de couleur)."""
+    if show_all_colors:
+        # Mode toutes les couleurs
+        if degree_index is not None and 0 <= degree_index < len(DEGREE_COLORS):
+            return DEGREE_COLORS[degree_index]
+    elif is_first_note:
+        # Mode uniquement 1er degré
+        return FIRST_NOTE
+    return None
+
+@lru_cache(maxsize=None)
+def get_static_text(label, point_size):
+    """Texte pré-mis en page partagé par toutes les notes de même nom et de même taille."""
+    static_text = QStaticText(label)
+    static_text.setTextFormat(Qt.PlainText)
+    static_text.prepare(QTransform(), get_shared_font("Courier New", point_size))
+    return static_text
 
 class NoteTextItem(QGraphicsTextItem):
     def __init__(self, x, y, note, *args, **kwargs):
         super().__init__(note, *args, **kwargs)
         self.setDefaultTextColor(QColor("black"))
-        font = QFont("Courier New")
-        font.setPointSize(NOTE_FONT_SIZE)
-        font.setBold(True)
-        self.setFont(font)
+        self.setFont(get_shared_font("Courier New", NOTE_FONT_SIZE))
         self.setZValue(50)
         self.setPos(x - 11, y + 30)
 
+    def paint(self, painter, option, widget=None):
+        # Texte illisible à cette échelle : on ne le dessine pas
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < NoteItem.label_min_lod:
+            return
+        super().paint(painter, option, widget)
+
 class NoteItem(QGraphicsEllipseItem):
+    # Mode de rendu du nom (NOTE_LABEL_MODE), commun à toutes les notes
+    label_mode = NOTE_LABEL_MODE
+    # Seuils de niveau de détail (LOD_LABEL_MIN / LOD_DOT_MIN, modifiables par --lod-labels / --lod-dots)
+    label_min_lod = LOD_LABEL_MIN
+    dot_min_lod = LOD_DOT_MIN
+
     def __init__(self, x, y, note, is_first_note=False, degree_index=None, show_all_colors=True, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setRect(QRectF(x - 10 , y + 30, 20, 20))
-        self.setBrush(QBrush(QColor(NOTE_COLOR)))
-
-        pen = QPen()
-        if show_all_colors:
-            # Mode toutes les couleurs
-            if degree_index is not None and 0 <= degree_index < len(DEGREE_COLORS):
-                pen.setWidth(3)
-                pen.setColor(QColor(DEGREE_COLORS[degree_index]))
+        self.setBrush(get_shared_brush(NOTE_COLOR))
+        self.note = note
+        self.is_first_note = is_first_note
+        self.degree_index = degree_index
+        self.highlighted = False
+        self.set_style(is_first_note, degree_index, show_all_colors)
+
+        if self.label_mode == "item":
+            self.text_item = NoteTextItem(x, y, note)
+            self.text_item.setParentItem(self)
         else:
-            # Mode uniquement 1er degré
-            if is_first_note:
-                pen.setWidth(3)
-                pen.setColor(QColor(FIRST_NOTE))
-        self.setPen(pen)
+            # Le nom est dessiné directement dans paint(), sans item enfant
+            self.text_item = None
+
+    def set_style(self, is_first_note, degree_index, show_all_colors):
+        """(Re)définit le contour de la note sans recréer l'item."""
+        self.is_first_note = is_first_note
+        self.degree_index = degree_index
+        color = get_note_color(is_first_note, degree_index, show_all_colors)
+        self.setPen(get_degree_pen(color))
+        # Couleur du disque dessiné à faible niveau de détail
+        self.dot_color = color or NOTE_COLOR
+
+    def set_note(self, note):
+        """Change le nom affiché de la note en place."""
+        if note != self.note:
+            self.note = note
+            if self.text_item is not None:
+                self.text_item.setPlainText(note)
+            else:
+                self.update()
+
+    def set_highlight(self, highlighted):
+        """Allume ou éteint la note (note entendue, voir NoteFollower) en changeant seulement son remplissage."""
+        if highlighted != self.highlighted:
+            self.highlighted = highlighted
+            self.setBrush(get_shared_brush(HIGHLIGHT_COLOR if highlighted else NOTE_COLOR))
+
+    def reset(self, x, y, note, is_first_note, degree_index, show_all_colors):
+        """Réutilise l'item (sortie de pool) : seuls position, texte et contour sont mis à jour."""
+        self.setRect(QRectF(x - 10 , y + 30, 20, 20))
+        if self.text_item is not None:
+            self.text_item.setPos(x - 11, y + 30)
+        self.set_note(note)
+        self.set_style(is_first_note, degree_index, show_all_colors)
+        self.set_highlight(False)
 
-        text_item = NoteTextItem(x, y, note)
-        text_item.setParentItem(self)
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < self.dot_min_lod:
+            # Vue très dézoomée : un simple disque de la couleur du degré, sans contour ni texte
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(get_shared_brush(HIGHLIGHT_COLOR if self.highlighted else self.dot_color))
+            painter.drawEllipse(self.rect())
+            return
+        super().paint(painter, option, widget)
+        if self.text_item is None and lod >= self.label_min_lod:
+            # Même position que le texte d'un NoteTextItem (marge de document de 4 px)
+            rect = self.rect()
+            painter.setPen(Qt.black)
+            painter.setFont(get_shared_font("Courier New", NOTE_FONT_SIZE))
+            painter.drawStaticText(QPointF(rect.x() + 3, rect.y() + 4), get_static_text(self.note, NOTE_FONT_SIZE))
 
 class ChordLabelItem(QGraphicsTextItem):
     def __init__(self, x, y, label, *args, **kwargs):
         super().__init__(label, *args, **kwargs)
         self.setDefaultTextColor(QColor("white"))
-        font = QFont()
-        font.setPointSize(CHORD_LABEL_FONT_SIZE)
-        font.setBold(True)
-        self.setFont(font)
+        self.setFont(get_shared_font("", CHORD_LABEL_FONT_SIZE))
         self.setZValue(50)
         self.setPos(x, y)
 
@@ -344,56 +1053,265 @@ class FretLabelItem(QGraphicsTextItem):
     def __init__(self, x, y, label, *args, **kwargs):
         super().__init__(label, *args, **kwargs)
         self.setDefaultTextColor(QColor("white"))
-        font = QFont()
-        font.setPointSize(FRET_FONT_SIZE)
-        font.setBold(True)
-        self.setFont(font)
+        self.setFont(get_shared_font("", FRET_FONT_SIZE))
         self.setZValue(50)
         self.setPos(x - 8, y + 10)
 
+    def reset(self, x, y, label):
+        """Réutilise l'item (sortie de pool) avec une nouvelle position et un nouveau texte."""
+        if self.toPlainText() != label:
+            self.setPlainText(label)
+        self.setPos(x - 8, y + 10)
+
+class GraphicsItemPool:
+    """
+    Réserve d'items graphiques réutilisables entre deux redessins.
+
+    Les items libérés restent dans la scène mais sont masqués ; acquire() en ressort un du type
+    demandé (hit) ou renvoie None (miss) pour que l'appelant en crée un nouveau.
+    Au-delà de max_items items libres par type, les items libérés sont retirés de la scène.
+    """
+    def __init__(self, scene, max_items=POOL_MAX_ITEMS):
+        self.scene = scene
+        self.max_items = max_items
+        self.free_items = {}  # type d'item -> liste d'items masqués
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def acquire(self, item_type):
+        free = self.free_items.get(item_type)
+        if free:
+            self.hits += 1
+            return free.pop()
+        self.misses += 1
+        return None
+
+    def release(self, item):
+        free = self.free_items.setdefault(type(item), [])
+        if len(free) < self.max_items:
+            item.hide()
+            free.append(item)
+        else:
+            self.discarded += 1
+            self.scene.removeItem(item)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "free": {item_type.__name__: len(free) for item_type, free in self.free_items.items()},
+        }
+
 class NeckItem(QGraphicsItem):
+    # Compteurs de dessin partagés par tous les manches (voir paint_stats)
+    paint_count = 0
+    paint_time_ns = 0
+    # En dessous de ce niveau de détail seul le contour du manche est dessiné (--lod-outline)
+    outline_max_lod = LOD_OUTLINE_MAX
+    antialiasing = True  # désactivé par le profil de rendu "off" (voir apply_render_profile)
+
     def __init__(self, frets, strings, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.frets = frets
         self.strings = strings
+        # Grille construite une seule fois : une ligne par case et par corde au lieu d'un rectangle par cellule
+        left, top = 25, 40
+        right = left + (frets + 1) * 50
+        bottom = top + strings * 30
+        self.grid_lines = [QLineF(left + fret * 50, top, left + fret * 50, bottom) for fret in range(frets + 2)]
+        self.grid_lines += [QLineF(left, top + string * 30, right, top + string * 30) for string in range(strings + 1)]
+        self.outline = QRectF(left, top, right - left, bottom - top)
+        self.pen = QPen(QColor(NECK_COLOR))  # Définir la couleur du stylo pour les lignes
+        self.pen.setCosmetic(True)  # Épaisseur constante indépendante du zoom
+        # Le rendu est mis en cache par Qt et n'est refait qu'au changement d'échelle
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
     def boundingRect(self) -> QRectF:
-        return QRectF(0, 0, (self.frets + 1) * 50, self.strings * 30)
+        # Zone réellement dessinée par paint() (cases à partir de (25, 40)) + marge pour le stylo
+        return QRectF(23, 38, (self.frets + 1) * 50 + 4, self.strings * 30 + 4)
 
     def paint(self, painter: QPainter, option, widget=None):
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.TextAntialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        pen = QPen(QColor(NECK_COLOR))  # Définir la couleur du stylo pour les lignes
-        pen.setCosmetic(True)  # Épaisseur constante indépendante du zoom
-        painter.setPen(pen)
-        for fret in range(self.frets + 1):
-            for string in range(self.strings):
-                x = fret * 50
-                y = string * 30
-                painter.drawRect(x + 25, y + 40, 50, 30)
+        start = time.perf_counter_ns()
+        painter.setRenderHint(QPainter.Antialiasing, self.antialiasing)
+        painter.setPen(self.pen)
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < self.outline_max_lod:
+            # Cases plus fines qu'un pixel : le contour suffit
+            painter.drawRect(self.outline)
+        else:
+            painter.drawLines(self.grid_lines)
+        NeckItem.paint_count += 1
+        NeckItem.paint_time_ns += time.perf_counter_ns() - start
+
+    @classmethod
+    def paint_stats(cls):
+        """Nombre d'appels à paint() et temps cumulé en millisecondes depuis le dernier reset."""
+        return {"paint_count": cls.paint_count, "paint_time_ms": cls.paint_time_ns / 1e6}
+
+    @classmethod
+    def reset_paint_stats(cls):
+        cls.paint_count = 0
+        cls.paint_time_ns = 0
+
+class VoicingShapeItem(QGraphicsItem):
+    """Forme d'un doigté sous les notes : trait reliant les cordes jouées et croix sur les cordes étouffées."""
+    def __init__(self, voicing, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setZValue(-0.5)  # au-dessus de l'image de fond, sous les notes
+        self.pen = QPen(QColor(VOICING_SHAPE_COLOR), 10, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        self.mute_pen = QPen(QColor(VOICING_SHAPE_COLOR), 3)
+        self.set_voicing(voicing)
+
+    def set_voicing(self, voicing):
+        self.prepareGeometryChange()
+        self.voicing = voicing
+        # Centre des notes (voir NoteItem) ; les cordes étouffées sont marquées dans la colonne des cordes à vide
+        self.points = [QPointF(fret * 50, string * 30 + 40) for string, fret in enumerate(voicing) if fret is not None]
+        self.mute_lines = []
+        for string, fret in enumerate(voicing):
+            if fret is None:
+                y = string * 30 + 40
+                self.mute_lines += [QLineF(-7, y - 7, 7, y + 7), QLineF(-7, y + 7, 7, y - 7)]
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(-15, 25, max(fret or 0 for fret in self.voicing) * 50 + 30, len(self.voicing) * 30 + 30)
+
+    def paint(self, painter, option, widget=None):
+        painter.setPen(self.pen)
+        painter.drawPolyline(self.points)
+        painter.setPen(self.mute_pen)
+        painter.drawLines(self.mute_lines)
+
+def get_string_tunings(num_strings):
+    """Accordage à vide pour un nombre de cordes donné (du plus aigu au plus grave)."""
+    # Accordage spécial pour 4 ou 5 cordes
+    if num_strings == 5:
+        return STRING_TUNINGS[1:-4] #['B', 'G', 'D', 'A', 'E']
+    elif num_strings == 4:
+        return STRING_TUNINGS[2:-4] #['G', 'D', 'A', 'E']
+    return STRING_TUNINGS[:num_strings]
+
+def get_script_file(file_name):
+    """Chemin d'un fichier à côté du script."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+
+def find_data_file(file_name):
+    """Chemin d'un fichier de données dans le dossier courant, sinon à côté du script (None s'il est absent)."""
+    if os.path.exists(file_name):
+        return file_name
+    # Lancement depuis un autre dossier : chercher à côté du script
+    path = get_script_file(file_name)
+    return path if os.path.exists(path) else None
+
+class TuningRegistry:
+    """
+    Accordages proposés : "Standard" (STRING_TUNINGS selon le nombre de cordes), TUNING_PRESETS et
+    ceux de l'utilisateur (load). Chaque accordage est un tuple de notes à vide, qui sert aussi de clé
+    aux tables du manche (get_fretboard_table) : elles ne sont calculées qu'une fois par accordage.
+    """
+    def __init__(self, presets=TUNING_PRESETS):
+        self.tunings = {name: tuple(notes) for name, notes in presets.items()}
+
+    def load(self, path):
+        """
+        Ajoute les accordages d'un fichier JSON (un nom existant est remplacé).
+
+        :return: Liste des messages d'erreur (fichier illisible ou entrées ignorées).
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as error:
+            return [f"cannot read tunings: {error}"]
+        if not isinstance(data, dict):
+            return ["tunings must be a JSON object {\"name\": [\"E\", \"B\", ...]}"]
+        errors = []
+        for name, notes in data.items():
+            if not isinstance(notes, list) or not notes or not all(note in NOTE_TO_PITCH_CLASS for note in notes):
+                errors.append(f"ignoring tuning {name!r}: expected a non-empty list of note names")
+            elif len(notes) not in STRING_COUNTS:
+                # Le menu des cordes suit l'accordage : il doit proposer ce nombre de cordes
+                errors.append(f"ignoring tuning {name!r}: {len(notes)} strings, expected "
+                              f"{STRING_COUNTS[0]} to {STRING_COUNTS[-1]}")
+            elif name == STANDARD_TUNING:
+                errors.append(f"ignoring tuning {name!r}: reserved name")
+            else:
+                self.tunings[name] = tuple(notes)
+        return errors
+
+    def names(self):
+        return [STANDARD_TUNING] + list(self.tunings)
+
+    def get(self, name, num_strings):
+        """Notes à vide d'un accordage ; "Standard" (ou nom inconnu) dépend du nombre de cordes."""
+        string_tunings = self.tunings.get(name)
+        return string_tunings if string_tunings is not None else tuple(get_string_tunings(num_strings))
+
+def get_chord_pattern(root, chord_type):
+    """
+    Notes d'un accord et degré de chacune pour la couleur.
+
+    :return: (chord_notes, note_degrees, use_sharps)
+    """
+    chord_notes = []
+    note_degrees = {}
+    # Vérifier si l'accord est mineur et ajuster la tonalité
+    if chord_type == "minor":
+        key_info = get_key_signature(f"{root} {chord_type}")
+    else:
+        key_info = get_key_signature(root)
+    use_sharps = key_info["use_sharps"]
+    for interval in CHORDS_INTERVALS[chord_type]:
+        chord_note = get_note_by_interval(root, interval,use_sharps)
+        chord_notes.append(chord_note)
+        # Mapper la note à son degré pour la couleur
+        note_degrees[chord_note] = INTERVAL_TO_DEGREE.get(interval, 0)
+    return chord_notes, note_degrees, use_sharps
+
+def compute_neck_notes(string_tunings, num_frets, note_pattern, note_degrees, use_sharps):
+    """
+    Notes à placer sur un manche, sans créer d'item graphique.
+
+    :return: Tuple de (corde, case, note, is_first_note, degree_index).
+    """
+    if not note_pattern:
+        return ()
+    notes = notes_sharp if use_sharps else notes_flat
+    mask, degrees = get_pattern_lookup(tuple(note_pattern))
+    first_pitch_class = NOTE_TO_PITCH_CLASS[note_pattern[0]]
+    placed = []
+    # Seules les cases dont la classe de hauteur est dans le masque du pattern sont parcourues
+    for string, fret, pitch_class in get_masked_positions(tuple(string_tunings), num_frets, mask):
+        note = notes[pitch_class]
+        # Si c'est un accord (on a des degrés spécifiques), utiliser le mapping
+        if note_degrees:
+            degree_index = note_degrees.get(note, None)
+        else:
+            # Sinon, utiliser l'index dans le pattern (gammes)
+            degree_index = degrees[pitch_class]
+        placed.append((string, fret, note, pitch_class == first_pitch_class, degree_index))
+    return tuple(placed)
 
 class GuitarNeck:
-    def __init__(self, scene, x_offset, y_offset, num_strings, num_frets, note_pattern=None, show_all_colors=True):
+    def __init__(self, scene, x_offset, y_offset, num_strings, num_frets, show_all_colors=True, pool=None,
+                 string_tunings=None):
         self.frets = num_frets
         self.strings = num_strings
-        # Accordage spécial pour 4 ou 5 cordes
-        if num_strings == 5:
-            self.string_tunings = STRING_TUNINGS[1:-4] #['B', 'G', 'D', 'A', 'E']
-        elif num_strings == 4:
-            self.string_tunings = STRING_TUNINGS[2:-4] #['G', 'D', 'A', 'E']
-        else:
-            self.string_tunings = STRING_TUNINGS[:num_strings]
-        self.note_pattern = note_pattern if note_pattern is not None else notes_sharp 
+        # Accordage de la disposition (NeckLayout.string_tunings) : les notes placées viennent de compute_neck_notes
+        self.string_tunings = tuple(string_tunings) if string_tunings else tuple(get_string_tunings(num_strings))
         self.scene = scene
+        self.pool = pool  # GraphicsItemPool optionnel pour réutiliser les items
         self.x_offset = x_offset
         self.y_offset = y_offset
-        self.chord_type = ""
         self.show_all_colors = show_all_colors
-        self.note_degrees = {}  # Dictionnaire pour stocker les degrés des notes dans les accords
+        self.note_items = {}  # (corde, case) -> NoteItem affiché
+        self.fret_label_items = []
+        self.root_label_item = None
+        self.voicing_item = None
         self.create_neck()
         self.create_fret_labels()
-        #self.create_notes()
 
     def create_neck(self):
         self.neck_item = NeckItem(self.frets - 1, self.strings - 1)
@@ -405,201 +1323,2626 @@ class GuitarNeck:
             if label <= self.frets:
                 x = label * 50 + self.x_offset
                 y = self.y_offset
-                fret_label_item = FretLabelItem(x, y, str(label))
-                self.scene.addItem(fret_label_item)
+                fret_label_item = self.pool.acquire(FretLabelItem) if self.pool else None
+                if fret_label_item is None:
+                    fret_label_item = FretLabelItem(x, y, str(label))
+                    self.scene.addItem(fret_label_item)
+                else:
+                    fret_label_item.reset(x, y, str(label))
+                    fret_label_item.show()
+                self.fret_label_items.append(fret_label_item)
 
     def create_root_label(self,label_text):
         label_x = self.x_offset - 20  # Adjust as needed
         label_y = self.y_offset - 20  # Adjust as needed
         root_label_item = ChordLabelItem(label_x, label_y, label_text)
         self.scene.addItem(root_label_item)
+        self.root_label_item = root_label_item
 
-    def get_note_for_position(self, string, fret, use_sharps):
-        root_note = self.string_tunings[string]
-        interval = fret
-        return get_note_by_interval(root_note, interval, use_sharps)
-
-    def create_notes(self,use_sharps):
-        for string in range(self.strings):
-            for fret in range(self.frets + 1):
-                note = self.get_note_for_position(string, fret,use_sharps)
-                is_first_note = (note == self.note_pattern[0])
-                # Trouver l'index du degré dans le pattern
-                degree_index = None
-                if note in self.note_pattern:
-                    # Si c'est un accord (on a des degrés spécifiques), utiliser le mapping
-                    if self.note_degrees:
-                        degree_index = self.note_degrees.get(note, None)
-                    else:
-                        # Sinon, utiliser l'index dans le pattern (gammes)
-                        degree_index = self.note_pattern.index(note)
-                if note in self.note_pattern:
-                    x = fret * 50 + self.x_offset
-                    y = string * 30 + self.y_offset
-                    self.add_note_item(x, y, note, is_first_note, degree_index)
+    def move_to(self, x_offset, y_offset):
+        """Déplace le manche (grille, cases, titre) pour le recycler ; les notes sont rendues au pool."""
+        self.set_notes(())
+        self.set_voicing(None)
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.neck_item.setPos(x_offset, y_offset)
+        for fret_label_item in self.fret_label_items:
+            fret_label_item.reset(int(fret_label_item.toPlainText()) * 50 + x_offset, y_offset,
+                                  fret_label_item.toPlainText())
+        if self.root_label_item is not None:
+            self.root_label_item.setPos(x_offset - 20, y_offset - 20)
+        self.set_flagged(False)
+
+    def set_root_label(self, label_text):
+        """Crée, modifie ou retire le titre du manche selon label_text (None = pas de titre)."""
+        if label_text is None:
+            if self.root_label_item is not None:
+                self.scene.removeItem(self.root_label_item)
+                self.root_label_item = None
+        elif self.root_label_item is None:
+            self.create_root_label(label_text)
+        elif self.root_label_item.toPlainText() != label_text:
+            self.root_label_item.setPlainText(label_text)
+
+    def set_flagged(self, flagged):
+        """Titre en OUT_OF_SCALE_COLOR tant qu'une note entendue n'est pas sur le manche (voir NoteFollower)."""
+        if self.root_label_item is not None:
+            self.root_label_item.setDefaultTextColor(QColor(OUT_OF_SCALE_COLOR if flagged else "white"))
+
+    def set_voicing(self, voicing):
+        """Affiche, modifie ou retire la forme d'un doigté (tuple de cases par corde, None = pas de forme)."""
+        if voicing is None:
+            if self.voicing_item is not None:
+                self.scene.removeItem(self.voicing_item)
+                self.voicing_item = None
+        elif self.voicing_item is None:
+            self.voicing_item = VoicingShapeItem(voicing)
+            self.voicing_item.setPos(self.x_offset, self.y_offset)
+            self.scene.addItem(self.voicing_item)
+        elif self.voicing_item.voicing != voicing:
+            self.voicing_item.set_voicing(voicing)
+
+    def set_notes(self, placed_notes):
+        """
+        Met à jour les notes affichées en ne touchant que celles qui ont changé.
+
+        :param placed_notes: Itérable de (corde, case, note, is_first_note, degree_index).
+        """
+        previous_items = self.note_items
+        self.note_items = {}
+        for string, fret, note, is_first_note, degree_index in placed_notes:
+            note_item = previous_items.pop((string, fret), None)
+            if note_item is None:
+                x = fret * 50 + self.x_offset
+                y = string * 30 + self.y_offset
+                note_item = self.add_note_item(x, y, note, is_first_note, degree_index)
+            else:
+                note_item.set_note(note)
+                if note_item.is_first_note != is_first_note or note_item.degree_index != degree_index:
+                    note_item.set_style(is_first_note, degree_index, self.show_all_colors)
+            self.note_items[(string, fret)] = note_item
+        for note_item in previous_items.values():
+            self.release_item(note_item)
+
+    def set_show_all_colors(self, show_all_colors):
+        """Applique le mode de couleur en restylant les contours en place."""
+        if show_all_colors == self.show_all_colors:
+            return
+        self.show_all_colors = show_all_colors
+        for note_item in self.note_items.values():
+            note_item.set_style(note_item.is_first_note, note_item.degree_index, show_all_colors)
 
     def add_note_item(self, x, y, note, is_first_note=False, degree_index=None):
-        note_item = NoteItem(x, y, note, is_first_note, degree_index, self.show_all_colors)
-        self.scene.addItem(note_item)
-
-    def generate_chord_notes(self, root, chord_type):
-        chord_notes = []
-        self.note_degrees = {}  # Réinitialiser le dictionnaire des degrés
-        # Vérifier si l'accord est mineur et ajuster la tonalité
-        if chord_type == "minor":
-            key_info = get_key_signature(f"{root} {chord_type}")
+        note_item = self.pool.acquire(NoteItem) if self.pool else None
+        if note_item is None:
+            note_item = NoteItem(x, y, note, is_first_note, degree_index, self.show_all_colors)
+            self.scene.addItem(note_item)
         else:
-            key_info = get_key_signature(root)
-        use_sharps = key_info["use_sharps"]
-        for interval in CHORDS_INTERVALS[chord_type]:
-            chord_note = get_note_by_interval(root, interval,use_sharps)
-            chord_notes.append(chord_note)
-            # Mapper la note à son degré pour la couleur
-            degree_index = INTERVAL_TO_DEGREE.get(interval, 0)
-            self.note_degrees[chord_note] = degree_index
-        self.note_pattern = chord_notes
-        self.create_notes(use_sharps)
-        # Create and add the chord label
-        label_text = f"{root} {chord_type}"
-        self.create_root_label(label_text)
+            note_item.reset(x, y, note, is_first_note, degree_index, self.show_all_colors)
+            note_item.show()
+        return note_item
 
-def main():
-    # Optimisation pour High DPI et compatibilité multiplateforme
-    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
-    
-    app = QApplication(sys.argv)
-    
-    dark_palette = QPalette()
-    dark_palette.setColor(QPalette.Window, Qt.black)  # Fond noir
-    dark_palette.setColor(QPalette.WindowText, Qt.white)  # Texte blanc
-    dark_palette.setColor(QPalette.Base, Qt.black)  # Fond des widgets
-    dark_palette.setColor(QPalette.AlternateBase, Qt.darkGray)
-    dark_palette.setColor(QPalette.ToolTipBase, Qt.white)
-    dark_palette.setColor(QPalette.ToolTipText, Qt.white)
-    dark_palette.setColor(QPalette.Text, Qt.white)
-    dark_palette.setColor(QPalette.Button, Qt.darkGray)
-    dark_palette.setColor(QPalette.ButtonText, Qt.white)
-    dark_palette.setColor(QPalette.Highlight, Qt.blue)
-    dark_palette.setColor(QPalette.HighlightedText, Qt.black)
-    # Appliquer la palette
-    app.setPalette(dark_palette)
-    
-    Chords_scales = {
-        "C Major": [("C", "major"), ("D", "minor"), ("E", "minor"), ("F", "major"),
-                    ("G", "major"), ("A", "minor"), ("B", "diminished")],
-        "G Major": [("G", "major"), ("A", "minor"), ("B", "minor"), ("C", "major"),
-                    ("D", "major"), ("E", "minor"), ("F#", "diminished")],
-        "D Major": [("D", "major"), ("E", "minor"), ("F#", "minor"), ("G", "major"),
-                    ("A", "major"), ("B", "minor"), ("C#", "diminished")],
-        "A Major": [("A", "major"), ("B", "minor"), ("C#", "minor"), ("D", "major"),
-                    ("E", "major"), ("F#", "minor"), ("G#", "diminished")],
-        "E Major": [("E", "major"), ("F#", "minor"), ("G#", "minor"), ("A", "major"),
-                    ("B", "major"), ("C#", "minor"), ("D#", "diminished")],
-        "B Major": [("B", "major"), ("C#", "minor"), ("D#", "minor"), ("E", "major"),
-                    ("F#", "major"), ("G#", "minor"), ("A#", "diminished")],
-        "F# Major": [("F#", "major"), ("G#", "minor"), ("A#", "minor"), ("B", "major"),
-                     ("C#", "major"), ("D#", "minor"), ("E#", "diminished")],
-        "C# Major": [("C#", "major"), ("D#", "minor"), ("E#", "minor"), ("F#", "major"),
-                     ("G#", "major"), ("A#", "minor"), ("B#", "diminished")],
-        "Ab Major": [("Ab", "major"), ("Bb", "minor"), ("C", "minor"), ("Db", "major"),
-                     ("Eb", "major"), ("F", "minor"), ("G", "diminished")],
-        "Eb Major": [("Eb", "major"), ("F", "minor"), ("G", "minor"), ("Ab", "major"),
-                     ("Bb", "major"), ("C", "minor"), ("D", "diminished")],
-        "Bb Major": [("Bb", "major"), ("C", "minor"), ("D", "minor"), ("Eb", "major"),
-                     ("F", "major"), ("G", "minor"), ("A", "diminished")],
-        "F Major": [("F", "major"), ("G", "minor"), ("A", "minor"), ("Bb", "major"),
-                    ("C", "major"), ("D", "minor"), ("E", "diminished")],
-                    
-
-        "A Minor": [("A", "minor"), ("B", "diminished"), ("C", "major"), ("D", "minor"),
-                    ("E", "minor"), ("F", "major"), ("G", "major")],
-        "E Minor": [("E", "minor"), ("F#", "diminished"), ("G", "major"), ("A", "minor"),
-                    ("B", "minor"), ("C", "major"), ("D", "major")],
-        "B Minor": [("B", "minor"), ("C#", "diminished"), ("D", "major"), ("E", "minor"),
-                    ("F#", "minor"), ("G", "major"), ("A", "major")],
-        "F# Minor": [("F#", "minor"), ("G#", "diminished"), ("A", "major"), ("B", "minor"),
-                     ("C#", "minor"), ("D", "major"), ("E", "major")],
-        "C# Minor": [("C#", "minor"), ("D#", "diminished"), ("E", "major"), ("F#", "minor"),
-                     ("G#", "minor"), ("A", "major"), ("B", "major")],
-        "G# Minor": [("G#", "minor"), ("A#", "diminished"), ("B", "major"), ("C#", "minor"),
-                     ("D#", "minor"), ("E", "major"), ("F#", "major")],
-        "D# Minor": [("D#", "minor"), ("E#", "diminished"), ("F#", "major"), ("G#", "minor"),
-                     ("A#", "minor"), ("B", "major"), ("C#", "major")],
-        "A# Minor": [("A#", "minor"), ("B#", "diminished"), ("C#", "major"), ("D#", "minor"),
-                     ("E#", "minor"), ("F#", "major"), ("G#", "major")],
-        "F Minor": [("F", "minor"), ("G", "diminished"), ("Ab", "major"), ("Bb", "minor"),
-                    ("C", "minor"), ("Db", "major"), ("Eb", "major")],
-        "C Minor": [("C", "minor"), ("D", "diminished"), ("Eb", "major"), ("F", "minor"),
-                    ("G", "minor"), ("Ab", "major"), ("Bb", "major")],                   
-        "G Minor": [("G", "minor"), ("A", "diminished"), ("Bb", "major"), ("C", "minor"),
-                    ("D", "minor"), ("Eb", "major"), ("F", "major")],                    
-        "D Minor": [("D", "minor"), ("E", "diminished"), ("F", "major"), ("G", "minor"),
-                    ("A", "minor"), ("Bb", "major"), ("C", "major")]
+    def release_item(self, item):
+        """Rend un item au pool s'il y en a un, sinon le retire de la scène."""
+        if self.pool:
+            self.pool.release(item)
+        else:
+            self.scene.removeItem(item)
 
-}
-    scene = QGraphicsScene()
-    scene.setSceneRect(-100, -100, 6000, 3000)  # Définir la taille de la scène
-
-    # Ajoute l'image en arrière-plan (avec vérification d'existence)
-    image_path = "guitar.png"
-    if os.path.exists(image_path):
-        pixmap = QPixmap(image_path)
-        if not pixmap.isNull():
-            # Agrandir l'image par 2
-            scaled_pixmap = pixmap.scaled(pixmap.width() * 2, pixmap.height() * 2, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            scene.image_item = QGraphicsPixmapItem(scaled_pixmap)
-            scene.image_item.setPos(0, 0)  # Positionne l'image
-            opacity_effect = QGraphicsOpacityEffect()
-            opacity_effect.setOpacity(0.3)  # X% de transparence
-            scene.image_item.setGraphicsEffect(opacity_effect)
-            scene.addItem(scene.image_item)
-    else:
-        scene.image_item = None  # Pas d'image de fond
-    
-    # Ajoute le texte
-    scene.text_item = QGraphicsTextItem("Visual Practice : ")
-    font = QFont("Engraved MT", 18)
-    font.setBold(True)
-    scene.text_item.setFont(font)
-    scene.text_item.setDefaultTextColor(QColor(255, 165, 0))
+    def remove(self):
+        """Retire du scene tous les items de ce manche (les notes et cases retournent au pool)."""
+        for note_item in self.note_items.values():
+            self.release_item(note_item)
+        self.note_items = {}
+        for fret_label_item in self.fret_label_items:
+            self.release_item(fret_label_item)
+        self.fret_label_items = []
+        self.set_root_label(None)
+        self.set_voicing(None)
+        self.scene.removeItem(self.neck_item)
 
-    # Créer un QComboBox et ajouter les noms des patterns
-    combo_box = SpaceComboBox()
-    combo_box.setMaxVisibleItems(30)
-    combo_box.setFont(font)
-    combo_box.setPalette(dark_palette)  
-    combo_box.setFocusPolicy(Qt.StrongFocus)  # important pour recevoir la barre d’espace
+# =============================================================================
+# DOIGTÉS D'ACCORDS : RECHERCHE DES FORMES JOUABLES
+# =============================================================================
+# Un doigté est un tuple de cases, une par corde dans l'ordre de l'accordage (None = corde étouffée)
+POPCOUNT = [bin(mask).count("1") for mask in range(1 << 12)]  # nombre de notes d'un masque 12 bits
 
+def get_voicing_required_mask(chord_mask, root_pitch_class):
+    """Notes obligatoires d'un doigté : toutes celles de l'accord sauf la quinte juste."""
+    return chord_mask & ~(1 << (root_pitch_class + 7) % 12) | 1 << root_pitch_class
 
-    # Remplacer la vue interne par un QListView pour accéder aux barres de défilement
-    view = QListView()
-    combo_box.setView(view)
+@lru_cache(maxsize=256)
+def find_chord_voicings(string_tunings, num_frets, chord_mask, root_pitch_class, max_span=VOICING_MAX_SPAN,
+                        max_fingers=VOICING_MAX_FINGERS, max_inner_muted=VOICING_MAX_INNER_MUTED,
+                        max_results=VOICING_MAX_RESULTS):
+    """
+    Doigtés jouables d'un accord, classés du plus usuel au moins usuel.
 
-    # Élargir la scrollbar verticale
-    scrollbar = view.verticalScrollBar()
-    scrollbar.setFixedWidth(35)  # largeur en px
-    
-    # Élargir la liste déroulante
-    view.setMinimumWidth(450)  # largeur de la fenêtre déroulante en px
-    
-    #ajout des éléments
-    for mode_name in SCALE_TYPES.keys():
-        combo_box.addItem(mode_name)
-        
-    for chords_name in CHORDS_INTERVALS.keys():
-        combo_box.addItem(f"All Chords -{chords_name}")
-    
-    scale_names = list(Chords_scales.keys())
-    for scale in scale_names:
-        combo_box.addItem(f"Chords in Scale ({scale})")
+    La recherche part de la corde la plus grave pour chaque case de départ : les cases frettées restent dans
+    une fenêtre de max_span cases dont la première est occupée, ce qui donne chaque doigté une seule fois.
+    Une branche est abandonnée dès que les cordes restantes ne peuvent plus apporter les notes obligatoires
+    (fondamentale, tierce, septième, quinte altérée) ou qu'elle demande plus de max_fingers doigts.
 
-    # =============================================================================
-    # POSITIONS DES ÉLÉMENTS DE L'INTERFACE - Modifier ici pour ajuster la disposition
-    # =============================================================================
-    pos_visual_practice_x = 300
-    pos_visual_practice_y = -50
-    
-    pos_combo_box_x = 500
+    :param string_tunings: Tuple des notes à vide, de la corde la plus aiguë à la plus grave.
+    :param chord_mask: Masque 12 bits de l'accord.
+    :param root_pitch_class: Fondamentale de l'accord.
+    :return: Tuple de doigtés (au plus max_results) : la fondamentale à la basse et l'accord complet en tête,
+             les VOICING_OPEN_SHAPES premiers accords ouverts d'abord, puis VOICING_PER_POSITION par position
+             sur le manche.
+    """
+    num_strings = len(string_tunings)
+    open_pitch_classes = [NOTE_TO_PITCH_CLASS[note] for note in string_tunings]
+    required_mask = get_voicing_required_mask(chord_mask, root_pitch_class)
+    # De la corde grave à la corde aiguë
+    order = range(num_strings - 1, -1, -1)
+    found = []
+    examined = 0
+
+    for base in range(1, num_frets + 1):
+        top = min(base + max_span - 1, num_frets)
+        # Notes de l'accord jouables sur chaque corde dans cette fenêtre : (case, classe de hauteur)
+        options = []
+        for string in order:
+            open_pitch_class = open_pitch_classes[string]
+            string_options = [(fret, (open_pitch_class + fret) % 12) for fret in range(base, top + 1)
+                              if chord_mask >> (open_pitch_class + fret) % 12 & 1]
+            if chord_mask >> open_pitch_class & 1:
+                string_options.append((0, open_pitch_class))
+            options.append(string_options)
+        # Notes encore disponibles sur les cordes restantes, et possibilité d'y jouer la case de départ
+        reachable = [0] * (num_strings + 1)
+        base_reachable = [False] * (num_strings + 1)
+        for depth in range(num_strings - 1, -1, -1):
+            reachable[depth] = reachable[depth + 1]
+            base_reachable[depth] = base_reachable[depth + 1]
+            for fret, pitch_class in options[depth]:
+                reachable[depth] |= 1 << pitch_class
+                base_reachable[depth] |= fret == base
+        if not base_reachable[0] and base > 1:
+            continue
+        frets = [None] * num_strings
+
+        def search(depth, covered, high_fingers, base_notes, sounding, pending_muted, inner_muted, started):
+            nonlocal examined
+            remaining = num_strings - depth
+            missing = required_mask & ~covered
+            if missing & ~reachable[depth] or POPCOUNT[missing] > remaining \
+                    or sounding + remaining < VOICING_MIN_STRINGS \
+                    or not (base_notes or base_reachable[depth] or (base == 1 and high_fingers == 0)):
+                return
+            if remaining == 0:
+                examined += 1
+                # Doigté ancré sur la première case de la fenêtre (ou tout à vide, compté une seule fois)
+                if base_notes or (base == 1 and high_fingers == 0):
+                    found.append((tuple(frets), inner_muted))
+                return
+            if examined >= VOICING_SEARCH_LIMIT:
+                return
+            string = order[depth]
+            # Corde étouffée : avant la première corde jouée, ou en attente (intérieure ou finale)
+            frets[string] = None
+            search(depth + 1, covered, high_fingers, base_notes, sounding,
+                   pending_muted + started, inner_muted, started)
+            # Une corde jouée après des cordes étouffées en attente les rend intérieures
+            if inner_muted + pending_muted > max_inner_muted:
+                return
+            for fret, pitch_class in options[depth]:
+                fingers = high_fingers + (fret > base)
+                if fingers + (base_notes > 0 or fret == base) > max_fingers:
+                    continue
+                frets[string] = fret
+                search(depth + 1, covered | 1 << pitch_class, fingers, base_notes + (fret == base), sounding + 1,
+                       0, inner_muted + pending_muted, 1)
+            frets[string] = None
+
+        search(0, 0, 0, 0, 0, 0, 0, 0)
+
+    voicings = []
+    for voicing, inner_muted in found:
+        sounding = [(string, fret) for string, fret in enumerate(voicing) if fret is not None]
+        fretted = [fret for _, fret in sounding if fret > 0]
+        # Le barré n'est à vérifier que s'il faut plus de doigts que de cases frettées
+        if len(fretted) > max_fingers and not is_voicing_playable(voicing, max_fingers):
+            continue
+        bass_string, bass_fret = sounding[-1]
+        covered = 0
+        for string, fret in sounding:
+            covered |= 1 << (open_pitch_classes[string] + fret) % 12
+        low_fret = min(fretted) if fretted else 0
+        high_fret = max(fretted) if fretted else 0
+        # Les accords ouverts (D xx0232, F xx3211...) passent avant les formes plus pleines des autres positions
+        rank = ((open_pitch_classes[bass_string] + bass_fret) % 12 != root_pitch_class,
+                POPCOUNT[chord_mask & ~covered], high_fret > VOICING_OPEN_MAX_FRET, inner_muted,
+                low_fret, -len(sounding), len(fretted), high_fret - low_fret)
+        voicings.append((rank, voicing))
+    voicings.sort(key=lambda item: item[0])  # tri stable : à rang égal, ordre de la recherche
+    # Quelques doigtés par position et par qualité, pour que les résultats gardés couvrent tout le manche ;
+    # les premiers accords ouverts complets, fondamentale à la basse, ont leurs places réservées
+    per_position = Counter()
+    open_shapes = 0
+    kept = []
+    for rank, voicing in voicings:
+        if rank[:3] == (False, 0, False) and open_shapes < VOICING_OPEN_SHAPES:
+            open_shapes += 1
+            kept.append(voicing)
+            if len(kept) == max_results:
+                break
+            continue
+        per_position[rank[:5]] += 1
+        if per_position[rank[:5]] <= VOICING_PER_POSITION:
+            kept.append(voicing)
+            if len(kept) == max_results:
+                break
+    return tuple(kept)
+
+def is_voicing_playable(voicing, max_fingers=VOICING_MAX_FINGERS):
+    """
+    Vérifie le nombre de doigts d'un doigté : un doigt par case frettée, sauf barré sur la case la plus basse.
+
+    Le barré couvre les cordes de la plus grave frettée sur cette case jusqu'à la plus aiguë :
+    il est impossible si une corde à vide se trouve dans cette zone.
+    """
+    fretted = [(string, fret) for string, fret in enumerate(voicing) if fret]
+    if len(fretted) <= max_fingers:
+        return True
+    base = min(fret for _, fret in fretted)
+    barre_strings = [string for string, fret in fretted if fret == base]
+    if len(barre_strings) < 2 or any(voicing[string] == 0 for string in range(max(barre_strings))):
+        return False
+    return len(fretted) - len(barre_strings) + 1 <= max_fingers
+
+# =============================================================================
+# POSITIONS DE GAMMES : BOXES ET N NOTES PAR CORDE
+# =============================================================================
+
+def get_string_pitches(string_tunings):
+    """
+    Hauteur relative de chaque corde à vide (en demi-tons au-dessus de la plus grave).
+
+    Les accordages ne donnent que des noms de notes : chaque corde est placée au plus près au-dessus de la
+    corde plus grave voisine (quarte, tierce ou quinte selon l'accordage).
+    """
+    pitches = [0] * len(string_tunings)
+    for string in range(len(string_tunings) - 2, -1, -1):
+        interval = (NOTE_TO_PITCH_CLASS[string_tunings[string]] - NOTE_TO_PITCH_CLASS[string_tunings[string + 1]]) % 12
+        pitches[string] = pitches[string + 1] + (interval or 12)
+    return pitches
+
+def compute_scale_positions(string_tunings, scale_type, root_pitch_class, box_span=POSITION_BOX_SPAN,
+                            max_fret=POSITION_MAX_FRET):
+    """
+    Positions d'une gamme, une par degré : la position k commence sur le degré k, à sa première case
+    de la corde la plus grave.
+
+    "box" : toutes les notes de la gamme dans box_span cases à partir de cette case.
+    "nps" : la gamme jouée en montant, 3 notes par corde (2 pour les gammes de moins de 6 notes).
+
+    :return: {type de position: liste de tuples de (corde, case)}, dans l'ordre des degrés.
+    """
+    offsets = intervals_to_offsets(SCALE_TYPES[scale_type])
+    mask = get_scale_mask(scale_type, root_pitch_class)
+    num_strings = len(string_tunings)
+    lowest = num_strings - 1
+    lowest_pitch_class = NOTE_TO_PITCH_CLASS[string_tunings[lowest]]
+    pitches = get_string_pitches(string_tunings)
+    notes_per_string = 3 if len(offsets) >= 6 else 2
+    positions = {"box": [], "nps": []}
+    for degree, offset in enumerate(offsets):
+        start = (root_pitch_class + offset - lowest_pitch_class) % 12
+        box = []
+        for string in range(lowest, -1, -1):
+            open_pitch_class = NOTE_TO_PITCH_CLASS[string_tunings[string]]
+            box += [(string, fret) for fret in range(start, min(start + box_span, max_fret + 1))
+                    if mask >> (open_pitch_class + fret) % 12 & 1]
+        positions["box"].append(tuple(box))
+        # Notes de la gamme en montant depuis le départ, réparties notes_per_string par corde
+        nps = []
+        pitch = start
+        step = degree
+        for string in range(lowest, -1, -1):
+            for _ in range(notes_per_string):
+                fret = pitch - pitches[string]
+                if 0 <= fret <= max_fret:
+                    nps.append((string, fret))
+                pitch += (offsets[(step + 1) % len(offsets)] - offsets[step % len(offsets)]) % 12 or 12
+                step += 1
+        positions["nps"].append(tuple(nps))
+    return positions
+
+def get_positions_cache_key():
+    """Empreinte des tables théoriques et des réglages dont dépendent les positions enregistrées."""
+    content = json.dumps([SCALE_TYPES, NOTE_TO_PITCH_CLASS, POSITION_BOX_SPAN, POSITION_MAX_FRET], sort_keys=True)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+class ScalePositionIndex:
+    """
+    Positions de toutes les gammes de SCALE_TYPES dans les 12 tonalités, par accordage.
+
+    La table d'un accordage est calculée en une fois à sa première utilisation, puis enregistrée dans
+    cache_path (JSON) avec POSITIONS_CACHE_VERSION et l'empreinte des tables théoriques : au démarrage
+    suivant elle est relue telle quelle, et ignorée si la version ou les tables ont changé. Chaque position est stockée sous forme compacte,
+    deux octets (corde, case) par note ; changer de position n'est ensuite qu'une lecture de la table.
+    """
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path  # None = pas de cache sur disque
+        self.key = get_positions_cache_key()
+        self.tables = {}  # accordage ("E,B,G,...") -> {"gamme|fondamentale|type": [octets d'une position, ...]}
+        self.built = 0
+        self.loaded = 0
+
+    def load(self):
+        """
+        Relit les tables enregistrées dans cache_path.
+
+        :return: Liste des messages d'erreur (fichier illisible) ; un cache périmé est ignoré sans erreur.
+        """
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return []
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                content = json.load(f)
+            if not isinstance(content, dict) or content.get("version") != POSITIONS_CACHE_VERSION \
+                    or content.get("key") != self.key:
+                return []
+            for tuning, table in content["tunings"].items():
+                self.tables[tuning] = {name: [bytes.fromhex(position) for position in positions]
+                                       for name, positions in table.items()}
+        except (OSError, ValueError, KeyError, AttributeError, TypeError) as error:
+            self.tables = {}
+            return [f"{self.cache_path}: ignoring scale positions cache: {error}"]
+        self.loaded = len(self.tables)
+        return []
+
+    def save(self):
+        if self.cache_path is None:
+            return
+        content = {"version": POSITIONS_CACHE_VERSION, "key": self.key,
+                   "tunings": {tuning: {name: [position.hex() for position in positions]
+                                        for name, positions in table.items()}
+                               for tuning, table in self.tables.items()}}
+        try:
+            # Écriture dans un fichier temporaire puis remplacement : jamais de cache à moitié écrit
+            with open(self.cache_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(content, f, separators=(",", ":"))
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+        except OSError as error:
+            print(f"{self.cache_path}: cannot write scale positions cache: {error}", file=sys.stderr)
+
+    def get_table(self, string_tunings):
+        """Table d'un accordage, calculée (et enregistrée) à la première demande."""
+        tuning = ",".join(string_tunings)
+        table = self.tables.get(tuning)
+        if table is None:
+            table = {}
+            for scale_type in SCALE_TYPES:
+                for root_pitch_class in range(12):
+                    positions = compute_scale_positions(string_tunings, scale_type, root_pitch_class)
+                    for kind, kind_positions in positions.items():
+                        table[f"{scale_type}|{root_pitch_class}|{kind}"] = [
+                            bytes(value for note in position for value in note) for position in kind_positions]
+            self.tables[tuning] = table
+            self.built += 1
+            self.save()
+        return table
+
+    def get(self, string_tunings, scale_type, root_pitch_class, kind, number):
+        """
+        Position d'une gamme pour un accordage.
+
+        :param number: Numéro de la position (1 = départ sur la fondamentale), pris modulo leur nombre.
+        :return: (frozenset de (corde, case), nombre de positions de la gamme)
+        """
+        positions = self.get_table(tuple(string_tunings))[f"{scale_type}|{root_pitch_class}|{kind}"]
+        position = positions[(number - 1) % len(positions)]
+        return frozenset(zip(position[::2], position[1::2])), len(positions)
+
+    def stats(self):
+        return {"tunings": len(self.tables), "built": self.built, "loaded": self.loaded}
+
+GALLERY_PATTERNS = ("Gallery -All Scales", "Gallery -All Chords")
+NOTE_FINDER_PATTERN = "Find Scales & Chords"
+
+def get_pattern_names():
+    """Noms de tous les patterns proposés dans le menu, dans l'ordre du menu."""
+    pattern_names = list(SCALE_TYPES.keys())
+    pattern_names += [f"All Chords -{chords_name}" for chords_name in CHORDS_INTERVALS.keys()]
+    pattern_names += [f"Chords in Scale ({scale})" for scale in Chords_scales.keys()]
+    pattern_names += GALLERY_PATTERNS
+    pattern_names.append(NOTE_FINDER_PATTERN)
+    return pattern_names
+
+# Description d'un manche à afficher : position, taille, titre, notes calculées, doigté éventuel et accordage
+NeckLayout = namedtuple("NeckLayout", "x_offset y_offset num_strings num_frets label notes voicing string_tunings",
+                        defaults=(None, None))
+# Manche d'un pattern avant placement : titre, notes du pattern, degrés (accords) et orthographe
+PatternEntry = namedtuple("PatternEntry", "label note_pattern note_degrees use_sharps")
+
+def get_pattern_entries(selected_pattern_name, chords_scales):
+    """
+    Manches d'un pattern du menu, dans l'ordre de la grille.
+
+    :return: Liste de PatternEntry, None pour un emplacement laissé vide.
+    """
+    entries = []
+    # Vérifier si on a sélectionné une gamme diatonique
+    if "Chords in Scale" in selected_pattern_name:
+        key = selected_pattern_name.split("(")[-1].strip(")")
+        if key in chords_scales:
+            scale = chords_scales[key]
+            for root, chord_type in scale:
+                chord_notes, note_degrees, use_sharps = get_chord_pattern(root, chord_type)
+                entries.append(PatternEntry(f"{root} {chord_type}", chord_notes, note_degrees, use_sharps))
+
+            entries += [None] * 5  # keep blank guitar neck
+    #---------------------------------------------------------------------------------------
+    elif "All Chords -" in selected_pattern_name:
+        pattern = selected_pattern_name.split("-")[-1]
+        cycle = cycle_of_fifths_minor if "minor" in pattern else cycle_of_fifths_major
+        for tonality in cycle:
+            root = tonality.split()[0]
+            chord_notes, note_degrees, use_sharps = get_chord_pattern(root, pattern)
+            entries.append(PatternEntry(f"{root} {pattern}", chord_notes, note_degrees, use_sharps))
+    #---------------------------------------------------------------------------------------
+    else:
+        Scales = generate_scales_in_cycle(selected_pattern_name, is_minor="minor" in selected_pattern_name)
+        for tonality, scale in Scales.items():
+            key_info = get_key_signature(tonality)
+            entries.append(PatternEntry(f"{tonality.split()[0]} {selected_pattern_name}", scale, {},
+                                        key_info["use_sharps"]))
+    return entries
+
+@lru_cache(maxsize=None)
+def get_gallery_entries(gallery_name):
+    """Manches d'une galerie : tous les modes dans les 12 tonalités ou tous les accords sur les 12 fondamentales."""
+    if gallery_name == "Gallery -All Chords":
+        pattern_names = [f"All Chords -{chords_name}" for chords_name in CHORDS_INTERVALS]
+    else:
+        pattern_names = list(SCALE_TYPES)
+    return tuple(entry for pattern_name in pattern_names
+                 for entry in get_pattern_entries(pattern_name, Chords_scales))
+
+def get_neck_rect(x_offset, y_offset, num_strings, num_frets):
+    """Zone de scène occupée par un manche : titre, cases, grille et notes."""
+    return QRectF(x_offset - 20, y_offset - 20, num_frets * 50 + 50, num_strings * 30 + 45)
+
+def is_chord_pattern(pattern_name):
+    """Pattern du menu dont chaque manche est un accord (doigtés disponibles)."""
+    return "All Chords -" in pattern_name or "Chords in Scale" in pattern_name
+
+def get_voicing_neck(entry, string_tunings, num_frets, notes, voicing_index):
+    """
+    Titre, notes et doigté d'un manche d'accord pour le doigté voicing_index (1 = le mieux classé).
+
+    :param notes: Notes de l'accord sur tout le manche (compute_neck_notes), filtrées selon le doigté.
+    :return: (titre, notes, doigté ou None)
+    """
+    chord_mask, _ = get_pattern_lookup(tuple(entry.note_pattern))
+    voicings = find_chord_voicings(string_tunings, min(num_frets, VOICING_MAX_FRET), chord_mask,
+                                   NOTE_TO_PITCH_CLASS[entry.note_pattern[0]])
+    if not voicings:
+        return f"{entry.label}  (no voicing)", (), None
+    # Les accords n'ont pas tous autant de doigtés : chaque manche boucle sur les siens
+    index = (voicing_index - 1) % len(voicings)
+    voicing = voicings[index]
+    return (f"{entry.label}  {index + 1}/{len(voicings)}",
+            tuple(note for note in notes if voicing[note[0]] == note[1]), voicing)
+
+def get_position_neck(entry, scale_type, string_tunings, num_frets, notes, scale_position):
+    """
+    Titre et notes d'un manche de gamme réduit à une position (voir ScalePositionIndex).
+
+    :param scale_position: (ScalePositionIndex, type de position, numéro de la position).
+    :return: (titre, notes)
+    """
+    position_index, kind, number = scale_position
+    position, count = position_index.get(string_tunings, scale_type, NOTE_TO_PITCH_CLASS[entry.note_pattern[0]],
+                                         kind, number)
+    # Les positions sont indexées jusqu'à POSITION_MAX_FRET : le manche affiché les coupe à num_frets
+    return (f"{entry.label}  {POSITION_KINDS[kind]} {(number - 1) % count + 1}/{count}",
+            tuple(note for note in notes if (note[0], note[1]) in position and note[1] <= num_frets))
+
+def build_scene_layout(selected_pattern_name, chords_scales, num_strings, num_columns, num_frets, string_tunings=None,
+                       voicing_index=0, scale_position=None):
+    """
+    Calcule la disposition de tous les manches d'un pattern, sans toucher à la scène.
+
+    :param string_tunings: Notes à vide (voir TuningRegistry) ; le nombre de cordes est alors le leur.
+    :param voicing_index: Pour les accords, doigté affiché (voir find_chord_voicings) ; 0 = toutes les notes.
+    :param scale_position: Pour les gammes, (ScalePositionIndex, type, numéro) de la position affichée ;
+                           None = tout le manche.
+    :return: Liste de NeckLayout, un par emplacement de la grille (GalleryLayout pour une galerie).
+    """
+    string_tunings = tuple(string_tunings) if string_tunings else tuple(get_string_tunings(num_strings))
+    num_strings = len(string_tunings)
+    if selected_pattern_name in GALLERY_PATTERNS:
+        return GalleryLayout(get_gallery_entries(selected_pattern_name), num_strings, num_columns, num_frets,
+                             string_tunings)
+    if selected_pattern_name == NOTE_FINDER_PATTERN:
+        # Sans notes choisies : seul le manche de saisie est affiché
+        return NoteFinder().build_layout(num_strings, num_columns, num_frets, string_tunings)
+    return list(iter_neck_layouts(selected_pattern_name, chords_scales, num_columns, num_frets, string_tunings,
+                                  voicing_index, scale_position))
+
+def iter_neck_layouts(selected_pattern_name, chords_scales, num_columns, num_frets, string_tunings,
+                      voicing_index=0, scale_position=None):
+    """
+    Manches d'un pattern du menu (ni galerie, ni recherche), calculés un à la fois.
+
+    La recherche des doigtés (voicing_index) d'un accord n'est faite que lorsque son manche est demandé :
+    SceneUpdater.apply_steps peut ainsi la répartir dans les tranches de UpdateScheduler.
+
+    :return: Générateur de NeckLayout, voir build_scene_layout.
+    """
+    string_tunings = tuple(string_tunings)
+    num_strings = len(string_tunings)
+    # Cache frequently used multipliers
+    x_multiplier = 62.5 * num_frets
+    y_multiplier = 42 * num_strings
+    for i, entry in enumerate(get_pattern_entries(selected_pattern_name, chords_scales)):
+        x_offset = (i % num_columns) * x_multiplier
+        y_offset = (i // num_columns) * y_multiplier
+        if entry is None:
+            yield NeckLayout(x_offset, y_offset, num_strings, num_frets, None, (), string_tunings=string_tunings)
+        else:
+            notes = compute_neck_notes(string_tunings, num_frets, entry.note_pattern, entry.note_degrees,
+                                       entry.use_sharps)
+            if voicing_index and entry.note_degrees:
+                label, notes, voicing = get_voicing_neck(entry, string_tunings, num_frets, notes, voicing_index)
+                yield NeckLayout(x_offset, y_offset, num_strings, num_frets, label, notes, voicing, string_tunings)
+            elif scale_position is not None and selected_pattern_name in SCALE_TYPES:
+                label, notes = get_position_neck(entry, selected_pattern_name, string_tunings, num_frets, notes,
+                                                 scale_position)
+                yield NeckLayout(x_offset, y_offset, num_strings, num_frets, label, notes,
+                                 string_tunings=string_tunings)
+            else:
+                yield NeckLayout(x_offset, y_offset, num_strings, num_frets, entry.label, notes,
+                                 string_tunings=string_tunings)
+
+def get_layout_tunings(neck_layout):
+    """Accordage d'un NeckLayout ; une disposition construite sans accordage est en "Standard"."""
+    if neck_layout.string_tunings:
+        return tuple(neck_layout.string_tunings)
+    return tuple(get_string_tunings(neck_layout.num_strings))
+
+def get_layout_rect(layout):
+    """Zone de scène couverte par une disposition (liste de NeckLayout ou GalleryLayout)."""
+    if isinstance(layout, GalleryLayout):
+        return layout.content_rect()
+    rect = QRectF()
+    for neck_layout in layout:
+        rect = rect.united(get_neck_rect(*neck_layout[:4]))
+    return rect
+
+class GalleryLayout:
+    """
+    Disposition virtuelle d'une galerie de manches, de taille quelconque.
+
+    La position d'un manche se déduit de son index et ses notes ne sont calculées que lorsqu'il
+    est demandé (neck_layout) : construire la galerie ne coûte que la liste des PatternEntry.
+    """
+    def __init__(self, entries, num_strings, num_columns, num_frets, string_tunings=None):
+        self.entries = entries
+        self.string_tunings = tuple(string_tunings) if string_tunings else tuple(get_string_tunings(num_strings))
+        self.num_strings = num_strings = len(self.string_tunings)
+        self.num_columns = num_columns
+        self.num_frets = num_frets
+        self.x_spacing = 62.5 * num_frets  # mêmes espacements que build_scene_layout
+        self.y_spacing = 42 * num_strings
+        self.num_rows = -(-len(entries) // num_columns)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (self.neck_layout(index) for index in range(len(self.entries)))
+
+    def neck_layout(self, index):
+        entry = self.entries[index]
+        x_offset = (index % self.num_columns) * self.x_spacing
+        y_offset = (index // self.num_columns) * self.y_spacing
+        return NeckLayout(x_offset, y_offset, self.num_strings, self.num_frets, entry.label,
+                          compute_neck_notes(self.string_tunings, self.num_frets, entry.note_pattern,
+                                             entry.note_degrees, entry.use_sharps),
+                          string_tunings=self.string_tunings)
+
+    def content_rect(self):
+        last = get_neck_rect((self.num_columns - 1) * self.x_spacing, (self.num_rows - 1) * self.y_spacing,
+                             self.num_strings, self.num_frets)
+        return get_neck_rect(0, 0, self.num_strings, self.num_frets).united(last)
+
+    def position_at(self, point):
+        """(index, corde, case) de la note la plus proche de point (coordonnées de scène), ou None."""
+        column = int(point.x() // self.x_spacing)
+        row = int(point.y() // self.y_spacing)
+        index = row * self.num_columns + column
+        if not (0 <= column < self.num_columns and 0 <= row and index < len(self.entries)):
+            return None
+        # Centre des notes : (case * 50, corde * 30 + 40) depuis l'origine du manche
+        x = point.x() - column * self.x_spacing
+        y = point.y() - row * self.y_spacing - 40
+        fret = round(x / 50)
+        string = round(y / 30)
+        if 0 <= fret <= self.num_frets and 0 <= string < self.num_strings \
+                and abs(x - fret * 50) <= 15 and abs(y - string * 30) <= 15:
+            return index, string, fret
+        return None
+
+    def pitch_class_at(self, point):
+        """Classe de hauteur de la case sous point, ou None hors des manches."""
+        position = self.position_at(point)
+        if position is None:
+            return None
+        _, string, fret = position
+        return get_fretboard_table(self.string_tunings, self.num_frets)[string * (self.num_frets + 1) + fret]
+
+    def indices_in(self, rect, margin=GALLERY_MARGIN_NECKS):
+        """Index des manches qui croisent rect, plus `margin` lignes et colonnes de chaque côté."""
+        first_column = max(0, int(rect.left() // self.x_spacing) - margin)
+        last_column = min(self.num_columns - 1, int(rect.right() // self.x_spacing) + margin)
+        first_row = max(0, int(rect.top() // self.y_spacing) - margin)
+        last_row = min(self.num_rows - 1, int(rect.bottom() // self.y_spacing) + margin)
+        return [index for row in range(first_row, last_row + 1)
+                for index in range(row * self.num_columns + first_column, row * self.num_columns + last_column + 1)
+                if index < len(self.entries)]
+
+def get_neck_at(layout, point):
+    """NeckLayout du manche (avec titre) sous point, en coordonnées de scène, ou None."""
+    if isinstance(layout, GalleryLayout):
+        necks = [layout.neck_layout(index) for index in layout.indices_in(QRectF(point, point), margin=0)]
+    else:
+        necks = layout
+    for neck_layout in necks:
+        if neck_layout.label is not None and get_neck_rect(*neck_layout[:4]).contains(point):
+            return neck_layout
+    return None
+
+def render_neck_pixmap(neck_layout, show_all_colors, render_scale=1.0):
+    """
+    Rend un manche complet (grille, cases, titre, notes) dans une image.
+
+    :return: (QPixmap, QRectF) l'image et la zone couverte, relative à l'origine du manche.
+    """
+    offscreen_scene = QGraphicsScene()
+    neck = GuitarNeck(offscreen_scene, 0, 0, neck_layout.num_strings, neck_layout.num_frets,
+                      show_all_colors=show_all_colors, string_tunings=neck_layout.string_tunings)
+    neck.set_root_label(neck_layout.label)
+    neck.set_notes(neck_layout.notes)
+    neck.set_voicing(neck_layout.voicing)
+    source = offscreen_scene.itemsBoundingRect()
+    image = QImage(max(1, round(source.width() * render_scale)), max(1, round(source.height() * render_scale)),
+                   QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.setRenderHint(QPainter.TextAntialiasing, True)
+    offscreen_scene.render(painter, QRectF(image.rect()), source)
+    painter.end()
+    return QPixmap.fromImage(image), source
+
+class DiagramPixmapCache:
+    """
+    Cache LRU des manches déjà rendus, borné en mémoire.
+
+    La clé reprend tout ce qui détermine le dessin d'un manche : titre (tonalité + pattern),
+    cordes, cases, notes placées, doigté, mode de couleur et échelle de rendu.
+    """
+    def __init__(self, max_bytes=PIXMAP_CACHE_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # clé -> (QPixmap, QRectF, taille en octets)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, neck_layout, show_all_colors, render_scale=1.0):
+        key = (neck_layout.label, neck_layout.num_strings, neck_layout.num_frets, neck_layout.notes,
+               neck_layout.voicing, show_all_colors, render_scale)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0], entry[1]
+        self.misses += 1
+        pixmap, source = render_neck_pixmap(neck_layout, show_all_colors, render_scale)
+        size = pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        self.entries[key] = (pixmap, source, size)
+        self.current_bytes += size
+        # Éviction des entrées les moins récemment utilisées
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+        return pixmap, source
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+class SceneUpdater:
+    """
+    Applique une disposition (build_scene_layout) à la scène en ne modifiant que ce qui change :
+    les manches de même géométrie sont conservés, seules les notes différentes sont ajoutées ou
+    retirées et le mode de couleur est appliqué en restylant les contours en place.
+
+    Avec un DiagramPixmapCache, chaque manche est affiché comme une seule image tirée du cache.
+    """
+    def __init__(self, scene, pool_max_items=POOL_MAX_ITEMS, pixmap_cache=None, monitor=None):
+        self.scene = scene
+        self.monitor = monitor  # PerformanceMonitor optionnel pour chronométrer les phases
+        self.pool = GraphicsItemPool(scene, pool_max_items)
+        self.necks = []
+        self.pixmap_cache = pixmap_cache
+        self.pixmap_items = []
+        self.render_scale = 1.0
+        self.layout = []
+        self.show_all_colors = False
+
+    def apply(self, layout, show_all_colors):
+        for _ in self.apply_steps(layout, show_all_colors):
+            pass
+
+    def apply_steps(self, layout, show_all_colors):
+        """
+        Générateur appliquant la disposition un manche à la fois (une étape par manche).
+
+        Interrompu entre deux étapes, la scène reste cohérente : les premiers manches sont à jour,
+        les suivants montrent encore l'ancienne disposition.
+
+        :param layout: Liste de NeckLayout, ou générateur (iter_neck_layouts) dont chaque manche n'est calculé
+                       qu'à son étape ; self.layout reçoit les manches appliqués.
+        """
+        self.layout = []
+        self.show_all_colors = show_all_colors
+        if self.pixmap_cache is not None:
+            self.layout = list(layout)
+            self.apply_pixmaps(self.layout, show_all_colors)
+            return
+        phase = self.monitor.phase if self.monitor else lambda name: _NO_PHASE
+        for i, neck_layout in enumerate(layout):
+            self.layout.append(neck_layout)
+            neck = self.necks[i] if i < len(self.necks) else None
+            with phase("necks"):
+                # Un manche n'est gardé que s'il a la même géométrie et le même accordage
+                if neck is not None and ((neck.x_offset, neck.y_offset, neck.strings, neck.frets, neck.string_tunings)
+                                         != (*neck_layout[:4], get_layout_tunings(neck_layout))):
+                    neck.remove()
+                    neck = None
+                if neck is None:
+                    neck = GuitarNeck(self.scene, neck_layout.x_offset, neck_layout.y_offset,
+                                      neck_layout.num_strings, neck_layout.num_frets,
+                                      show_all_colors=show_all_colors, pool=self.pool,
+                                      string_tunings=neck_layout.string_tunings)
+                    if i < len(self.necks):
+                        self.necks[i] = neck
+                    else:
+                        self.necks.append(neck)
+            with phase("notes"):
+                neck.set_show_all_colors(show_all_colors)
+                neck.set_root_label(neck_layout.label)
+                neck.set_notes(neck_layout.notes)
+                neck.set_voicing(neck_layout.voicing)
+            yield
+        with phase("necks"):
+            for neck in self.necks[len(self.layout):]:
+                neck.remove()
+            del self.necks[len(self.layout):]
+
+    def apply_pixmaps(self, layout, show_all_colors):
+        for i, neck_layout in enumerate(layout):
+            if i < len(self.pixmap_items):
+                pixmap_item = self.pixmap_items[i]
+            else:
+                pixmap_item = QGraphicsPixmapItem()
+                pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+                self.scene.addItem(pixmap_item)
+                self.pixmap_items.append(pixmap_item)
+            pixmap, source = self.pixmap_cache.get(neck_layout, show_all_colors, self.render_scale)
+            pixmap_item.setPixmap(pixmap)
+            pixmap_item.setScale(1 / self.render_scale)
+            pixmap_item.setPos(neck_layout.x_offset + source.left(), neck_layout.y_offset + source.top())
+        for pixmap_item in self.pixmap_items[len(layout):]:
+            self.scene.removeItem(pixmap_item)
+        del self.pixmap_items[len(layout):]
+
+    def set_view_scale(self, view_scale):
+        """Régénère les images à plus haute résolution quand le zoom dépasse l'échelle de rendu."""
+        if self.pixmap_cache is None:
+            return
+        render_scale = 1.0
+        while render_scale < view_scale and render_scale < PIXMAP_MAX_SCALE:
+            render_scale *= 2
+        if render_scale > self.render_scale:
+            self.render_scale = render_scale
+            self.apply_pixmaps(self.layout, self.show_all_colors)
+
+    def clear(self):
+        """Vide la scène des manches : les items sont masqués et rendus au pool."""
+        for neck in self.necks:
+            neck.remove()
+        self.necks = []
+        for pixmap_item in self.pixmap_items:
+            self.scene.removeItem(pixmap_item)
+        self.pixmap_items = []
+
+class PitchClassIndex:
+    """
+    Index inversé des gammes et accords sur les 12 fondamentales.
+
+    Pour chaque classe de hauteur, un entier dont le bit i indique si l'entrée i la contient :
+    une requête se résout par au plus 12 ET entre ces entiers, sans générer aucune gamme.
+    """
+    def __init__(self, entries):
+        self.entries = tuple(entries)  # PatternEntry (titre, notes, degrés, orthographe)
+        self.masks = tuple(get_pattern_lookup(tuple(entry.note_pattern))[0] for entry in self.entries)
+        self.postings = [0] * 12
+        for index, mask in enumerate(self.masks):
+            for pitch_class in range(12):
+                if mask >> pitch_class & 1:
+                    self.postings[pitch_class] |= 1 << index
+        self.all_entries = (1 << len(self.entries)) - 1
+
+    def match(self, mask, mode="superset"):
+        """
+        Entrées correspondant au masque d'une requête, sous forme d'ensemble de bits.
+
+        :param mode: "superset" (l'entrée contient toutes les notes), "subset" (l'entrée n'utilise
+                     que ces notes) ou "exact" (les deux).
+        """
+        result = self.all_entries
+        for pitch_class in range(12):
+            if mask >> pitch_class & 1:
+                if mode != "subset":
+                    result &= self.postings[pitch_class]
+            elif mode != "superset":
+                result &= ~self.postings[pitch_class]
+        return result
+
+    def query(self, mask, mode="superset"):
+        """Entrées correspondantes, celles dont le nombre de notes est le plus proche de la requête d'abord."""
+        bits = self.match(mask, mode)
+        indices = []
+        while bits:
+            lowest = bits & -bits
+            indices.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        size = bin(mask).count("1")
+        indices.sort(key=lambda index: abs(bin(self.masks[index]).count("1") - size))
+        return [self.entries[index] for index in indices]
+
+@lru_cache(maxsize=None)
+def get_pitch_class_index():
+    """Index de toutes les gammes et de tous les accords des galeries (construit à la première recherche)."""
+    # "C major" désigne aussi bien la gamme que l'accord : les accords sont précisés dans les résultats
+    chords = tuple(entry._replace(label=f"{entry.label} chord") for entry in get_gallery_entries("Gallery -All Chords"))
+    return PitchClassIndex(get_gallery_entries("Gallery -All Scales") + chords)
+
+class NoteFinder:
+    """
+    Recherche des gammes et accords à partir d'un ensemble de notes (pattern NOTE_FINDER_PATTERN).
+
+    Le premier manche montre les notes choisies, les suivants les résultats de PitchClassIndex.
+    """
+    MODES = {"superset": "Containing", "subset": "Within", "exact": "Exactly"}
+
+    def __init__(self):
+        self.mask = 0
+        self.mode = "superset"
+        self.use_sharps = True
+
+    def set_text(self, text):
+        """Notes tapées, séparées par des espaces ou des virgules ; les noms inconnus sont ignorés."""
+        self.mask = 0
+        tokens = text.replace(",", " ").split()
+        for token in tokens:
+            note = token[:1].upper() + token[1:]
+            if note in NOTE_TO_PITCH_CLASS:
+                self.mask |= 1 << NOTE_TO_PITCH_CLASS[note]
+        self.use_sharps = not any(len(token) > 1 and token[1] == "b" for token in tokens)
+
+    def text(self):
+        return " ".join(spell_pitch_classes(mask_to_pitch_classes(self.mask), self.use_sharps))
+
+    def toggle(self, pitch_class):
+        self.mask ^= 1 << pitch_class
+
+    def results(self):
+        return get_pitch_class_index().query(self.mask, self.mode) if self.mask else []
+
+    def build_layout(self, num_strings, num_columns, num_frets, string_tunings=None):
+        notes = spell_pitch_classes(mask_to_pitch_classes(self.mask), self.use_sharps)
+        label = f"Notes : {' '.join(notes)}" if notes else "Click the neck or type notes"
+        entries = (PatternEntry(label, notes, {}, self.use_sharps),) + tuple(self.results())
+        return GalleryLayout(entries, num_strings, num_columns, num_frets, string_tunings)
+
+class GalleryUpdater:
+    """
+    Affiche une GalleryLayout en ne matérialisant que les manches proches de la zone visible.
+
+    Les manches qui sortent de la zone sont déplacés vers ceux qui y entrent ; notes, cases et titres
+    passent par le pool (partagé avec SceneUpdater). Le nombre d'items dans la scène dépend donc de la
+    taille de la vue et non de celle de la galerie. Les manches sont toujours dessinés en items, même
+    avec --pixmap-cache.
+    """
+    def __init__(self, scene, pool):
+        self.scene = scene
+        self.pool = pool
+        self.layout = None
+        self.show_all_colors = False
+        self.necks = {}  # index dans la galerie -> GuitarNeck
+        self.recycled = 0
+
+    def set_layout(self, layout, show_all_colors):
+        self.clear()
+        self.layout = layout
+        self.show_all_colors = show_all_colors
+
+    def set_visible_rect(self, rect):
+        """Matérialise les manches qui croisent rect (coordonnées de scène) et recycle les autres."""
+        if self.layout is None:
+            return
+        wanted = self.layout.indices_in(rect)
+        wanted_set = set(wanted)
+        spare_necks = [self.necks.pop(index) for index in list(self.necks) if index not in wanted_set]
+        for index in wanted:
+            if index in self.necks:
+                continue
+            neck_layout = self.layout.neck_layout(index)
+            if spare_necks:
+                neck = spare_necks.pop()
+                neck.move_to(neck_layout.x_offset, neck_layout.y_offset)
+                self.recycled += 1
+            else:
+                neck = GuitarNeck(self.scene, neck_layout.x_offset, neck_layout.y_offset, neck_layout.num_strings,
+                                  neck_layout.num_frets, show_all_colors=self.show_all_colors, pool=self.pool,
+                                  string_tunings=neck_layout.string_tunings)
+            neck.set_root_label(neck_layout.label)
+            neck.set_notes(neck_layout.notes)
+            self.necks[index] = neck
+        # Zone visible réduite (zoom avant) : les manches en trop rendent leurs items au pool
+        for neck in spare_necks:
+            neck.remove()
+
+    def clear(self):
+        for neck in self.necks.values():
+            neck.remove()
+        self.necks = {}
+        self.layout = None
+
+    def stats(self):
+        return {"diagrams": len(self.layout) if self.layout is not None else 0,
+                "materialized": len(self.necks), "recycled": self.recycled}
+
+# =============================================================================
+# SYNTHÈSE SONORE : NOTES PINCÉES EN NUMPY, BANQUE DE SONS ET MIXAGE
+# =============================================================================
+# NumPy n'est importé qu'à la première note (ImportError si absent) : le démarrage n'en dépend pas
+
+@lru_cache(maxsize=None)
+def get_string_midi_notes(string_tunings):
+    """Numéro MIDI de chaque corde à vide (ordre de l'accordage), la plus aiguë au plus près sous E4."""
+    pitches = get_string_pitches(string_tunings)
+    highest = SYNTH_HIGHEST_STRING_MIDI - (SYNTH_HIGHEST_STRING_MIDI - NOTE_TO_PITCH_CLASS[string_tunings[0]]) % 12
+    return tuple(highest - pitches[0] + pitch for pitch in pitches)
+
+def get_neck_midi_notes(string_tunings, placed_notes):
+    """
+    Notes d'un manche dans l'ordre où les jouer : du grave à l'aigu, chaque hauteur une seule fois.
+
+    :param placed_notes: (corde, case, ...) comme NeckLayout.notes.
+    """
+    string_midi_notes = get_string_midi_notes(tuple(string_tunings))
+    return sorted({string_midi_notes[note[0]] + note[1] for note in placed_notes})
+
+def synthesize_pluck(midi_note, sample_rate=SYNTH_SAMPLE_RATE, seconds=SYNTH_NOTE_SECONDS):
+    """
+    Note de corde pincée par synthèse additive, calculée d'un bloc (harmoniques x échantillons).
+
+    Chaque harmonique k a l'amplitude d'une corde pincée en SYNTH_PLUCK_POSITION (|sin(pi k p)| / k²)
+    et s'éteint d'autant plus vite qu'elle est aiguë ; elle n'est calculée que tant qu'elle reste audible.
+
+    :return: np.ndarray float32 de crête 0.5.
+    """
+    import numpy as np
+    frequency = 440.0 * 2 ** ((midi_note - 69) / 12)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    tone = np.zeros(len(t))
+    for harmonic in range(1, SYNTH_HARMONICS + 1):
+        if harmonic * frequency >= sample_rate / 2:
+            break
+        amplitude = abs(math.sin(math.pi * harmonic * SYNTH_PLUCK_POSITION)) / harmonic ** 2
+        if amplitude < 1e-3:
+            continue  # noeud au point d'attaque
+        decay = SYNTH_DECAY * (1 + 0.6 * (harmonic - 1)) * (frequency / 110) ** 0.3
+        # Au-delà, l'harmonique est à plus de 60 dB sous son attaque
+        audible = t[:min(len(t), int(sample_rate * math.log(1000) / decay))]
+        tone[:len(audible)] += amplitude * np.exp(-decay * audible) * np.sin(2 * np.pi * frequency * harmonic * audible)
+    attack = int(0.003 * sample_rate)  # montée de 3 ms : pas de clic au début de la note
+    tone[:attack] *= np.linspace(0.0, 1.0, attack)
+    tone *= 0.5 / np.abs(tone).max()
+    return tone.astype(np.float32)
+
+class ToneBank:
+    """
+    Banque LRU des notes synthétisées, une par numéro MIDI.
+
+    Une note n'est calculée qu'à sa première demande ; les buffers rendus sont partagés
+    et ne doivent pas être modifiés.
+    """
+    def __init__(self, sample_rate=SYNTH_SAMPLE_RATE, max_notes=SYNTH_BANK_SIZE):
+        self.sample_rate = sample_rate
+        self.max_notes = max_notes
+        self.samples = OrderedDict()  # numéro MIDI -> np.ndarray float32
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, midi_note):
+        samples = self.samples.get(midi_note)
+        if samples is not None:
+            self.hits += 1
+            self.samples.move_to_end(midi_note)
+            return samples
+        self.misses += 1
+        samples = synthesize_pluck(midi_note, self.sample_rate)
+        self.samples[midi_note] = samples
+        while len(self.samples) > self.max_notes:
+            self.samples.popitem(last=False)
+        return samples
+
+    def stats(self):
+        return {"notes": len(self.samples), "hits": self.hits, "misses": self.misses}
+
+class ToneMixer:
+    """
+    Assemble une suite de notes de la banque dans un buffer de sortie alloué une fois.
+
+    Chaque note est ajoutée en place dans une tranche du buffer (vue, sans copie) ; le buffer ne grandit
+    que pour une suite plus longue que toutes les précédentes.
+    """
+    def __init__(self, bank):
+        import numpy as np
+        self.bank = bank
+        self.buffer = np.zeros(int(bank.sample_rate * 8 * SYNTH_STEP_SECONDS), dtype=np.float32)
+
+    def render(self, midi_notes, step_seconds=SYNTH_STEP_SECONDS):
+        """
+        Mixe les notes, chacune step_seconds après la précédente.
+
+        :return: Vue float32 sur le buffer de sortie, valable jusqu'au rendu suivant.
+        """
+        import numpy as np
+        step = int(step_seconds * self.bank.sample_rate)
+        samples = [self.bank.get(midi_note) for midi_note in midi_notes]
+        length = max((i * step + len(note) for i, note in enumerate(samples)), default=0)
+        if length > len(self.buffer):
+            self.buffer = np.zeros(length, dtype=np.float32)
+        output = self.buffer[:length]
+        output.fill(0.0)
+        for i, note in enumerate(samples):
+            output[i * step:i * step + len(note)] += note
+        peak = np.abs(output).max(initial=0.0)
+        if peak > 1.0:
+            output *= 1.0 / peak
+        return output
+
+def to_pcm16(samples):
+    """Échantillons float (-1..1) en octets PCM 16 bits little-endian."""
+    import numpy as np
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+def write_wav(path, samples, sample_rate=SYNTH_SAMPLE_RATE):
+    """Écrit des échantillons float (-1..1) en WAV mono 16 bits."""
+    import wave
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(to_pcm16(samples))
+
+class AudioPlayer:
+    """
+    Lecture des suites mixées par QAudioSink (QtMultimedia, optionnel).
+
+    La sortie audio est ouverte à la première lecture ; play() et play_file() renvoient False si
+    QtMultimedia ou le périphérique de sortie manque.
+
+    :param sample_format: Nom d'un QAudioFormat.SampleFormat ("Int16", "Int32", "Float").
+    """
+    def __init__(self, sample_rate=SYNTH_SAMPLE_RATE, channels=1, sample_format="Int16"):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_format = sample_format
+        self.sink = None
+        self.buffer = None
+        self.available = None  # inconnu tant que la sortie n'a pas été ouverte
+
+    def open(self):
+        try:
+            from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+        except ImportError:
+            return False
+        device = QMediaDevices.defaultAudioOutput()
+        if device.isNull():
+            return False
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(self.sample_rate)
+        audio_format.setChannelCount(self.channels)
+        audio_format.setSampleFormat(getattr(QAudioFormat, self.sample_format))
+        self.sink = QAudioSink(device, audio_format)
+        return True
+
+    def start(self, device):
+        """Lit un QIODevice ouvert (remplace la lecture en cours)."""
+        if self.available is None:
+            self.available = self.open()
+        if not self.available:
+            return False
+        self.sink.stop()
+        self.buffer = device  # gardé en vie pendant la lecture
+        self.sink.start(device)
+        return True
+
+    def play(self, samples):
+        from PySide6.QtCore import QBuffer, QByteArray
+        buffer = QBuffer()
+        buffer.setData(QByteArray(to_pcm16(samples)))
+        buffer.open(QBuffer.ReadOnly)
+        return self.start(buffer)
+
+    def play_file(self, path, offset):
+        """Lit un fichier d'échantillons bruts à partir de l'octet offset, sans le charger en mémoire."""
+        from PySide6.QtCore import QFile
+        audio_file = QFile(path)
+        if not audio_file.open(QFile.ReadOnly) or not audio_file.seek(offset):
+            return False
+        return self.start(audio_file)
+
+    def position(self):
+        """Secondes envoyées à la sortie depuis le début de la lecture."""
+        return self.sink.processedUSecs() / 1e6
+
+def run_audio_export(args):
+    """Synthétise les notes d'un manche d'un pattern (--audio) dans un fichier WAV."""
+    try:
+        bank = ToneBank()
+        mixer = ToneMixer(bank)
+    except ImportError:
+        print("--audio needs NumPy (pip install numpy)", file=sys.stderr)
+        return 1
+    if args.audio_pattern not in get_pattern_names():
+        print(f"Unknown pattern: {args.audio_pattern}", file=sys.stderr)
+        return 1
+    string_tunings = tuple(get_string_tunings(args.audio_strings))
+    layout = build_scene_layout(args.audio_pattern, Chords_scales, args.audio_strings, 1, args.audio_frets,
+                                string_tunings, args.audio_voicing)
+    if isinstance(layout, GalleryLayout):
+        layout = [layout.neck_layout(index) for index in range(len(layout))]
+    if not 0 <= args.audio_neck < len(layout) or layout[args.audio_neck].label is None:
+        print(f"No diagram {args.audio_neck} in {args.audio_pattern}", file=sys.stderr)
+        return 1
+    neck_layout = layout[args.audio_neck]
+    midi_notes = get_neck_midi_notes(string_tunings, neck_layout.notes)
+    start = time.perf_counter()
+    samples = mixer.render(midi_notes, SYNTH_STRUM_SECONDS if neck_layout.voicing else SYNTH_STEP_SECONDS)
+    elapsed = time.perf_counter() - start
+    write_wav(args.audio, samples)
+    print(f"{neck_layout.label}: {len(midi_notes)} notes, {len(samples) / SYNTH_SAMPLE_RATE:.2f} s "
+          f"rendered in {1000 * elapsed:.1f} ms -> {args.audio}")
+    return 0
+
+# =============================================================================
+# ANALYSE D'ENREGISTREMENTS : DÉTECTION DE HAUTEUR EN FLUX ET SUIVI SUR LE MANCHE
+# =============================================================================
+# Le fichier WAV est projeté en mémoire (np.memmap) et analysé par blocs de PITCH_BLOCK_FRAMES trames :
+# chaque bloc est traité d'un coup (FFT de toutes ses trames), ce qui analyse plusieurs minutes par seconde
+
+WavData = namedtuple("WavData", "samples sample_rate offset sample_format")
+WAV_SAMPLE_FORMATS = {(1, 16): ("<i2", "Int16"), (1, 32): ("<i4", "Int32"), (3, 32): ("<f4", "Float")}
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def open_wav(path):
+    """
+    Échantillons d'un fichier WAV projetés en mémoire, sans lire le fichier.
+
+    :return: WavData ; samples est un np.memmap (trames, canaux), offset la position des échantillons
+             dans le fichier et sample_format le format QAudioFormat correspondant (voir AudioPlayer).
+    :raise ValueError: Fichier qui n'est pas un WAV PCM 16 / 32 bits ou flottant 32 bits.
+    """
+    import numpy as np
+    file_size = os.path.getsize(path)
+    audio_format = None
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            raise ValueError("not a WAV file")
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError("no audio data")
+            chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                if len(fmt) < 16:
+                    raise ValueError("invalid fmt chunk")
+                format_tag, channels, sample_rate, _byte_rate, _block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    format_tag = struct.unpack("<H", fmt[24:26])[0]  # 2 premiers octets du sous-format
+                audio_format = WAV_SAMPLE_FORMATS.get((format_tag, bits))
+                if audio_format is None:
+                    raise ValueError(f"unsupported sample format ({format_tag}, {bits} bits)")
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if audio_format is None:
+                    raise ValueError("data before format")
+                offset = f.tell()
+                break
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    dtype, sample_format = audio_format
+    frame_size = np.dtype(dtype).itemsize * channels
+    # Taille du bloc de données bornée par le fichier (enregistrement interrompu ou taille inconnue)
+    frames = min(chunk_size, file_size - offset) // frame_size
+    if frames == 0:
+        raise ValueError("no audio data")
+    samples = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    return WavData(samples, sample_rate, offset, sample_format)
+
+def iter_analysis_frames(samples, window, hop, block_frames=PITCH_BLOCK_FRAMES):
+    """
+    Trames d'analyse (mono, -1..1) par blocs de block_frames trames, lus un à un dans samples.
+
+    :return: Itérateur de np.ndarray float32 (trames, window), vues sur le bloc lu (sans copie par trame).
+    """
+    import numpy as np
+    scale = 1.0 / 2 ** (8 * samples.dtype.itemsize - 1) if samples.dtype.kind == "i" else 1.0
+    count = 0 if len(samples) < window else 1 + (len(samples) - window) // hop
+    for first in range(0, count, block_frames):
+        frames = min(block_frames, count - first)
+        block = samples[first * hop:(first + frames - 1) * hop + window]
+        mono = block.mean(axis=1, dtype=np.float32)
+        mono *= scale
+        yield np.lib.stride_tricks.sliding_window_view(mono, window)[::hop]
+
+class PitchDetector:
+    """
+    Hauteur de chaque trame par autocorrélation normalisée, calculée par FFT (Wiener-Khintchine).
+
+    Une seule note à la fois : une trame où plusieurs notes se mêlent (accord gratté, notes d'un arpège
+    qui se chevauchent) n'a pas de hauteur, plutôt qu'une hauteur fausse.
+
+    Toutes les trames d'un bloc sont traitées ensemble. Les pics sont cherchés après le lobe central
+    (premier passage sous zéro) ; la période retenue est le premier pic proche du plus haut
+    (PITCH_PEAK_RATIO) plutôt que le plus haut lui-même, qui tombe souvent sur un multiple de la période
+    (octave inférieure).
+    """
+    def __init__(self, sample_rate, window=PITCH_WINDOW, min_hz=PITCH_MIN_HZ, max_hz=PITCH_MAX_HZ):
+        import numpy as np
+        self.sample_rate = sample_rate
+        self.window = window
+        self.min_lag = max(2, int(sample_rate / max_hz))
+        self.max_lag = min(window // 2, int(math.ceil(sample_rate / min_hz)))
+        self.fft_size = 1 << (2 * window - 1).bit_length()  # autocorrélation linéaire, sans repliement
+        self.taper = np.hanning(window).astype(np.float32)
+        # Autocorrélation de la fenêtre : compense l'atténuation qu'elle impose aux grands décalages
+        taper_acf = np.fft.irfft(np.abs(np.fft.rfft(self.taper, self.fft_size)) ** 2)[:self.max_lag + 2]
+        self.taper_acf = (taper_acf / taper_acf[0]).astype(np.float32)
+
+    def estimate(self, frames):
+        """
+        :param frames: np.ndarray (trames, window) d'échantillons -1..1.
+        :return: (numéro MIDI de chaque trame, -1 sans hauteur ; clarté de chaque trame, 1 = périodique).
+        """
+        import numpy as np
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        spectrum = np.fft.rfft(frames * self.taper, self.fft_size, axis=1)
+        acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, self.fft_size, axis=1)[:, :self.max_lag + 2]
+        energy = acf[:, :1]
+        acf = acf / np.where(energy > 0, energy, 1.0) / self.taper_acf
+        region = acf[:, self.min_lag:self.max_lag + 1]
+        lags = np.arange(region.shape[1])
+        # Lobe central (décalages plus petits qu'une demi-période) écarté : il décroît depuis 1 sans être un pic
+        negative = region < 0
+        lobe_end = np.where(negative.any(axis=1), negative.argmax(axis=1), region.shape[1])
+        region = np.where(lags >= lobe_end[:, None], region, -np.inf)
+        highest = region.max(axis=1, keepdims=True)
+        above = region >= PITCH_PEAK_RATIO * highest
+        first = above.argmax(axis=1)
+        # Une note seule n'a pas de pic marqué avant sa période ; plusieurs notes mêlées (accord, notes qui
+        # se chevauchent) donnent une période commune plus longue, précédée des pics de chaque note
+        is_peak = np.zeros(region.shape, dtype=bool)
+        is_peak[:, 1:-1] = (region[:, 1:-1] > region[:, :-2]) & (region[:, 1:-1] >= region[:, 2:])
+        rival = np.where(is_peak & (lags < first[:, None]), region, 0.0).max(axis=1)
+        # Sommet du premier pic : maximum de la suite de décalages au-dessus du seuil qui commence en first
+        below = ~above & (lags > first[:, None])
+        end = np.where(below.any(axis=1), below.argmax(axis=1), region.shape[1])
+        in_peak = (lags >= first[:, None]) & (lags < end[:, None])
+        lag = np.where(in_peak, region, -np.inf).argmax(axis=1) + self.min_lag
+        rows = np.arange(len(frames))
+        clarity = np.where(lobe_end < region.shape[1], acf[rows, lag], 0.0)
+        # Interpolation parabolique autour du sommet
+        left, right = acf[rows, lag - 1], acf[rows, lag + 1]
+        curvature = left - 2 * clarity + right
+        shift = np.where(curvature < 0, 0.5 * (left - right) / np.where(curvature < 0, curvature, -1.0), 0.0)
+        shift = np.clip(shift, -0.5, 0.5)
+        midi = np.rint(69 + 12 * np.log2(self.sample_rate / (lag + shift) / 440.0)).astype(np.int16)
+        unsure = (clarity < PITCH_MIN_CLARITY) | (rival > PITCH_MAX_RIVAL_RATIO * highest[:, 0])
+        midi[unsure | (rms < PITCH_MIN_RMS)] = -1
+        return midi, clarity
+
+def get_note_events(midi, hop_seconds, offset_seconds=0.0, min_frames=PITCH_MIN_FRAMES):
+    """
+    Regroupe les hauteurs par trame en notes : (début, fin, numéro MIDI) en secondes.
+
+    :param midi: Numéro MIDI de chaque trame (-1 sans hauteur).
+    :param offset_seconds: Début de la première trame attribuée à sa hauteur.
+    """
+    import numpy as np
+    if len(midi) == 0:
+        return []
+    boundaries = np.flatnonzero(midi[1:] != midi[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(midi)]))
+    keep = (midi[starts] >= 0) & (ends - starts >= min_frames)
+    return [(offset_seconds + int(start) * hop_seconds, offset_seconds + int(end) * hop_seconds, int(midi[start]))
+            for start, end in zip(starts[keep], ends[keep])]
+
+def detect_note_events(wav, hop=PITCH_HOP, detector=None):
+    """
+    Notes jouées dans un enregistrement (WavData), en une passe sur le fichier.
+
+    La mémoire utilisée dépend de PITCH_BLOCK_FRAMES et non de la durée de l'enregistrement.
+
+    :return: Liste de (début, fin, numéro MIDI) en secondes, dans l'ordre.
+    """
+    import numpy as np
+    detector = detector or PitchDetector(wav.sample_rate)
+    midi = [detector.estimate(frames)[0] for frames in iter_analysis_frames(wav.samples, detector.window, hop)]
+    # Une trame compte pour son centre, à hop / 2 près
+    return get_note_events(np.concatenate(midi) if midi else np.zeros(0, np.int16), hop / wav.sample_rate,
+                           (detector.window - hop) / 2 / wav.sample_rate)
+
+def get_midi_note_name(midi_note):
+    """Nom d'un numéro MIDI avec son octave (60 -> C4)."""
+    return f"{notes_sharp[midi_note % 12]}{midi_note // 12 - 1}"
+
+class FollowLatency:
+    """
+    Retard entre l'instant prévu d'un changement de notes (début ou fin de note, arrivée d'un message)
+    et le dessin de la vue qui l'affiche, en millisecondes.
+    """
+    def __init__(self):
+        self.pending = []  # instants prévus des changements pas encore dessinés
+        self.latencies = []
+
+    def add(self, scheduled_times):
+        self.pending += scheduled_times
+
+    def discard(self):
+        """Changements sans effet visible (aucune note affichée) : aucun dessin ne les suivra."""
+        self.pending = []
+
+    def frame_drawn(self, now):
+        if self.pending:
+            self.latencies += [(now - scheduled) * 1000 for scheduled in self.pending]
+            self.pending = []
+
+    def stats(self):
+        if not self.latencies:
+            return {"events": 0}
+        latencies = sorted(self.latencies)
+        mean = sum(latencies) / len(latencies)
+        return {"events": len(latencies), "mean_ms": mean, "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+                "max_ms": latencies[-1],
+                "jitter_ms": math.sqrt(sum((latency - mean) ** 2 for latency in latencies) / len(latencies))}
+
+class NoteFollower(QObject):
+    """
+    Suit des notes datées (début, fin, numéro MIDI) au rythme d'une horloge en secondes et émet
+    notesChanged avec les notes en cours à chaque changement.
+
+    Le minuteur est armé sur la prochaine échéance (début ou fin de note) plutôt qu'à intervalle fixe ;
+    latency mesure le retard de l'affichage (voir FollowLatency).
+
+    :param clock: Secondes écoulées depuis le début (par défaut, le temps réel depuis start()).
+    """
+    notesChanged = Signal(object)  # frozenset des numéros MIDI en cours
+    finished = Signal()
+
+    def __init__(self, events, clock=None, parent=None):
+        super().__init__(parent)
+        self.events = sorted(events)
+        self.clock = clock
+        self.next_event = 0
+        self.active = []  # (fin, numéro MIDI) des notes en cours
+        self.notes = frozenset()
+        self.latency = FollowLatency()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        if self.clock is None:
+            start = time.perf_counter()
+            self.clock = lambda: time.perf_counter() - start
+        self.tick()
+
+    def stop(self):
+        self.timer.stop()
+        self.active = []
+        self.set_notes(frozenset())
+
+    def tick(self):
+        now = self.clock()
+        scheduled = []
+        while self.next_event < len(self.events) and self.events[self.next_event][0] <= now:
+            start, end, note = self.events[self.next_event]
+            self.active.append((end, note))
+            scheduled.append(start)
+            self.next_event += 1
+        scheduled += [end for end, _note in self.active if end <= now]
+        self.active = [(end, note) for end, note in self.active if end > now]
+        self.set_notes(frozenset(note for _end, note in self.active), scheduled)
+        deadlines = [end for end, _note in self.active]
+        if self.next_event < len(self.events):
+            deadlines.append(self.events[self.next_event][0])
+        if not deadlines:
+            self.finished.emit()
+            return
+        self.timer.start(min(FOLLOW_MAX_WAIT_MS, max(0, math.ceil((min(deadlines) - now) * 1000))))
+
+    def set_notes(self, notes, scheduled=()):
+        if notes != self.notes:
+            self.notes = notes
+            self.latency.add(scheduled)
+            self.notesChanged.emit(notes)
+
+class NoteHighlighter:
+    """
+    Allume les notes suivies sur les manches affichés sans reconstruire la scène : seul le remplissage
+    des NoteItems existants change (NoteItem.set_highlight).
+
+    Les NoteItems sont retrouvés par un index numéro MIDI (toutes les cases de cette hauteur exacte) ou
+    classe de hauteur (by_pitch_class : toutes les octaves) -> NoteItems, construit une fois par état de
+    la scène ; un changement de notes ne touche que les items des notes qui changent. Un manche qui ne
+    contient pas la classe de hauteur d'une note suivie (note hors de sa gamme ou de son accord) a son
+    titre signalé (GuitarNeck.set_flagged).
+
+    :param get_necks: Fonction renvoyant les GuitarNeck affichés.
+    """
+    def __init__(self, get_necks, by_pitch_class=False):
+        self.get_necks = get_necks
+        self.by_pitch_class = by_pitch_class
+        self.index = None  # numéro MIDI ou classe de hauteur -> NoteItems
+        self.neck_pitch_classes = []  # (GuitarNeck, classes de hauteur affichées)
+        self.notes = frozenset()
+        self.keys = frozenset()  # clés de l'index allumées
+        self.flagged = []  # manches signalés
+
+    def build_index(self):
+        self.index = {}
+        self.neck_pitch_classes = []
+        for neck in self.get_necks():
+            # Accordage de la disposition affichée (NeckLayout.string_tunings, transmis à GuitarNeck)
+            string_midi_notes = get_string_midi_notes(neck.string_tunings)
+            pitch_classes = set()
+            for (string, fret), note_item in neck.note_items.items():
+                pitch_class = NOTE_TO_PITCH_CLASS[note_item.note]
+                pitch_classes.add(pitch_class)
+                key = pitch_class if self.by_pitch_class else string_midi_notes[string] + fret
+                self.index.setdefault(key, []).append(note_item)
+            if pitch_classes:
+                self.neck_pitch_classes.append((neck, pitch_classes))
+
+    def invalidate(self):
+        """Manches affichés modifiés : l'index est reconstruit et les notes en cours rallumées."""
+        notes = self.notes
+        if notes:
+            self.show(())
+        self.index = None
+        if notes:
+            self.show(notes)
+
+    def show(self, midi_notes):
+        """
+        Allume exactement les notes de midi_notes.
+
+        :return: True si un item ou un titre a changé (un dessin de la vue va suivre).
+        """
+        if self.index is None:
+            self.build_index()
+        self.notes = frozenset(midi_notes)
+        pitch_classes = frozenset(midi_note % 12 for midi_note in self.notes)
+        keys = pitch_classes if self.by_pitch_class else self.notes
+        changed = False
+        for key, highlighted in [(key, False) for key in self.keys - keys] + [(key, True) for key in keys - self.keys]:
+            for note_item in self.index.get(key, ()):
+                note_item.set_highlight(highlighted)
+                changed = True
+        self.keys = keys
+        flagged = [neck for neck, neck_pitch_classes in self.neck_pitch_classes
+                   if not pitch_classes <= neck_pitch_classes]
+        if flagged != self.flagged:
+            for neck in self.flagged:
+                neck.set_flagged(False)
+            for neck in flagged:
+                neck.set_flagged(True)
+            self.flagged = flagged
+            changed = True
+        return changed
+
+def run_note_detection(args):
+    """Affiche les notes détectées dans un enregistrement (--detect-notes) et la vitesse de l'analyse."""
+    try:
+        wav = open_wav(args.detect_notes)
+    except ImportError:
+        print("--detect-notes needs NumPy (pip install numpy)", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as error:
+        print(f"{args.detect_notes}: {error}", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    events = detect_note_events(wav)
+    elapsed = time.perf_counter() - start
+    for note_start, note_end, midi_note in events:
+        print(f"{note_start:9.3f} {note_end - note_start:7.3f}  {get_midi_note_name(midi_note)}")
+    duration = len(wav.samples) / wav.sample_rate
+    print(f"{len(events)} notes in {duration:.1f} s of audio, analysed in {elapsed:.2f} s "
+          f"({duration / max(elapsed, 1e-9):.0f}x real time)", file=sys.stderr)
+    return 0
+
+# =============================================================================
+# SUIVI MIDI : FICHIERS STANDARD MIDI ET FLUX MIDI BRUTS
+# =============================================================================
+# Lecteur SMF minimal (formats 0 et 1, sans dépendance) : seules les notes et les changements de tempo servent
+
+def read_variable_length(data, pos):
+    """Quantité à longueur variable d'un fichier MIDI : (valeur, position suivante)."""
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+def read_midi_track(data, pos, end, notes, tempos):
+    """
+    Lit les événements d'une piste MTrk (running status compris).
+
+    :param notes: Reçoit (tick, 0 = fin / 1 = début, canal, numéro MIDI) de chaque note.
+    :param tempos: Reçoit (tick, microsecondes par noire) de chaque changement de tempo.
+    :return: Tick du dernier événement de la piste.
+    """
+    tick = 0
+    status = None
+    while pos < end:
+        delta, pos = read_variable_length(data, pos)
+        tick += delta
+        if data[pos] >= 0x80:
+            status = data[pos]
+            pos += 1
+        elif status is None:
+            raise ValueError("data byte without status")
+        if status == 0xFF:
+            meta_type = data[pos]
+            length, pos = read_variable_length(data, pos + 1)
+            if meta_type == 0x51 and length == 3:
+                tempos.append((tick, int.from_bytes(data[pos:pos + 3], "big")))
+            elif meta_type == 0x2F:
+                return tick
+            pos += length
+            status = None  # les méta-événements et sysex annulent le running status
+        elif status in (0xF0, 0xF7):
+            length, pos = read_variable_length(data, pos)
+            pos += length
+            status = None
+        else:
+            kind, channel = status & 0xF0, status & 0x0F
+            if kind in (0xC0, 0xD0):
+                pos += 1
+                continue
+            note, velocity = data[pos], data[pos + 1]
+            pos += 2
+            if kind in (0x80, 0x90) and channel != MIDI_PERCUSSION_CHANNEL:
+                notes.append((tick, int(kind == 0x90 and velocity > 0), channel, note))
+    return tick
+
+def get_tick_seconds(division, tempos):
+    """
+    Fonction tick -> secondes selon la carte des tempos (120 noires par minute avant le premier).
+
+    :param division: Champ division de l'en-tête : ticks par noire, ou (bit 15) images SMPTE par seconde
+                     et ticks par image, auquel cas le tempo est ignoré.
+    """
+    if division & 0x8000:
+        frames_per_second = 256 - (division >> 8)
+        frames_per_second = 29.97 if frames_per_second == 29 else frames_per_second
+        seconds_per_tick = 1.0 / (frames_per_second * (division & 0xFF))
+        return lambda tick: tick * seconds_per_tick
+    # Segments (tick de début, secondes à ce tick, secondes par tick)
+    segments = [(0, 0.0, 0.5 / division)]
+    for tick, microseconds in sorted(tempos):
+        start_tick, start_seconds, seconds_per_tick = segments[-1]
+        segment = (tick, start_seconds + (tick - start_tick) * seconds_per_tick, microseconds / 1e6 / division)
+        if tick == start_tick:
+            segments[-1] = segment
+        else:
+            segments.append(segment)
+    segment_ticks = [segment[0] for segment in segments]
+
+    def tick_seconds(tick):
+        start_tick, start_seconds, seconds_per_tick = segments[bisect.bisect_right(segment_ticks, tick) - 1]
+        return start_seconds + (tick - start_tick) * seconds_per_tick
+    return tick_seconds
+
+def read_midi_file(path):
+    """
+    Notes d'un fichier Standard MIDI (toutes pistes et canaux confondus, hors batterie).
+
+    :return: Liste de (début, fin, numéro MIDI) en secondes, dans l'ordre.
+    :raise ValueError: Fichier qui n'est pas un fichier MIDI lisible.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"MThd" or len(data) < 14:
+        raise ValueError("not a Standard MIDI File")
+    header_length = struct.unpack(">I", data[4:8])[0]
+    if header_length < 6 or 8 + header_length > len(data):
+        raise ValueError("invalid MIDI header")
+    _midi_format, track_count, division = struct.unpack(">HHH", data[8:14])
+    if division == 0:
+        raise ValueError("invalid time division")
+    notes = []
+    tempos = []
+    last_tick = 0
+    pos = 8 + header_length
+    try:
+        while track_count > 0 and pos + 8 <= len(data):
+            chunk_id, length = data[pos:pos + 4], struct.unpack(">I", data[pos + 4:pos + 8])[0]
+            pos += 8
+            if chunk_id == b"MTrk":
+                last_tick = max(last_tick, read_midi_track(data, pos, min(pos + length, len(data)), notes, tempos))
+                track_count -= 1
+            pos += length
+    except IndexError:
+        raise ValueError("truncated MIDI file") from None
+    tick_seconds = get_tick_seconds(division, tempos)
+    # Fins avant débuts au même tick : une note répétée se termine avant de reprendre
+    notes.sort(key=lambda note: note[:2])
+    started = {}  # (canal, numéro MIDI) -> ticks de début des notes en cours
+    events = []
+    for tick, is_start, channel, note in notes:
+        if is_start:
+            started.setdefault((channel, note), []).append(tick)
+        elif started.get((channel, note)):
+            start = started[(channel, note)].pop(0)
+            events.append((tick_seconds(start), tick_seconds(tick), note))
+    # Notes jamais relâchées : jusqu'à la fin du morceau
+    events += [(tick_seconds(start), tick_seconds(last_tick), note)
+               for (_channel, note), starts in started.items() for start in starts]
+    return sorted(events)
+
+class MidiStreamParser:
+    """Décode un flux MIDI brut, reçu par morceaux, en messages de canal (statut, donnée 1, donnée 2)."""
+    def __init__(self):
+        self.status = None
+        self.data = []
+        self.in_sysex = False
+
+    def feed(self, chunk):
+        messages = []
+        for byte in chunk:
+            if byte >= 0xF8:
+                continue  # temps réel (horloge, start...) : peut s'intercaler n'importe où
+            if byte >= 0x80:
+                self.in_sysex = byte == 0xF0
+                # Messages système communs : pas de running status après eux, leurs données sont ignorées
+                self.status = byte if byte < 0xF0 else None
+                self.data = []
+            elif self.status is not None and not self.in_sysex:
+                self.data.append(byte)
+                if len(self.data) == (1 if self.status & 0xF0 in (0xC0, 0xD0) else 2):
+                    messages.append((self.status, self.data[0], self.data[-1]))
+                    self.data = []  # running status : le statut reste valable
+        return messages
+
+class MidiPortFollower(NoteFollower):
+    """
+    Suit en direct un flux MIDI brut : port MIDI virtuel (/dev/snd/midiC1D0 du module snd-virmidi),
+    tube nommé ou entrée standard ("-"), par exemple alimenté par --send-midi.
+
+    Le flux est lu dans un thread ; chaque morceau est daté à sa réception puis traité dans le thread
+    de l'interface. latency mesure le retard entre réception et affichage.
+    """
+    received = Signal(float, object)  # (instant de réception, octets lus)
+
+    def __init__(self, path, parent=None):
+        super().__init__((), parent=parent)
+        self.path = path
+        self.parser = MidiStreamParser()
+        self.counts = Counter()  # (canal, numéro MIDI) -> notes en cours (une note peut être redéclenchée)
+        start = time.perf_counter()
+        self.clock = lambda: time.perf_counter() - start
+        self.received.connect(self.on_received)
+
+    def start(self):
+        fd = sys.stdin.fileno() if self.path == "-" else os.open(self.path, os.O_RDONLY)
+        threading.Thread(target=self.read, args=(fd,), daemon=True).start()
+
+    def read(self, fd):
+        while True:
+            chunk = os.read(fd, 256)
+            if not chunk:
+                break
+            self.received.emit(self.clock(), chunk)
+        self.received.emit(self.clock(), None)  # fin du flux
+
+    def on_received(self, arrival, chunk):
+        if chunk is None:
+            self.counts.clear()
+            self.set_notes(frozenset(), [arrival])
+            self.finished.emit()
+            return
+        for status, note, velocity in self.parser.feed(chunk):
+            kind, channel = status & 0xF0, status & 0x0F
+            if channel == MIDI_PERCUSSION_CHANNEL or kind not in (0x80, 0x90):
+                continue
+            if kind == 0x90 and velocity > 0:
+                self.counts[(channel, note)] += 1
+            elif self.counts[(channel, note)] > 0:
+                self.counts[(channel, note)] -= 1
+        self.set_notes(frozenset(note for (_channel, note), count in self.counts.items() if count > 0), [arrival])
+
+def run_midi_send(args):
+    """
+    Écrit les notes d'un fichier MIDI en temps réel sur la sortie standard, en octets MIDI bruts
+    (--send-midi) : un port virtuel de substitution pour --follow-port -, sans matériel.
+    """
+    try:
+        events = read_midi_file(args.send_midi)
+    except (OSError, ValueError) as error:
+        print(f"{args.send_midi}: {error}", file=sys.stderr)
+        return 1
+    messages = sorted([(start, 1, bytes((0x90, note, MIDI_SEND_VELOCITY))) for start, _end, note in events]
+                      + [(end, 0, bytes((0x80, note, 0))) for _start, end, note in events])
+    output = sys.stdout.buffer
+    start = time.perf_counter()
+    try:
+        for when, _is_start, message in messages:
+            delay = when - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            output.write(message)
+            output.flush()
+    except BrokenPipeError:
+        pass
+    return 0
+
+# =============================================================================
+# EXPORT EN LIGNE DE COMMANDE (--export)
+# =============================================================================
+_export_app = None  # QApplication propre à chaque processus d'export
+
+def _init_export_worker():
+    """Crée l'application Qt hors écran d'un processus d'export."""
+    global _export_app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    _export_app = QApplication.instance() or QApplication([sys.argv[0]])
+
+def build_diagram_scene(pattern_name, num_strings, num_frets, num_columns, show_all_colors=False):
+    """Construit hors écran la même grille de manches que update_scene, avec le nom du pattern en titre."""
+    scene = QGraphicsScene()
+    scene.setBackgroundBrush(Qt.black)
+    title_item = QGraphicsTextItem(f"Visual Practice : {pattern_name}")
+    title_item.setFont(get_shared_font("Engraved MT", 18))
+    title_item.setDefaultTextColor(QColor(255, 165, 0))
+    title_item.setPos(0, -80)
+    scene.addItem(title_item)
+    layout = build_scene_layout(pattern_name, Chords_scales, num_strings, num_columns, num_frets)
+    SceneUpdater(scene).apply(layout, show_all_colors)
+    return scene
+
+def export_file_name(pattern_name, num_strings, num_frets, num_columns):
+    slug = "".join(c if c.isalnum() else "_" for c in pattern_name).strip("_")
+    while "__" in slug:
+        slug = slug.replace("__", "_")
+    return f"{slug}_{num_strings}s_{num_frets}f_{num_columns}c"
+
+def export_diagram(job):
+    """
+    Exporte un pattern (tâche d'un processus du pool).
+
+    :param job: (pattern_name, num_strings, num_frets, num_columns, show_all_colors, output_dir, formats)
+    :return: (liste des fichiers écrits, durée en secondes)
+    """
+    pattern_name, num_strings, num_frets, num_columns, show_all_colors, output_dir, formats = job
+    start = time.perf_counter()
+    if _export_app is None:
+        _init_export_worker()
+    scene = build_diagram_scene(pattern_name, num_strings, num_frets, num_columns, show_all_colors)
+    source = scene.itemsBoundingRect().adjusted(-20, -20, 20, 20)
+    base_path = os.path.join(output_dir, export_file_name(pattern_name, num_strings, num_frets, num_columns))
+    written = []
+    if "png" in formats:
+        image = QImage(round(source.width()), round(source.height()), QImage.Format_RGB32)
+        image.fill(Qt.black)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+        scene.render(painter, QRectF(image.rect()), source)
+        painter.end()
+        image.save(base_path + ".png")
+        written.append(base_path + ".png")
+    if "svg" in formats:
+        from PySide6.QtSvg import QSvgGenerator
+        generator = QSvgGenerator()
+        generator.setFileName(base_path + ".svg")
+        generator.setSize(QSize(round(source.width()), round(source.height())))
+        generator.setViewBox(QRectF(0, 0, source.width(), source.height()))
+        generator.setTitle(f"Visual Practice : {pattern_name}")
+        painter = QPainter(generator)
+        painter.fillRect(QRectF(0, 0, source.width(), source.height()), Qt.black)
+        scene.render(painter, QRectF(0, 0, source.width(), source.height()), source)
+        painter.end()
+        written.append(base_path + ".svg")
+    return written, time.perf_counter() - start
+
+def run_export(args):
+    """Exporte tous les patterns demandés en parallèle et affiche un résumé."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.makedirs(args.export, exist_ok=True)
+    pattern_names = get_pattern_names()
+    if args.patterns:
+        pattern_names = [name for name in pattern_names if any(p.lower() in name.lower() for p in args.patterns)]
+    else:
+        # Les galeries reprennent les manches des autres patterns en une seule très grande image
+        pattern_names = [name for name in pattern_names
+                         if name not in GALLERY_PATTERNS and name != NOTE_FINDER_PATTERN]
+    formats = set(args.formats.split(","))
+    jobs = [(pattern_name, num_strings, num_frets, num_columns, args.colors, args.export, formats)
+            for pattern_name in pattern_names
+            for num_strings in args.strings
+            for num_frets in args.frets
+            for num_columns in args.columns]
+    if not jobs:
+        print("Nothing to export.")
+        return 1
+
+    from concurrent.futures import ProcessPoolExecutor
+    workers = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    durations = []
+    files = 0
+    if workers == 1:
+        results = list(map(export_diagram, jobs))
+    else:
+        # Une tâche par (pattern, cordes, cases, colonnes), distribuées par paquets aux processus
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker) as executor:
+            results = list(executor.map(export_diagram, jobs, chunksize=max(1, len(jobs) // (8 * workers))))
+    for written, duration in results:
+        files += len(written)
+        durations.append(duration)
+    elapsed = time.perf_counter() - start
+
+    print(f"Exported {files} files ({len(jobs)} diagrams) to {args.export} in {elapsed:.2f} s with {workers} process(es)")
+    print(f"Throughput: {len(jobs) / elapsed:.1f} diagrams/s")
+    print(f"Per diagram: mean {1000 * sum(durations) / len(durations):.1f} ms, "
+          f"min {1000 * min(durations):.1f} ms, max {1000 * max(durations):.1f} ms")
+    return 0
+
+# =============================================================================
+# BENCHMARKS (--benchmark)
+# =============================================================================
+BENCHMARK_THRESHOLD_PERCENT = 20  # ralentissement toléré avant de signaler une régression
+BENCHMARK_NOISE_FACTOR = 3  # un ralentissement doit aussi dépasser ce multiple de la dispersion des deux mesures
+BENCHMARK_MIN_DELTA_MS = 0.05  # et cet écart absolu (mesures de moins d'une milliseconde)
+BENCHMARK_COMPARE_REPEAT = 10  # séries par mesure quand le résultat est comparé (--compare)
+
+def _measure(func, number=1, repeat=5):
+    """Temps par appel en ms : meilleur et moyenne sur `repeat` séries de `number` appels."""
+    import gc
+    import timeit
+    gc.collect()  # chaque mesure part d'un tas nettoyé des objets laissés par les précédentes
+    timings = []
+    for _ in range(repeat):
+        # Sans boucle d'événements, les notifications de changement des scènes s'accumulent et ralentissent
+        # chaque removeItem suivant : elles sont traitées entre deux séries, comme dans l'interface
+        QApplication.processEvents()
+        timings.append(timeit.timeit(func, number=number) * 1000 / number)
+    return {"min_ms": min(timings), "mean_ms": sum(timings) / len(timings), "runs": number * repeat}
+
+def run_benchmarks(output_path=None, quick=False, repeat=None):
+    """
+    Mesure les fonctions de théorie, la construction d'un manche et la mise à jour complète de la scène.
+
+    :param output_path: Fichier JSON où écrire les résultats (optionnel).
+    :param quick: Moins de répétitions et de configurations, pour une vérification rapide.
+    :param repeat: Séries par mesure (par défaut 3 avec quick, sinon 5).
+    :return: Dictionnaire {"meta": ..., "results": {nom: mesures}}.
+    """
+    import platform
+    _init_export_worker()
+    if repeat is None:
+        repeat = 3 if quick else 5
+    results = {}
+
+    # Niveau micro : fonctions de théorie
+    results["theory/get_note_by_interval"] = _measure(
+        lambda: [get_note_by_interval(note, interval, use_sharps)
+                 for note in ("C", "F#", "Eb", "E#") for interval in range(12) for use_sharps in (True, False)
+                 if use_sharps or "#" not in note], number=200, repeat=repeat)
+    results["theory/generate_scale"] = _measure(
+        lambda: [generate_scale(root, intervals) for root in notes_sharp for intervals in SCALE_TYPES.values()],
+        number=50, repeat=repeat)
+    results["theory/generate_scales_in_cycle"] = _measure(
+        lambda: [generate_scales_in_cycle(scale_type, "minor" in scale_type) for scale_type in SCALE_TYPES],
+        number=50, repeat=repeat)
+    results["theory/build_scene_layout"] = _measure(
+        lambda: [build_scene_layout(name, Chords_scales, 7, 3, 12) for name in get_pattern_names()],
+        number=5, repeat=repeat)
+
+    # Niveau manche : construction d'un GuitarNeck pour 4 à 10 cordes x 12 à 24 cases
+    scene = QGraphicsScene()
+    for num_strings in ((4, 7, 10) if quick else range(4, 11)):
+        for num_frets in ((12, 24) if quick else (12, 16, 20, 24)):
+            string_tunings = tuple(get_string_tunings(num_strings))
+
+            def build_neck():
+                neck = GuitarNeck(scene, 0, 0, num_strings, num_frets)
+                chord_notes, note_degrees, use_sharps = get_chord_pattern("G", "maj7")
+                neck.set_notes(compute_neck_notes(string_tunings, num_frets, chord_notes, note_degrees, use_sharps))
+                neck.set_root_label("G maj7")
+                neck.remove()
+            results[f"neck/chord/{num_strings}s_{num_frets}f"] = _measure(build_neck, number=10, repeat=repeat)
+
+            def build_scale_neck():
+                neck = GuitarNeck(scene, 0, 0, num_strings, num_frets)
+                neck.set_notes(compute_neck_notes(string_tunings, num_frets, get_notes_by_mode("D", "dorian"), {},
+                                                  True))
+                neck.remove()
+            results[f"neck/scale/{num_strings}s_{num_frets}f"] = _measure(build_scale_neck, number=10, repeat=repeat)
+
+    # Niveau scène : les trois catégories du menu, reconstruction complète puis mise à jour différentielle
+    categories = {
+        "scales": list(SCALE_TYPES.keys()),
+        "all_chords": [f"All Chords -{name}" for name in CHORDS_INTERVALS],
+        "chords_in_scale": [f"Chords in Scale ({name})" for name in Chords_scales],
+    }
+    for num_strings, num_frets in (((7, 12),) if quick else ((7, 12), (10, 24))):
+        for category, pattern_names in categories.items():
+            def full_rebuild():
+                updater = SceneUpdater(QGraphicsScene())
+                for pattern_name in pattern_names:
+                    updater.apply(build_scene_layout(pattern_name, Chords_scales, num_strings, 3, num_frets), False)
+                    updater.clear()
+            results[f"scene/rebuild/{category}/{num_strings}s_{num_frets}f"] = _measure(
+                full_rebuild, number=1, repeat=repeat)
+
+            updater = SceneUpdater(QGraphicsScene())
+            def cycle_patterns():
+                for pattern_name in pattern_names:
+                    updater.apply(build_scene_layout(pattern_name, Chords_scales, num_strings, 3, num_frets), False)
+            results[f"scene/update/{category}/{num_strings}s_{num_frets}f"] = _measure(
+                cycle_patterns, number=1, repeat=repeat)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "qt": qVersion(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+def get_benchmark_noise(baseline_measure, current_measure):
+    """
+    Écart en ms en dessous duquel une différence de meilleur temps n'est pas significative.
+
+    La dispersion d'une mesure est l'écart entre sa moyenne et son meilleur temps : le bruit de la machine
+    pendant cette série. Les mesures de moins d'une milliseconde ont en plus un plancher absolu.
+    """
+    spread = sum(measure["mean_ms"] - measure["min_ms"] for measure in (baseline_measure, current_measure))
+    return max(BENCHMARK_MIN_DELTA_MS, BENCHMARK_NOISE_FACTOR * spread)
+
+def compare_benchmarks(baseline, current, threshold_percent=BENCHMARK_THRESHOLD_PERCENT):
+    """
+    Compare deux résultats de run_benchmarks (meilleur temps par mesure).
+
+    Une mesure n'est en régression que si elle ralentit de plus de threshold_percent et d'un écart plus
+    grand que le bruit des deux séries (get_benchmark_noise) ; sinon elle est marquée "noise".
+
+    :return: (lignes du rapport, liste des noms en régression)
+    """
+    lines = [f"{'benchmark':<45} {'baseline ms':>12} {'current ms':>12} {'change':>8}"]
+    regressions = []
+    for name, measure in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            lines.append(f"{name:<45} {'-':>12} {measure['min_ms']:>12.3f} {'new':>8}")
+            continue
+        change = (measure["min_ms"] / previous["min_ms"] - 1) * 100 if previous["min_ms"] else 0.0
+        flag = ""
+        if change > threshold_percent:
+            if measure["min_ms"] - previous["min_ms"] > get_benchmark_noise(previous, measure):
+                regressions.append(name)
+                flag = "  REGRESSION"
+            else:
+                flag = "  noise"
+        lines.append(f"{name:<45} {previous['min_ms']:>12.3f} {measure['min_ms']:>12.3f} {change:>+7.1f}%{flag}")
+    return lines, regressions
+
+def run_benchmark_command(args):
+    # Une comparaison demande des meilleurs temps stables : plus de séries par mesure
+    report = run_benchmarks(args.benchmark, quick=args.quick,
+                            repeat=BENCHMARK_COMPARE_REPEAT if args.compare else None)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressions = compare_benchmarks(baseline, report, args.threshold)
+        print("\n".join(lines))
+        print(f"{len(regressions)} regression(s) above {args.threshold}% and the measured noise")
+        return 1 if regressions else 0
+    for name, measure in report["results"].items():
+        print(f"{name:<45} min {measure['min_ms']:>10.3f} ms   mean {measure['mean_ms']:>10.3f} ms")
+    return 0
+
+def run_render_benchmark(render_profiles, profile_names, frames=RENDER_BENCHMARK_FRAMES, qt_args=()):
+    """
+    Stress test de défilement et de zoom : la même scène est parcourue avec chaque profil de rendu,
+    chaque image étant dessinée de façon synchrone. À lancer sur la machine visée (pas hors écran).
+
+    :return: {profil: {"fps": ..., "ms_per_frame": ...}}, None pour un profil inutilisable.
+    """
+    app = QApplication.instance() or QApplication([sys.argv[0]] + list(qt_args))
+    results = {}
+    for name in profile_names:
+        scene = build_diagram_scene("major", 7, 12, 3, show_all_colors=True)
+        background = load_background_item()
+        if background is not None:
+            scene.addItem(background)
+        view = ZoomableGraphicsView(scene)
+        if not view.apply_render_profile(render_profiles[name]):
+            results[name] = None
+            continue
+        view.resize(1280, 800)
+        view.show()
+        app.processEvents()
+        if render_profiles[name]["opengl"] and not view.viewport().isValid():
+            # Contexte d'essai créé mais pas celui du viewport (format multi-échantillonné refusé...)
+            results[name] = None
+            view.close()
+            continue
+        gesture = render_profiles[name]["antialiasing"] == "idle"
+        if gesture:
+            # Seule la politique "idle" change de réglages pendant un geste : on mesure ceux du geste
+            view.set_interacting(True)
+        start = time.perf_counter()
+        for frame in range(frames):
+            # Zoom avant puis arrière par cycles de 80 images, en défilant en diagonale
+            zoom_factor = 1.02 if frame % 80 < 40 else 1 / 1.02
+            view.scale(zoom_factor, zoom_factor)
+            direction = 1 if frame // 80 % 2 == 0 else -1
+            view.horizontalScrollBar().setValue(view.horizontalScrollBar().value() + 12 * direction)
+            view.verticalScrollBar().setValue(view.verticalScrollBar().value() + 6 * direction)
+            view.viewport().repaint()
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        if gesture:
+            view.set_interacting(False)
+        results[name] = {"fps": frames / elapsed, "ms_per_frame": 1000 * elapsed / frames}
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+    return results
+
+def run_render_benchmark_command(args, render_profiles, qt_args):
+    if args.render_benchmark == "all":
+        profile_names = list(render_profiles)
+    else:
+        profile_names = args.render_benchmark.split(",")
+        unknown = [name for name in profile_names if name not in render_profiles]
+        if unknown:
+            print(f"Unknown render profile(s): {', '.join(unknown)}", file=sys.stderr)
+            return 1
+    results = run_render_benchmark(render_profiles, profile_names, args.frames, qt_args)
+    print(f"{'profile':<16} {'fps':>8} {'ms/frame':>10}")
+    for name, result in results.items():
+        if result is None:
+            print(f"{name:<16} {'unavailable':>19}")
+        else:
+            print(f"{name:<16} {result['fps']:>8.1f} {result['ms_per_frame']:>10.2f}")
+    return 0
+
+def _int_list(text):
+    return [int(value) for value in text.split(",")]
+
+BACKGROUND_IMAGE = "guitar.png"
+BACKGROUND_OPACITY = 0.3
+# Rendu de l'arrière-plan : "baked" (opacité pré-appliquée + mipmaps), "effect" (QGraphicsOpacityEffect), "none"
+BACKGROUND_MODE = "baked"
+BACKGROUND_MIP_LEVELS = 4  # pleine résolution, 1/2, 1/4, 1/8
+
+class BackgroundItem(QGraphicsItem):
+    """
+    Image d'arrière-plan dont la transparence est appliquée une fois pour toutes sur fond noir.
+
+    Une petite pyramide de versions réduites est préparée au chargement ; paint() choisit la plus
+    petite qui couvre le niveau de détail du zoom courant et ne copie que la zone exposée.
+    """
+    def __init__(self, image, opacity=BACKGROUND_OPACITY, levels=BACKGROUND_MIP_LEVELS, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.size = QRectF(0, 0, image.width(), image.height())
+        baked = QImage(image.size(), QImage.Format_RGB32)
+        baked.fill(Qt.black)  # même couleur que le fond de la vue
+        painter = QPainter(baked)
+        painter.setOpacity(opacity)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        self.mipmaps = [QPixmap.fromImage(baked)]
+        for _ in range(levels - 1):
+            previous = self.mipmaps[-1]
+            if previous.width() < 64:
+                break
+            self.mipmaps.append(previous.scaled(previous.width() // 2, previous.height() // 2,
+                                                Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+    def boundingRect(self) -> QRectF:
+        return self.size
+
+    def paint(self, painter, option, widget=None):
+        level_of_detail = option.levelOfDetailFromTransform(painter.worldTransform())
+        # Plus petite version qui a au moins autant de pixels que l'écran en affiche
+        pixmap = self.mipmaps[0]
+        for candidate in self.mipmaps[1:]:
+            if candidate.width() / self.size.width() < level_of_detail:
+                break
+            pixmap = candidate
+        target = option.exposedRect.intersected(self.size)
+        ratio = pixmap.width() / self.size.width()
+        source = QRectF(target.x() * ratio, target.y() * ratio, target.width() * ratio, target.height() * ratio)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        painter.drawPixmap(target, pixmap, source)
+
+def load_background_item(image_path=BACKGROUND_IMAGE, mode=BACKGROUND_MODE):
+    """Image d'arrière-plan agrandie par 2 et semi-transparente, ou None si elle est absente ou désactivée."""
+    if mode == "none":
+        return None
+    image_path = find_data_file(image_path)
+    if image_path is None:
+        return None
+    image = QImage(image_path)
+    if image.isNull():
+        return None
+    # Agrandir l'image par 2
+    scaled_image = image.scaled(image.width() * 2, image.height() * 2, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    if mode == "baked":
+        image_item = BackgroundItem(scaled_image)
+    else:
+        image_item = QGraphicsPixmapItem(QPixmap.fromImage(scaled_image))
+        opacity_effect = QGraphicsOpacityEffect()
+        opacity_effect.setOpacity(BACKGROUND_OPACITY)  # X% de transparence
+        image_item.setGraphicsEffect(opacity_effect)
+    image_item.setPos(0, 0)  # Positionne l'image
+    image_item.setZValue(-1)  # ajoutée après les manches, elle doit rester dessous
+    return image_item
+
+class StartupReport:
+    """
+    Chronologie du démarrage jusqu'à la première image (--startup-report), à partir de la fin des imports
+    (_STARTUP_T0) ; le temps d'import se mesure à part avec python -X importtime.
+    """
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.marks = [("module setup", time.perf_counter())]
+        self.expected = {"first frame", "background"}
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        self.marks.append((phase, time.perf_counter()))
+        self.expected.discard(phase)
+        if not self.expected:
+            self.print()
+            self.enabled = False
+
+    def print(self):
+        print("Startup report (ms)")
+        previous = _STARTUP_T0
+        for phase, timestamp in self.marks:
+            print(f"  {phase:<22} {1000 * (timestamp - previous):8.1f}   total {1000 * (timestamp - _STARTUP_T0):8.1f}")
+            previous = timestamp
+
+class UpdateScheduler(QObject):
+    """
+    Regroupe les rafales de demandes de mise à jour en une seule reconstruction.
+
+    Chaque demande relance un court délai ; à son expiration, start_update() fournit
+    (étapes, fin) pour l'état demandé le plus récent. Les étapes sont exécutées par tranches
+    de slice_ms millisecondes entre lesquelles la boucle d'événements reprend la main, et une
+    nouvelle demande annule la reconstruction en cours.
+    """
+    def __init__(self, start_update, delay_ms=UPDATE_DELAY_MS, slice_ms=UPDATE_SLICE_MS, parent=None):
+        super().__init__(parent)
+        self.start_update = start_update
+        self.delay_ms = delay_ms
+        self.slice_ms = slice_ms
+        self.delay_timer = QTimer(self)
+        self.delay_timer.setSingleShot(True)
+        self.delay_timer.timeout.connect(self.begin)
+        self.slice_timer = QTimer(self)
+        self.slice_timer.setSingleShot(True)
+        self.slice_timer.setInterval(0)
+        self.slice_timer.timeout.connect(self.run_slice)
+        self.steps = None
+        self.finish = None
+        self.requested = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self.completed = 0
+
+    def request(self, *args):
+        """Slot connecté aux signaux de changement (les arguments du signal sont ignorés)."""
+        self.requested += 1
+        if self.delay_timer.isActive():
+            self.coalesced += 1
+        if self.steps is not None:
+            self.cancel()
+        self.delay_timer.start(self.delay_ms)
+
+    def cancel(self):
+        self.slice_timer.stop()
+        self.steps = None
+        self.finish = None
+        self.cancelled += 1
+
+    def flush(self):
+        """Exécute immédiatement et entièrement la mise à jour demandée."""
+        self.delay_timer.stop()
+        if self.steps is not None:
+            self.cancel()
+        self.steps, self.finish = self.start_update()
+        for _ in self.steps:
+            pass
+        self.complete()
+
+    def begin(self):
+        self.steps, self.finish = self.start_update()
+        self.run_slice()
+
+    def run_slice(self):
+        if self.steps is None:
+            return
+        deadline = time.perf_counter() + self.slice_ms / 1000 if self.slice_ms > 0 else None
+        for _ in self.steps:
+            if deadline is not None and time.perf_counter() >= deadline:
+                self.slice_timer.start()
+                return
+        self.complete()
+
+    def complete(self):
+        finish = self.finish
+        self.steps = None
+        self.finish = None
+        self.completed += 1
+        if finish is not None:
+            finish()
+
+    def stats(self):
+        return {"requested": self.requested, "coalesced": self.coalesced,
+                "cancelled": self.cancelled, "completed": self.completed}
+
+class LayoutPrefetcher(QObject):
+    """
+    Calcule à l'avance, pendant que l'interface est inactive, la disposition des `depth` patterns
+    suivants et précédents du menu pour les réglages courants.
+
+    get_layout() sert la disposition prête si elle existe (hit), sinon la calcule (miss). Seuls les
+    patterns paginés sont précalculés (galeries et recherche se construisent à la demande). Une mise à
+    jour en cours arrête le précalcul : la fin de la mise à jour le relance (schedule).
+    """
+    def __init__(self, depth=PREFETCH_DEPTH, cache_size=PREFETCH_CACHE_SIZE, is_busy=None, parent=None):
+        super().__init__(parent)
+        self.depth = depth
+        self.cache_size = cache_size
+        self.is_busy = is_busy  # callable : vrai tant qu'une mise à jour est en cours
+        self.layouts = OrderedDict()  # (pattern, cordes, colonnes, cases, accordage) -> disposition
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(0)
+        self.idle_timer.timeout.connect(self.prefetch_next)
+
+    def get_layout(self, pattern_name, num_strings, num_columns, num_frets, string_tunings=None):
+        key = (pattern_name, num_strings, num_columns, num_frets, string_tunings)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            self.hits += 1
+            self.layouts.move_to_end(key)
+            return layout
+        self.misses += 1
+        return self.store(key)
+
+    def store(self, key):
+        layout = build_scene_layout(key[0], Chords_scales, key[1], key[2], key[3], key[4])
+        self.layouts[key] = layout
+        while len(self.layouts) > self.cache_size:
+            self.layouts.popitem(last=False)
+        return layout
+
+    def schedule(self, pattern_names, current_index, num_strings, num_columns, num_frets, string_tunings=None):
+        """Prépare le précalcul des voisins de current_index : +1, -1, +2, -2, ... (menu circulaire)."""
+        self.pending = []
+        count = len(pattern_names)
+        for distance in range(1, self.depth + 1):
+            for index in (current_index + distance, current_index - distance):
+                pattern_name = pattern_names[index % count]
+                if pattern_name in GALLERY_PATTERNS or pattern_name == NOTE_FINDER_PATTERN:
+                    continue
+                key = (pattern_name, num_strings, num_columns, num_frets, string_tunings)
+                if key not in self.layouts and key not in self.pending:
+                    self.pending.append(key)
+        if self.pending:
+            self.idle_timer.start()
+
+    def prefetch_next(self):
+        """Calcule une disposition par passage dans la boucle d'événements."""
+        if self.is_busy is not None and self.is_busy():
+            # Pas d'attente active pendant la mise à jour : schedule() relance le précalcul à sa fin
+            self.idle_timer.stop()
+            return
+        if not self.pending:
+            self.idle_timer.stop()
+            return
+        key = self.pending.pop(0)
+        if key not in self.layouts:
+            self.store(key)
+            self.prefetched += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "prefetched": self.prefetched,
+                "cached": len(self.layouts), "pending": len(self.pending), "depth": self.depth}
+
+def parse_args(argv, render_profiles=RENDER_PROFILES, render_profile=RENDER_PROFILE,
+               zoom_range=(ZOOM_MIN_SCALE, ZOOM_MAX_SCALE)):
+    """
+    Options de ligne de commande ; les options inconnues sont laissées à Qt.
+
+    :param render_profiles: Profils proposés à --render-profile (RENDER_PROFILES et ceux de la configuration).
+    :param render_profile: Profil par défaut (entrée "render_profile" de la configuration).
+    :param zoom_range: Bornes par défaut de l'échelle (entrées "zoom_min" / "zoom_max" de la configuration).
+    """
+    parser = argparse.ArgumentParser(description="Visual Practice")
+    parser.add_argument("--render-profile", choices=list(render_profiles), default=render_profile,
+                        help="view rendering profile: update mode, scene index, caching, antialiasing and "
+                             "OpenGL viewport (default: %(default)s, or \"render_profile\" in " + CONFIG_FILE + ")")
+    parser.add_argument("--pixmap-cache", action="store_true",
+                        help="display each neck as a cached pre-rendered image (not with --follow / --follow-port)")
+    parser.add_argument("--pixmap-cache-mb", type=int, default=PIXMAP_CACHE_MAX_MB,
+                        help="memory budget of the rendered diagram cache (default: %(default)s MB)")
+    parser.add_argument("--note-labels", choices=("painted", "item"), default=NOTE_LABEL_MODE,
+                        help="draw note names directly (painted) or with one text item per note (item)")
+    parser.add_argument("--pixmap-hires", action="store_true",
+                        help="re-render cached diagrams at higher resolution when zooming in")
+    parser.add_argument("--update-delay", type=int, default=UPDATE_DELAY_MS, metavar="MS",
+                        help="delay used to coalesce bursts of setting changes (default: %(default)s ms)")
+    parser.add_argument("--slice-ms", type=int, default=UPDATE_SLICE_MS, metavar="MS",
+                        help="longest uninterrupted slice of scene building, 0 to build at once "
+                             "(default: %(default)s ms)")
+    parser.add_argument("--prefetch-depth", type=int, default=PREFETCH_DEPTH, metavar="N",
+                        help="precompute the layouts of the N next and previous patterns while idle, "
+                             "0 to disable (default: %(default)s)")
+    parser.add_argument("--background", choices=("baked", "effect", "none"), default=BACKGROUND_MODE,
+                        help="background image rendering: pre-baked opacity with mipmaps, live opacity effect, "
+                             "or no background (default: %(default)s)")
+    parser.add_argument("--tunings", default=TUNINGS_CONFIG_FILE, metavar="JSON",
+                        help="file of user tunings, {\"name\": [\"E\", \"B\", ...]} from highest to lowest string, "
+                             f"{STRING_COUNTS[0]} to {STRING_COUNTS[-1]} strings (default: %(default)s, optional)")
+    parser.add_argument("--positions-cache", default=POSITIONS_CACHE_FILE, metavar="JSON",
+                        help="file caching the scale positions of each tuning, empty to disable "
+                             "(default: %(default)s in the current folder if present, else next to the script)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the time to first frame broken down by startup phase, from the end of the "
+                             "imports (measure those with python -X importtime)")
+    lod_group = parser.add_argument_group("level of detail", "view scales (1.0 = actual size) below which "
+                                          "details are dropped, 0 to always draw them")
+    lod_group.add_argument("--lod-labels", type=float, default=LOD_LABEL_MIN, metavar="SCALE",
+                           help="hide note names (default: %(default)s)")
+    lod_group.add_argument("--lod-dots", type=float, default=LOD_DOT_MIN, metavar="SCALE",
+                           help="draw notes as plain dots in their degree color (default: %(default)s)")
+    lod_group.add_argument("--lod-outline", type=float, default=LOD_OUTLINE_MAX, metavar="SCALE",
+                           help="draw only the outline of each neck (default: %(default)s)")
+    zoom_group = parser.add_argument_group("zoom")
+    zoom_group.add_argument("--zoom-min", type=float, default=zoom_range[0], metavar="SCALE",
+                            help="smallest view scale reachable with the wheel (default: %(default)s, "
+                                 "or \"zoom_min\" in " + CONFIG_FILE + ")")
+    zoom_group.add_argument("--zoom-max", type=float, default=zoom_range[1], metavar="SCALE",
+                            help="largest view scale reachable with the wheel (default: %(default)s, "
+                                 "or \"zoom_max\" in " + CONFIG_FILE + ")")
+    profile_group = parser.add_argument_group("profiling")
+    profile_group.add_argument("--profile", action="store_true",
+                               help=f"time each update_scene phase and paint, with an overlay toggled by F3 "
+                                    f"(also enabled by {PROFILE_ENV_VAR}=1)")
+    profile_group.add_argument("--profile-log", default=PROFILE_LOG_FILE,
+                               help="JSON lines file receiving the measurements (default: %(default)s)")
+    profile_group.add_argument("--cprofile", metavar="PROF", help="run the session under cProfile and write PROF on exit")
+    export_group = parser.add_argument_group("batch export")
+    export_group.add_argument("--export", metavar="DIR",
+                              help="render the diagrams headlessly into DIR instead of opening the window")
+    export_group.add_argument("--formats", default="png", help="comma separated list of png,svg (default: png)")
+    export_group.add_argument("--patterns", nargs="*",
+                              help="only export patterns whose name contains one of these "
+                                   "(galleries are only exported when selected this way)")
+    export_group.add_argument("--strings", type=_int_list, default=list(range(4, 11)),
+                              help="comma separated string counts (default: 4..10)")
+    export_group.add_argument("--frets", type=_int_list, default=[12], help="comma separated fret counts (default: 12)")
+    export_group.add_argument("--columns", type=_int_list, default=[3], help="comma separated column counts (default: 3)")
+    export_group.add_argument("--colors", action="store_true", help="export with all degree colours")
+    export_group.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    benchmark_group = parser.add_argument_group("benchmarks")
+    benchmark_group.add_argument("--benchmark", metavar="JSON", nargs="?", const="",
+                                 help="run the headless benchmark suite, optionally writing the results to JSON")
+    benchmark_group.add_argument("--compare", metavar="JSON",
+                                 help="baseline results to compare the run against (each measure is then repeated "
+                                      f"{BENCHMARK_COMPARE_REPEAT} times)")
+    benchmark_group.add_argument("--threshold", type=float, default=BENCHMARK_THRESHOLD_PERCENT,
+                                 help="slowdown in percent reported as a regression, when it is also above the "
+                                      "measured noise (default: %(default)s)")
+    benchmark_group.add_argument("--quick", action="store_true", help="fewer repetitions and configurations")
+    benchmark_group.add_argument("--render-benchmark", metavar="PROFILES", nargs="?", const="all",
+                                 help="pan/zoom stress test reporting the frame rate of each render profile "
+                                      "(comma separated, default: all)")
+    benchmark_group.add_argument("--frames", type=int, default=RENDER_BENCHMARK_FRAMES,
+                                 help="frames drawn per profile by --render-benchmark (default: %(default)s)")
+    audio_group = parser.add_argument_group("audio", "synthesized playback of one diagram (needs NumPy)")
+    audio_group.add_argument("--audio", metavar="WAV",
+                             help="write the notes of one diagram to WAV instead of opening the window")
+    audio_group.add_argument("--audio-pattern", default=next(iter(SCALE_TYPES)), metavar="PATTERN",
+                             help="menu pattern played by --audio (default: %(default)s)")
+    audio_group.add_argument("--audio-neck", type=int, default=0, metavar="N",
+                             help="diagram of the pattern, in menu order from 0 (default: %(default)s)")
+    audio_group.add_argument("--audio-strings", type=int, choices=range(4, 11), default=6, metavar="N",
+                             help="string count (default: %(default)s)")
+    audio_group.add_argument("--audio-frets", type=int, choices=range(12, 25), default=12, metavar="N",
+                             help="fret count (default: %(default)s)")
+    audio_group.add_argument("--audio-voicing", type=int, default=0, metavar="N",
+                             help="for chords, strum voicing N instead of arpeggiating every chord tone")
+    follow_group = parser.add_argument_group("follow-along", "notes of a WAV recording (needs NumPy) or of MIDI "
+                                             "lit up on the displayed diagrams, which are flagged when they do not "
+                                             "contain them; the display delay is shown in the header")
+    follow_group.add_argument("--follow", metavar="FILE",
+                              help="play a WAV recording of single notes (every octave of the notes heard is lit, "
+                                   "chords are not detected) or a Standard MIDI File (.mid, the exact positions of "
+                                   "each note are lit) in the window")
+    follow_group.add_argument("--follow-port", metavar="PATH",
+                              help="follow raw MIDI bytes live from a virtual MIDI port (e.g. /dev/snd/midiC1D0 of "
+                                   "snd-virmidi), a named pipe, or - for standard input")
+    follow_group.add_argument("--send-midi", metavar="MID",
+                              help="write the notes of a MIDI file as raw MIDI bytes on standard output in real time "
+                                   "instead of opening the window, a stand-in port for --follow-port -")
+    follow_group.add_argument("--detect-notes", metavar="WAV",
+                              help="print the notes detected in a recording instead of opening the window; one note "
+                                   "at a time, chords and overlapping notes are left out rather than misread")
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if not 0 < args.zoom_min < args.zoom_max:
+        parser.error("expected 0 < --zoom-min < --zoom-max")
+    return args, qt_args
+
+def main():
+    # Optimisation pour High DPI et compatibilité multiplateforme
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+    
+    config, errors = load_config()
+    render_profiles, profile_errors = get_render_profiles(config)
+    zoom_range, zoom_errors = get_zoom_range(config)
+    for error in errors + profile_errors + zoom_errors:
+        print(error, file=sys.stderr)
+    render_profile = config.get("render_profile", RENDER_PROFILE)
+    if render_profile not in render_profiles:
+        print(f"Unknown render profile in {CONFIG_FILE}: {render_profile}", file=sys.stderr)
+        render_profile = RENDER_PROFILE
+    args, qt_args = parse_args(sys.argv, render_profiles, render_profile, zoom_range)
+    startup = StartupReport(args.startup_report)
+    if args.export:
+        sys.exit(run_export(args))
+    if args.audio:
+        sys.exit(run_audio_export(args))
+    if args.detect_notes:
+        sys.exit(run_note_detection(args))
+    if args.send_midi:
+        sys.exit(run_midi_send(args))
+    if args.benchmark is not None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        sys.exit(run_benchmark_command(args))
+    if args.render_benchmark is not None:
+        sys.exit(run_render_benchmark_command(args, render_profiles, qt_args))
+
+    if args.cprofile:
+        # Toute la session (démarrage compris) est profilée, le fichier .prof est écrit à la fermeture
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup.mark("application")
+    if args.cprofile:
+        app.aboutToQuit.connect(lambda: (profiler.disable(), profiler.dump_stats(args.cprofile)))
+    NoteItem.label_mode = args.note_labels
+    NoteItem.label_min_lod = args.lod_labels
+    NoteItem.dot_min_lod = args.lod_dots
+    NeckItem.outline_max_lod = args.lod_outline
+    
+    dark_palette = QPalette()
+    dark_palette.setColor(QPalette.Window, Qt.black)  # Fond noir
+    dark_palette.setColor(QPalette.WindowText, Qt.white)  # Texte blanc
+    dark_palette.setColor(QPalette.Base, Qt.black)  # Fond des widgets
+    dark_palette.setColor(QPalette.AlternateBase, Qt.darkGray)
+    dark_palette.setColor(QPalette.ToolTipBase, Qt.white)
+    dark_palette.setColor(QPalette.ToolTipText, Qt.white)
+    dark_palette.setColor(QPalette.Text, Qt.white)
+    dark_palette.setColor(QPalette.Button, Qt.darkGray)
+    dark_palette.setColor(QPalette.ButtonText, Qt.white)
+    dark_palette.setColor(QPalette.Highlight, Qt.blue)
+    dark_palette.setColor(QPalette.HighlightedText, Qt.black)
+    # Appliquer la palette
+    app.setPalette(dark_palette)
+    
+    scene = QGraphicsScene()
+
+    # L'image d'arrière-plan est chargée après la première image affichée (voir load_background)
+    scene.image_item = None
+
+    # Ajoute le texte
+    scene.text_item = QGraphicsTextItem("Visual Practice : ")
+    font = QFont("Engraved MT", 18)
+    font.setBold(True)
+    scene.text_item.setFont(font)
+    scene.text_item.setDefaultTextColor(QColor(255, 165, 0))
+
+    # Créer un QComboBox et ajouter les noms des patterns
+    combo_box = SpaceComboBox()
+    combo_box.setMaxVisibleItems(30)
+    combo_box.setFont(font)
+    combo_box.setPalette(dark_palette)  
+    combo_box.setFocusPolicy(Qt.StrongFocus)  # important pour recevoir la barre d’espace
+
+
+    # Remplacer la vue interne par un QListView pour accéder aux barres de défilement
+    view = QListView()
+    combo_box.setView(view)
+
+    # Élargir la scrollbar verticale
+    scrollbar = view.verticalScrollBar()
+    scrollbar.setFixedWidth(35)  # largeur en px
+    
+    # Élargir la liste déroulante
+    view.setMinimumWidth(450)  # largeur de la fenêtre déroulante en px
+    
+    #ajout des éléments
+    for pattern_name in get_pattern_names():
+        combo_box.addItem(pattern_name)
+
+    # =============================================================================
+    # POSITIONS DES ÉLÉMENTS DE L'INTERFACE - Modifier ici pour ajuster la disposition
+    # =============================================================================
+    pos_visual_practice_x = 300
+    pos_visual_practice_y = -50
+    
+    pos_combo_box_x = 500
     pos_combo_box_y = -50
     
     pos_strings_label_x = 1080
@@ -625,6 +3968,26 @@ def main():
     
     pos_checkbox_x = 0
     pos_checkbox_y = -50
+
+    pos_finder_label_x = 880
+    pos_finder_label_y = -100
+    pos_finder_edit_x = 980
+    pos_finder_edit_y = -100
+    pos_finder_mode_x = 1280
+    pos_finder_mode_y = -100
+
+    pos_tuning_label_x = 1500
+    pos_tuning_label_y = -100
+    pos_tuning_combo_x = 1620
+    pos_tuning_combo_y = -100
+
+    pos_position_label_x = 1760
+    pos_position_label_y = -50
+    pos_position_combo_x = 1900
+    pos_position_combo_y = -50
+
+    pos_follow_x = 1900
+    pos_follow_y = -100
     # =============================================================================
 
     # Positionne le texte centré en haut
@@ -644,7 +4007,7 @@ def main():
     text_strings.setPos(pos_strings_label_x, pos_strings_label_y)
     scene.addItem(text_strings)
     
-    string_combo_box = create_styled_combo_box(font, dark_palette, [(i, i) for i in range(4, 11)], "7")
+    string_combo_box = create_styled_combo_box(font, dark_palette, [(i, i) for i in STRING_COUNTS], "7")
     proxy2 = QGraphicsProxyWidget()
     proxy2.setWidget(string_combo_box)
     proxy2.setPos(pos_strings_combo_x, pos_strings_combo_y)
@@ -719,78 +4082,427 @@ def main():
     proxy_checkbox.setPos(pos_checkbox_x, pos_checkbox_y)
     proxy_checkbox.setZValue(100)
     scene.addItem(proxy_checkbox)
+
+    # Accordages : préréglages et fichier de l'utilisateur
+    tuning_registry = TuningRegistry()
+    tunings_path = find_data_file(args.tunings)
+    if tunings_path is not None:
+        for error in tuning_registry.load(tunings_path):
+            print(f"{tunings_path}: {error}", file=sys.stderr)
+    elif args.tunings != TUNINGS_CONFIG_FILE:
+        print(f"Tunings file not found: {args.tunings}", file=sys.stderr)
+
+    text_tuning = QGraphicsTextItem("Tuning : ")
+    text_tuning.setFont(font)
+    text_tuning.setDefaultTextColor(QColor(255, 165, 0))
+    text_tuning.setPos(pos_tuning_label_x, pos_tuning_label_y)
+    scene.addItem(text_tuning)
+
+    tuning_combo_box = create_styled_combo_box(font, dark_palette, tuning_registry.names(), STANDARD_TUNING)
+    tuning_combo_box.setMaxVisibleItems(20)
+    proxy_tuning = QGraphicsProxyWidget()
+    proxy_tuning.setWidget(tuning_combo_box)
+    proxy_tuning.setPos(pos_tuning_combo_x, pos_tuning_combo_y)
+    proxy_tuning.setZValue(100)
+    scene.addItem(proxy_tuning)
+
+    # Positions des gammes : tout le manche, boxes ou N notes par corde (Gauche / Droite pour les parcourir)
+    positions_cache = args.positions_cache or None
+    if positions_cache == POSITIONS_CACHE_FILE:
+        # Fichier par défaut : relu là où find_data_file le trouve, sinon créé à côté du script
+        positions_cache = find_data_file(POSITIONS_CACHE_FILE) or get_script_file(POSITIONS_CACHE_FILE)
+    position_index = ScalePositionIndex(positions_cache)
+    for error in position_index.load():
+        print(error, file=sys.stderr)
+
+    text_position = QGraphicsTextItem("Position : ")
+    text_position.setFont(font)
+    text_position.setDefaultTextColor(QColor(255, 165, 0))
+    text_position.setPos(pos_position_label_x, pos_position_label_y)
+    scene.addItem(text_position)
+
+    position_combo_box = create_styled_combo_box(
+        font, dark_palette, [("Whole neck", None)] + [(label, kind) for kind, label in POSITION_KINDS.items()])
+    proxy_position = QGraphicsProxyWidget()
+    proxy_position.setWidget(position_combo_box)
+    proxy_position.setPos(pos_position_combo_x, pos_position_combo_y)
+    proxy_position.setZValue(100)
+    scene.addItem(proxy_position)
+
+    # Recherche des gammes et accords contenant des notes (pattern NOTE_FINDER_PATTERN)
+    note_finder = NoteFinder()
+    text_finder = QGraphicsTextItem("Notes : ")
+    text_finder.setFont(font)
+    text_finder.setDefaultTextColor(QColor(255, 165, 0))
+    text_finder.setPos(pos_finder_label_x, pos_finder_label_y)
+    scene.addItem(text_finder)
+
+    finder_edit = QLineEdit()
+    finder_edit.setFont(font)
+    finder_edit.setPalette(dark_palette)
+    finder_edit.setFixedWidth(280)
+    finder_edit.setPlaceholderText("C E G")
+    proxy_finder_edit = QGraphicsProxyWidget()
+    proxy_finder_edit.setWidget(finder_edit)
+    proxy_finder_edit.setPos(pos_finder_edit_x, pos_finder_edit_y)
+    proxy_finder_edit.setZValue(100)
+    scene.addItem(proxy_finder_edit)
+
+    finder_mode_combo_box = create_styled_combo_box(
+        font, dark_palette, [(label, mode) for mode, label in NoteFinder.MODES.items()])
+    proxy_finder_mode = QGraphicsProxyWidget()
+    proxy_finder_mode.setWidget(finder_mode_combo_box)
+    proxy_finder_mode.setPos(pos_finder_mode_x, pos_finder_mode_y)
+    proxy_finder_mode.setZValue(100)
+    scene.addItem(proxy_finder_mode)
     
     
-    def clear_scene():
-        # More efficient: filter and remove in one pass
-        for item in [i for i in scene.items() if isinstance(i, (NeckItem, NoteItem, NoteTextItem, FretLabelItem, ChordLabelItem))]:
-            scene.removeItem(item)
+    pixmap_cache = DiagramPixmapCache(args.pixmap_cache_mb * 1024 * 1024) if args.pixmap_cache else None
+    if pixmap_cache is not None and (args.follow or args.follow_port):
+        # Les notes suivies sont allumées sur les NoteItems : les images du cache n'en ont pas
+        print("--pixmap-cache is ignored with --follow and --follow-port (notes are lit on the neck items)",
+              file=sys.stderr)
+        pixmap_cache = None
+    monitor = None
+    if args.profile or os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0"):
+        monitor = PerformanceMonitor(args.profile_log)
+        app.aboutToQuit.connect(monitor.close)
+    # Le rectangle de la scène est recalculé à chaque mise à jour : en-tête + manches affichés
+    header_rect = scene.itemsBoundingRect()
+    scene.setSceneRect(header_rect)
+    scene_updater = SceneUpdater(scene, pixmap_cache=pixmap_cache, monitor=monitor)
+    gallery_updater = GalleryUpdater(scene, scene_updater.pool)
+    if monitor:
+        monitor.add_counters("pool", scene_updater.pool.stats)
+        if pixmap_cache is not None:
+            monitor.add_counters("pixmaps", pixmap_cache.stats)
+    # Notes suivies (--follow, --follow-port) : index des NoteItems reconstruit après chaque mise à jour
+    note_highlighter = NoteHighlighter(lambda: scene_updater.necks + list(gallery_updater.necks.values()))
 
-    def update_scene():
-        num_strings = string_combo_box.currentData()
+    def start_update():
+        """Lit les réglages courants et prépare (étapes, fin) de la mise à jour correspondante."""
+        # Un accordage autre que "Standard" impose son nombre de cordes
+        string_tunings = tuning_registry.get(tuning_combo_box.currentText(), string_combo_box.currentData())
+        num_strings = len(string_tunings)
         num_columns = columns_combo_box.currentData()
         num_frets = frets_combo_box.currentData()
         show_all_colors = color_checkbox.isChecked()
-        
-        # Cache frequently used multipliers
-        x_multiplier = 62.5 * num_frets
-        y_multiplier = 42 * num_strings
-        
-        clear_scene()
         selected_pattern_name = combo_box.currentText()
-    
-        # Vérifier si on a sélectionné une gamme diatonique
-        if "Chords in Scale" in selected_pattern_name:
-            key = selected_pattern_name.split("(")[-1].strip(")")
-            if key in Chords_scales:
-                scale = Chords_scales[key]
-                for i, (root, chord_type) in enumerate(scale):
-                    x_offset = (i % num_columns) * x_multiplier
-                    y_offset = (i // num_columns) * y_multiplier
-                    guitar_neck = GuitarNeck(scene, x_offset, y_offset, num_strings, num_frets, show_all_colors=show_all_colors)
-                    guitar_neck.generate_chord_notes(root, chord_type)
-
-                for i in range(7, 12):  # keep blank guitar neck
-                    x_offset = (i % num_columns) * x_multiplier
-                    y_offset = (i // num_columns) * y_multiplier
-                    guitar_neck = GuitarNeck(scene, x_offset, y_offset, num_strings, num_frets, show_all_colors=show_all_colors)
-        #---------------------------------------------------------------------------------------
-        elif "All Chords -" in selected_pattern_name:
-            pattern = selected_pattern_name.split("-")[-1]
-            cycle = cycle_of_fifths_minor if "minor" in pattern else cycle_of_fifths_major
-            for i, tonality in enumerate(cycle):
-                x_offset = (i % num_columns) * x_multiplier
-                y_offset = (i // num_columns) * y_multiplier
-                guitar_neck = GuitarNeck(scene, x_offset, y_offset, num_strings, num_frets, show_all_colors=show_all_colors)
-                guitar_neck.generate_chord_notes(tonality.split()[0], pattern)
-        #---------------------------------------------------------------------------------------
+
+        if monitor:
+            monitor.begin_update(selected_pattern_name)
+        phase = monitor.phase if monitor else lambda name: _NO_PHASE
+
+        # Seules les différences avec la scène actuelle sont appliquées
+        with phase("layout"):
+            if selected_pattern_name == NOTE_FINDER_PATTERN:
+                # Dépend des notes choisies : jamais mis en cache par le prefetcher
+                layout = note_finder.build_layout(num_strings, num_columns, num_frets, string_tunings)
+            elif voicing_index[0] and is_chord_pattern(selected_pattern_name):
+                # Doigtés mémorisés par accord (find_chord_voicings) : pas de prefetch ; chaque accord est
+                # cherché à l'étape de son manche, dans les tranches du planificateur
+                layout = iter_neck_layouts(selected_pattern_name, Chords_scales, num_columns, num_frets,
+                                           string_tunings, voicing_index[0])
+            elif position_combo_box.currentData() is not None and selected_pattern_name in SCALE_TYPES:
+                # Positions lues dans l'index : pas de prefetch
+                layout = build_scene_layout(selected_pattern_name, Chords_scales, num_strings, num_columns, num_frets,
+                                            string_tunings, scale_position=(position_index,
+                                                                            position_combo_box.currentData(),
+                                                                            position_number[0]))
+            else:
+                layout = prefetcher.get_layout(selected_pattern_name, num_strings, num_columns, num_frets,
+                                               string_tunings)
+        # Un changement de notes dans la recherche ou de doigté garde le zoom et la position de la vue
+        settings = (selected_pattern_name, string_tunings, num_columns, num_frets, show_all_colors)
+        reset_view = settings != last_settings[0]
+        last_settings[0] = settings
+        scene_updater.render_scale = 1.0  # la vue revient au zoom initial
+        if isinstance(layout, GalleryLayout):
+            # Galerie : rien n'est construit ici, les manches visibles le sont quand la vue est placée
+            scene_updater.clear()
+            gallery_updater.set_layout(layout, show_all_colors)
+            steps = iter(())
         else:
-            Scales = generate_scales_in_cycle(selected_pattern_name, is_minor="minor" in selected_pattern_name)
-            for i, (tonality, scale) in enumerate(Scales.items()):
-                x_offset = (i % num_columns) * x_multiplier
-                y_offset = (i // num_columns) * y_multiplier
-                key_info = get_key_signature(tonality)
-                use_sharps = key_info["use_sharps"]
-                guitar_neck = GuitarNeck(scene, x_offset, y_offset, num_strings, num_frets, scale, show_all_colors=show_all_colors)
-                guitar_neck.create_root_label(f"{tonality.split()[0]} {selected_pattern_name}")
-                guitar_neck.create_notes(use_sharps)
-        view.resetTransform()
-        view.scale(1 / 1.4, 1 / 1.4)
-        view.centerOn(0, 0)
-        combo_box.setFocus()
-
-    # Connecter le signal currentIndexChanged du QComboBox à la méthode update_scene
-    combo_box.currentIndexChanged.connect(update_scene)
-    string_combo_box.currentTextChanged.connect(update_scene)
-    columns_combo_box.currentTextChanged.connect(update_scene)
-    frets_combo_box.currentTextChanged.connect(update_scene)
-    color_checkbox.stateChanged.connect(update_scene)
+            gallery_updater.clear()
+            steps = scene_updater.apply_steps(layout, show_all_colors)
+
+        def finish():
+            with phase("view"):
+                # Manches réellement appliqués (une disposition calculée pendant les étapes n'est pas une liste)
+                applied = layout if isinstance(layout, GalleryLayout) else scene_updater.layout
+                content_rect = header_rect.united(get_layout_rect(applied))
+                scene.setSceneRect(QRectF(QPointF(-SCENE_MARGIN, -SCENE_MARGIN),
+                                          content_rect.bottomRight() + QPointF(SCENE_MARGIN, SCENE_MARGIN)))
+                if reset_view:
+                    view.set_zoom(1 / 1.4)
+                    view.centerOn(0, 0)
+                gallery_updater.set_visible_rect(view.visible_scene_rect())
+                note_highlighter.invalidate()
+            if reset_view:
+                combo_box.setFocus()
+            if monitor:
+                monitor.end_update(scene)
+            # L'utilisateur passe presque toujours au pattern suivant ou précédent
+            if prefetcher.depth > 0:
+                prefetcher.schedule(pattern_names, combo_box.currentIndex(), num_strings, num_columns, num_frets,
+                                    string_tunings)
+
+        return steps, finish
+
+    last_settings = [None]  # réglages de la dernière mise à jour (voir reset_view)
+    voicing_index = [0]  # doigté affiché sur les manches d'accords, 0 = toutes les notes de l'accord
+    position_number = [1]  # position affichée sur les manches de gammes (type choisi dans position_combo_box)
+    update_scheduler = UpdateScheduler(start_update, args.update_delay, args.slice_ms)
+    if monitor:
+        monitor.add_counters("scheduler", update_scheduler.stats)
+    pattern_names = get_pattern_names()
+    prefetcher = LayoutPrefetcher(args.prefetch_depth,
+                                  is_busy=lambda: update_scheduler.steps is not None
+                                  or update_scheduler.delay_timer.isActive())
+    if monitor:
+        monitor.add_counters("prefetch", prefetcher.stats)
+
+    def update_scene():
+        """Met à jour la scène immédiatement, sans attendre le regroupement des signaux."""
+        update_scheduler.flush()
+
+    def reset_step():
+        """Un autre pattern ou accordage repart du premier doigté ou de la première position."""
+        voicing_index[0] = 0
+        position_number[0] = 1
+
+    def on_pattern_changed(_index):
+        reset_step()
+        update_scheduler.request()
+
+    def on_string_count_changed(_text):
+        reset_step()
+        update_scheduler.request()
+
+    # Les changements de réglages passent par le planificateur qui regroupe les rafales
+    combo_box.currentIndexChanged.connect(on_pattern_changed)
+    string_combo_box.currentTextChanged.connect(on_string_count_changed)
+    columns_combo_box.currentTextChanged.connect(update_scheduler.request)
+    frets_combo_box.currentTextChanged.connect(update_scheduler.request)
+    color_checkbox.stateChanged.connect(update_scheduler.request)
+
+    def on_tuning_changed(name):
+        # Le nombre de cordes suit l'accordage choisi ; seul "Standard" laisse le choisir
+        string_tunings = tuning_registry.tunings.get(name)
+        if string_tunings is not None:
+            string_combo_box.setCurrentText(str(len(string_tunings)))
+        string_combo_box.setEnabled(string_tunings is None)
+        reset_step()
+        update_scheduler.request()
+
+    tuning_combo_box.currentTextChanged.connect(on_tuning_changed)
+
+    def on_step(step):
+        # Gauche / Droite : doigté précédent / suivant de chaque accord, ou position précédente / suivante des gammes
+        pattern_name = combo_box.currentText()
+        if is_chord_pattern(pattern_name):
+            voicing_index[0] = (voicing_index[0] + step) % (VOICING_MAX_RESULTS + 1)
+            update_scheduler.request()
+        elif pattern_name in SCALE_TYPES:
+            # Tout le manche, puis chaque position de chaque type : un seul cycle parcouru dans les deux sens
+            count = len(SCALE_TYPES[pattern_name])
+            cycle = [(None, 1)] + [(kind, number) for kind in POSITION_KINDS for number in range(1, count + 1)]
+            current = (position_combo_box.currentData(), (position_number[0] - 1) % count + 1)
+            index = cycle.index(current) if current in cycle else 0
+            kind, position_number[0] = cycle[(index + step) % len(cycle)]
+            position_combo_box.blockSignals(True)
+            position_combo_box.setCurrentIndex(position_combo_box.findData(kind))
+            position_combo_box.blockSignals(False)
+            update_scheduler.request()
+
+    def on_position_kind_changed(_index):
+        position_number[0] = 1
+        if combo_box.currentText() in SCALE_TYPES:
+            update_scheduler.request()
+
+    combo_box.stepped.connect(on_step)
+    position_combo_box.currentIndexChanged.connect(on_position_kind_changed)
+
+    def show_note_finder():
+        """Affiche les résultats de la recherche (en passant sur son pattern si besoin)."""
+        if combo_box.currentText() != NOTE_FINDER_PATTERN:
+            combo_box.setCurrentText(NOTE_FINDER_PATTERN)  # déclenche la mise à jour
+        else:
+            update_scheduler.request()
+
+    def on_finder_text_edited(text):
+        note_finder.set_text(text)
+        show_note_finder()
+
+    def on_finder_mode_changed(_index):
+        note_finder.mode = finder_mode_combo_box.currentData()
+        if combo_box.currentText() == NOTE_FINDER_PATTERN:
+            update_scheduler.request()
+
+    def on_scene_clicked(point):
+        # Un clic sur une case d'un manche de la recherche ajoute ou retire sa note
+        if combo_box.currentText() != NOTE_FINDER_PATTERN or gallery_updater.layout is None:
+            return
+        pitch_class = gallery_updater.layout.pitch_class_at(point)
+        if pitch_class is not None:
+            note_finder.toggle(pitch_class)
+            finder_edit.setText(note_finder.text())
+            update_scheduler.request()
+
+    finder_edit.textEdited.connect(on_finder_text_edited)
+    finder_mode_combo_box.currentIndexChanged.connect(on_finder_mode_changed)
     view = ZoomableGraphicsView(scene)
-    view.scale(1 / 1.4, 1 / 1.4)
+    if not view.apply_render_profile(render_profiles[args.render_profile]):
+        print("OpenGL viewport unavailable (no PySide6.QtOpenGLWidgets or no OpenGL context), "
+              "using the raster viewport", file=sys.stderr)
+    if monitor:
+        view.monitor = monitor
+        overlay_shortcut = QShortcut(QKeySequence(Qt.Key_F3), view)
+        overlay_shortcut.setContext(Qt.ApplicationShortcut)
+        overlay_shortcut.activated.connect(view.toggle_overlay)
+    if args.pixmap_hires:
+        view.zoomChanged.connect(scene_updater.set_view_scale)
+
+    def on_visible_area_changed():
+        gallery_updater.set_visible_rect(view.visible_scene_rect())
+        if gallery_updater.layout is not None:
+            note_highlighter.invalidate()  # manches de la galerie matérialisés ou recyclés
+
+    view.visibleAreaChanged.connect(on_visible_area_changed)
+    view.sceneClicked.connect(on_scene_clicked)
+
+    # P : joue le manche sous la souris (NumPy pour la synthèse, QtMultimedia pour la sortie audio)
+    tone_mixer = [None]  # créé à la première lecture
+    audio_player = AudioPlayer()
+
+    def play_neck():
+        layout = gallery_updater.layout if gallery_updater.layout is not None else scene_updater.layout
+        neck_layout = get_neck_at(layout, view.mapToScene(view.mapFromGlobal(QCursor.pos())))
+        if neck_layout is None:
+            # Souris hors des manches : le premier manche affiché
+            neck_layout = next((neck for neck in layout if neck.label is not None), None)
+        if neck_layout is None or last_settings[0] is None or audio_player.available is False:
+            return
+        if tone_mixer[0] is None:
+            try:
+                tone_mixer[0] = ToneMixer(ToneBank())
+            except ImportError:
+                print("Playback needs NumPy (pip install numpy)", file=sys.stderr)
+                return
+        midi_notes = get_neck_midi_notes(last_settings[0][1], neck_layout.notes)
+        samples = tone_mixer[0].render(midi_notes, SYNTH_STRUM_SECONDS if neck_layout.voicing else SYNTH_STEP_SECONDS)
+        if not audio_player.play(samples):
+            print("No audio output (QtMultimedia or output device missing), use --audio to write a WAV file",
+                  file=sys.stderr)
+
+    play_shortcut = QShortcut(QKeySequence(Qt.Key_P), view)
+    play_shortcut.setContext(Qt.ApplicationShortcut)
+    play_shortcut.activated.connect(play_neck)
+
+    # --follow / --follow-port : notes d'un enregistrement ou de MIDI allumées sur les manches
+    note_follower = [None]
+    follow_player = [None]  # gardé en vie pendant la lecture
+    follow_text = QGraphicsTextItem("")
+    follow_text.setFont(font)
+    follow_text.setDefaultTextColor(QColor(255, 165, 0))
+    follow_text.setPos(pos_follow_x, pos_follow_y)
+    follow_stats_timer = QTimer(view)
+    follow_stats_timer.setInterval(FOLLOW_STATS_MS)
+
+    def show_follow_stats():
+        stats = note_follower[0].latency.stats()
+        if stats["events"]:
+            follow_text.setPlainText(f"Delay : {stats['mean_ms']:.1f} ± {stats['jitter_ms']:.1f} ms "
+                                     f"(max {stats['max_ms']:.0f})")
+        return stats
+
+    def on_follow_notes(notes):
+        if not note_highlighter.show(notes):
+            note_follower[0].latency.discard()
+
+    def on_frame_drawn():
+        note_follower[0].latency.frame_drawn(note_follower[0].clock())
+
+    def on_follow_finished():
+        follow_stats_timer.stop()
+        stats = show_follow_stats()
+        if stats["events"]:
+            print(f"{args.follow_port or args.follow}: {stats['events']} note changes displayed, delay "
+                  f"{stats['mean_ms']:.1f} ms avg / {stats['p95_ms']:.1f} ms p95 / {stats['max_ms']:.1f} ms max, "
+                  f"jitter {stats['jitter_ms']:.1f} ms")
+
+    def open_follower():
+        """NoteFollower de la source choisie, None (erreur affichée) si elle est illisible."""
+        if args.follow_port:
+            return MidiPortFollower(args.follow_port, parent=view)
+        if args.follow.lower().endswith((".mid", ".midi")):
+            try:
+                return NoteFollower(read_midi_file(args.follow), parent=view)
+            except (OSError, ValueError) as error:
+                print(f"{args.follow}: {error}", file=sys.stderr)
+                return None
+        try:
+            wav = open_wav(args.follow)
+        except ImportError:
+            print("--follow needs NumPy (pip install numpy)", file=sys.stderr)
+            return None
+        except (OSError, ValueError) as error:
+            print(f"{args.follow}: {error}", file=sys.stderr)
+            return None
+        start = time.perf_counter()
+        events = detect_note_events(wav)
+        print(f"{args.follow}: {len(events)} notes detected in {time.perf_counter() - start:.2f} s")
+        # L'octave détectée n'est pas sûre : toutes les octaves de la note entendue sont allumées
+        note_highlighter.by_pitch_class = True
+        follow_player[0] = AudioPlayer(wav.sample_rate, wav.samples.shape[1], wav.sample_format)
+        if follow_player[0].play_file(args.follow, wav.offset):
+            # Les notes suivent le son réellement envoyé à la sortie
+            return NoteFollower(events, follow_player[0].position, parent=view)
+        print("No audio output (QtMultimedia or output device missing), following the recording silently",
+              file=sys.stderr)
+        return NoteFollower(events, parent=view)
+
+    def start_follow():
+        follower = open_follower()
+        if follower is None:
+            return
+        note_follower[0] = follower
+        follower.notesChanged.connect(on_follow_notes)
+        follower.finished.connect(on_follow_finished)
+        view.frameDrawn.connect(on_frame_drawn)
+        scene.addItem(follow_text)
+        follow_stats_timer.timeout.connect(show_follow_stats)
+        follow_stats_timer.start()
+        try:
+            follower.start()
+        except OSError as error:
+            print(f"{args.follow_port}: {error}", file=sys.stderr)
+            follow_stats_timer.stop()
+
+    view.min_scale, view.max_scale = args.zoom_min, args.zoom_max
+    view.set_zoom(1 / 1.4)
     view.centerOn(0, 0)
+    startup.mark("scene and widgets")
     # Initialiser la scène avec le premier pattern
     update_scene()
+    startup.mark("first update_scene")
+
+    def load_background():
+        scene.image_item = load_background_item(mode=args.background)
+        if scene.image_item is not None:
+            scene.addItem(scene.image_item)
+        startup.mark("background")
+
+    def first_frame():
+        startup.mark("first frame")
+        # Décodage et agrandissement de l'image une fois la première image affichée
+        QTimer.singleShot(0, load_background)
+        if args.follow or args.follow_port:
+            QTimer.singleShot(0, start_follow)
+
+    view.on_first_paint = first_frame
     view.showMaximized()
+    startup.mark("show")
 
     sys.exit(app.exec())
 
@@ -0,0 +1,21 @@
+import pytest
+
+import Visual_Practice as VP
+
+# Accords ouverts usuels en accordage standard, de la corde la plus aiguë à la plus grave (None = étouffée)
+OPEN_SHAPES = {
+    ("C", "major"): (0, 1, 0, 2, 3, None),  # x32010
+    ("G", "major"): (3, 0, 0, 0, 2, 3),  # 320003
+    ("E", "major"): (0, 0, 1, 2, 2, 0),  # 022100
+    ("F", "major"): (1, 1, 2, 3, None, None),  # xx3211
+    ("A", "minor"): (0, 1, 2, 2, 0, None),  # x02210
+    ("D", "major"): (2, 3, 2, 0, None, None),  # xx0232
+}
+
+
+@pytest.mark.parametrize("root, chord_type", list(OPEN_SHAPES))
+def test_open_shapes_are_found(root, chord_type):
+    pitch_class = VP.NOTE_TO_PITCH_CLASS[root]
+    voicings = VP.find_chord_voicings(tuple(VP.get_string_tunings(6)), 12, VP.get_chord_mask(chord_type, pitch_class),
+                                      pitch_class)
+    assert OPEN_SHAPES[(root, chord_type)] in voicings
@@ -0,0 +1,39 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import Visual_Practice as VP
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_busy_update_stops_the_idle_timer(app):
+    busy = [True]
+    prefetcher = VP.LayoutPrefetcher(depth=1, is_busy=lambda: busy[0])
+    pattern_names = VP.get_pattern_names()
+    prefetcher.schedule(pattern_names, 0, 6, 3, 12)
+    assert prefetcher.idle_timer.isActive()
+    prefetcher.prefetch_next()
+    # Pas d'attente active pendant la mise à jour ; sa fin relance le précalcul
+    assert not prefetcher.idle_timer.isActive() and prefetcher.prefetched == 0
+    busy[0] = False
+    prefetcher.schedule(pattern_names, 0, 6, 3, 12)
+    assert prefetcher.idle_timer.isActive()
+    prefetcher.prefetch_next()
+    assert prefetcher.prefetched == 1
+
+
+def test_only_paged_patterns_are_prefetched(app):
+    prefetcher = VP.LayoutPrefetcher(depth=2)
+    pattern_names = VP.get_pattern_names()
+    # Voisins du premier pattern dans le menu circulaire : la recherche et les galeries le précèdent
+    prefetcher.schedule(pattern_names, 0, 6, 3, 12)
+    names = {key[0] for key in prefetcher.pending}
+    assert names == {pattern_names[1], pattern_names[2]}
+    prefetcher.idle_timer.stop()
@@ -0,0 +1,51 @@
+import struct
+
+import pytest
+
+import Visual_Practice as VP
+
+# Piste à 480 ticks par noire : C4 puis E4 en running status, tempo doublé au tick 960, une note de batterie
+TRACK = bytes([
+    0x00, 0x90, 0x3C, 0x64,  # C4 au tick 0
+    0x83, 0x60, 0x3C, 0x00,  # running status : vélocité 0 = fin de C4 au tick 480
+    0x00, 0x40, 0x64,  # E4 au tick 480
+    0x00, 0x99, 0x24, 0x64,  # batterie (canal 10), ignorée
+    0x83, 0x60, 0xFF, 0x51, 0x03, 0x03, 0xD0, 0x90,  # 250000 µs par noire à partir du tick 960
+    0x83, 0x60, 0x80, 0x40, 0x00,  # fin de E4 au tick 1440
+    0x00, 0xFF, 0x2F, 0x00,
+])
+
+
+def midi_file(track=TRACK, division=480):
+    return b"MThd" + struct.pack(">IHHH", 6, 0, 1, division) + b"MTrk" + struct.pack(">I", len(track)) + track
+
+
+def write(tmp_path, content):
+    path = tmp_path / "song.mid"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_running_status_and_tempo_change(tmp_path):
+    assert VP.read_midi_file(write(tmp_path, midi_file())) == [(0.0, 0.5, 60), (0.5, 1.25, 64)]
+
+
+def test_truncated_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="truncated MIDI file"):
+        VP.read_midi_file(write(tmp_path, midi_file()[:3 - len(TRACK)]))
+    with pytest.raises(ValueError, match="not a Standard MIDI File"):
+        VP.read_midi_file(write(tmp_path, midi_file()[:10]))
+
+
+def test_stream_parser_skips_realtime_bytes():
+    parser = VP.MidiStreamParser()
+    # Horloge (0xF8) et start (0xFA) au milieu d'un message, puis running status coupé entre deux morceaux
+    assert parser.feed(bytes([0x90, 0xF8, 0x3C, 0xFA, 0x64, 0x40])) == [(0x90, 0x3C, 0x64)]
+    assert parser.feed(bytes([0xF8, 0x64, 0xC0, 0x05, 0x80, 0x3C, 0x00])) == [(0x90, 0x40, 0x64), (0xC0, 0x05, 0x05),
+                                                                         (0x80, 0x3C, 0x00)]
+
+
+def test_stream_parser_drops_sysex_data():
+    parser = VP.MidiStreamParser()
+    assert parser.feed(bytes([0xF0, 0x7E, 0x7F, 0x09, 0x01, 0xF7, 0x3C, 0x64])) == []
+    assert parser.feed(bytes([0x90, 0x3C, 0x64])) == [(0x90, 0x3C, 0x64)]
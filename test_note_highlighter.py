@@ -0,0 +1,47 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+import Visual_Practice as VP
+
+DROP_D = tuple(VP.TUNING_PRESETS["Drop D"])
+
+
+@pytest.fixture(scope="module")
+def scene():
+    app = QApplication.instance() or QApplication([])
+    yield QGraphicsScene()
+    app.processEvents()
+
+
+def lit_positions(necks):
+    return {(string, fret) for neck in necks for (string, fret), item in neck.note_items.items() if item.highlighted}
+
+
+def test_drop_d_open_low_string_is_lit(scene):
+    # Accords de ré majeur : le ré à vide de la corde grave (MIDI 38) fait partie des notes affichées
+    updater = VP.SceneUpdater(scene)
+    updater.apply(VP.build_scene_layout("All Chords -major", VP.Chords_scales, 6, 3, 12, DROP_D), False)
+    necks = [neck for neck in updater.necks if neck.root_label_item and neck.root_label_item.toPlainText() == "D major"]
+    assert necks and necks[0].string_tunings == DROP_D
+    highlighter = VP.NoteHighlighter(lambda: necks)
+    assert highlighter.show({38})
+    assert lit_positions(necks) == {(5, 0)}
+    updater.clear()
+
+
+def test_tuning_change_rebuilds_the_index(scene):
+    updater = VP.SceneUpdater(scene)
+    highlighter = VP.NoteHighlighter(lambda: updater.necks)
+    updater.apply(VP.build_scene_layout("All Chords -major", VP.Chords_scales, 6, 3, 12), False)
+    highlighter.show({40})
+    assert (5, 0) in lit_positions(updater.necks)
+    # Même géométrie, autre accordage : les manches sont reconstruits et MIDI 40 est à la case 2 de la corde grave
+    updater.apply(VP.build_scene_layout("All Chords -major", VP.Chords_scales, 6, 3, 12, DROP_D), False)
+    highlighter.invalidate()
+    assert (5, 0) not in lit_positions(updater.necks)
+    assert (5, 2) in lit_positions(updater.necks)
+    updater.clear()
@@ -0,0 +1,39 @@
+import json
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+import Visual_Practice as VP
+
+
+@pytest.fixture(scope="module")
+def scene():
+    app = QApplication.instance() or QApplication([])
+    yield QGraphicsScene()
+    app.processEvents()
+
+
+def test_counters_are_logged_and_shown(scene, tmp_path):
+    log_path = tmp_path / "profile.jsonl"
+    monitor = VP.PerformanceMonitor(str(log_path))
+    pool = VP.GraphicsItemPool(scene, 10)
+    monitor.add_counters("pool", pool.stats)
+    monitor.begin_update("major")
+    monitor.end_update(scene)
+    monitor.close()
+    record = json.loads(log_path.read_text(encoding="utf-8"))
+    assert record["counters"] == {"pool": pool.stats()}
+    assert "pool       hits 0  misses 0  discarded 0  free 0" in monitor.overlay_lines()
+
+
+def test_neck_paints_are_counted_per_frame_window():
+    monitor = VP.PerformanceMonitor(None)
+    VP.NeckItem.paint_count, VP.NeckItem.paint_time_ns = 5, 2_000_000
+    monitor.window_start -= VP.PROFILE_FRAME_WINDOW_S
+    monitor.record_paint(0.001)
+    assert monitor.last_frames["neck_paint"] == {"paint_count": 5, "paint_time_ms": 2.0}
+    assert VP.NeckItem.paint_stats()["paint_count"] == 0
+    assert "  necks 5 paints, 2.0 ms" in monitor.overlay_lines()
@@ -0,0 +1,32 @@
+import Visual_Practice as VP
+
+
+def entry(label, notes):
+    return VP.PatternEntry(label, tuple(notes), {}, True)
+
+
+C_MAJOR = entry("C major", ["C", "D", "E", "F", "G", "A", "B"])
+C_TRIAD = entry("C major chord", ["C", "E", "G"])
+A_MINOR_TRIAD = entry("A minor chord", ["A", "C", "E"])
+
+
+def mask(*notes):
+    return VP.offsets_to_mask(VP.NOTE_TO_PITCH_CLASS[note] for note in notes)
+
+
+def test_match_modes():
+    index = VP.PitchClassIndex([C_MAJOR, C_TRIAD, A_MINOR_TRIAD])
+    assert index.query(mask("C", "E")) == [C_TRIAD, A_MINOR_TRIAD, C_MAJOR]
+    assert index.query(mask("C", "E", "G", "A"), "subset") == [C_TRIAD, A_MINOR_TRIAD]
+    assert index.query(mask("E", "A", "C"), "exact") == [A_MINOR_TRIAD]
+    assert index.query(mask("C", "F#")) == []
+
+
+def test_note_finder_parses_typed_notes():
+    finder = VP.NoteFinder()
+    finder.set_text("bb, d f")
+    assert finder.mask == mask("Bb", "D", "F") and finder.text() == "D F Bb"
+    finder.mode = "exact"
+    assert [result.label for result in finder.results()] == ["Bb major chord"]
+    finder.set_text("")
+    assert finder.results() == []
@@ -0,0 +1,58 @@
+import struct
+
+import pytest
+
+import Visual_Practice as VP
+
+np = pytest.importorskip("numpy")  # dépendance optionnelle de l'analyse d'enregistrements
+
+SAMPLE_RATE = 44100
+
+
+def write_raw_wav(path, fmt, data=b"\0" * 64):
+    """WAV minimal avec un chunk fmt donné tel quel."""
+    chunks = b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+    path.write_bytes(b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks)
+    return str(path)
+
+
+def pcm_fmt(bits, channels=1, format_tag=1):
+    block_align = channels * bits // 8
+    return struct.pack("<HHIIHH", format_tag, channels, SAMPLE_RATE, SAMPLE_RATE * block_align, block_align, bits)
+
+
+@pytest.mark.parametrize("bits", [8, 24])
+def test_open_wav_rejects_unsupported_sample_sizes(tmp_path, bits):
+    with pytest.raises(ValueError, match="unsupported sample format"):
+        VP.open_wav(write_raw_wav(tmp_path / "a.wav", pcm_fmt(bits)))
+
+
+def test_open_wav_rejects_truncated_fmt_chunk(tmp_path):
+    with pytest.raises(ValueError, match="invalid fmt chunk"):
+        VP.open_wav(write_raw_wav(tmp_path / "a.wav", pcm_fmt(16)[:12]))
+
+
+def test_open_wav_maps_stereo_float(tmp_path):
+    data = np.array([[0.5, -0.5]] * 8, dtype="<f4").tobytes()
+    wav = VP.open_wav(write_raw_wav(tmp_path / "a.wav", pcm_fmt(32, 2, 3), data))
+    assert wav.samples.shape == (8, 2) and wav.sample_format == "Float" and wav.sample_rate == SAMPLE_RATE
+
+
+def test_sine_is_detected_as_a4(tmp_path):
+    path = str(tmp_path / "a4.wav")
+    time_axis = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    VP.write_wav(path, 0.5 * np.sin(2 * np.pi * 440.0 * time_axis), SAMPLE_RATE)
+    wav = VP.open_wav(path)
+    detector = VP.PitchDetector(wav.sample_rate)
+    frames = next(VP.iter_analysis_frames(wav.samples, detector.window, VP.PITCH_HOP))
+    midi, clarity = detector.estimate(frames)
+    assert set(midi.tolist()) == {69} and clarity.min() > VP.PITCH_MIN_CLARITY
+    events = VP.detect_note_events(wav, detector=detector)
+    assert [note for _, _, note in events] == [69]
+    assert events[0][1] - events[0][0] > 0.9
+
+
+def test_silence_has_no_pitch():
+    detector = VP.PitchDetector(SAMPLE_RATE)
+    midi, _ = detector.estimate(np.zeros((4, detector.window), dtype=np.float32))
+    assert (midi == -1).all()
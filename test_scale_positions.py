@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import Visual_Practice as VP
+
+STANDARD = tuple(VP.get_string_tunings(6))
+DROP_D = ("E", "B", "G", "D", "A", "D")
+
+
+def pitch_of(string_tunings, string, fret):
+    return VP.get_string_pitches(string_tunings)[string] + fret
+
+
+def test_first_box_of_c_major():
+    box = VP.compute_scale_positions(STANDARD, "major", 0)["box"][0]
+    assert box == ((5, 8), (5, 10), (5, 12), (4, 8), (4, 10), (4, 12), (3, 9), (3, 10), (3, 12),
+                   (2, 9), (2, 10), (2, 12), (1, 8), (1, 10), (1, 12), (0, 8), (0, 10), (0, 12))
+
+
+@pytest.mark.parametrize("string_tunings", [STANDARD, DROP_D])
+@pytest.mark.parametrize("scale_type, notes_per_string", [("major", 3), ("dorian", 3), ("pentatonic_minor", 2)])
+def test_positions_stay_in_the_scale(string_tunings, scale_type, notes_per_string):
+    root = VP.NOTE_TO_PITCH_CLASS["A"]
+    mask = VP.get_scale_mask(scale_type, root)
+    positions = VP.compute_scale_positions(string_tunings, scale_type, root)
+    offsets = VP.intervals_to_offsets(VP.SCALE_TYPES[scale_type])
+    assert len(positions["box"]) == len(positions["nps"]) == len(offsets)
+    for degree, (box, nps) in enumerate(zip(positions["box"], positions["nps"])):
+        for string, fret in box + nps:
+            assert mask >> (VP.NOTE_TO_PITCH_CLASS[string_tunings[string]] + fret) % 12 & 1
+        # Chaque position part du degré sur la corde la plus grave et monte note par note
+        lowest = len(string_tunings) - 1
+        assert nps[0][0] == box[0][0] == lowest and nps[0][1] == box[0][1]
+        assert (VP.NOTE_TO_PITCH_CLASS[string_tunings[lowest]] + nps[0][1]) % 12 == (root + offsets[degree]) % 12
+        pitches = [pitch_of(string_tunings, string, fret) for string, fret in nps]
+        assert pitches == sorted(set(pitches))
+        # Les notes qui tomberaient sous la case 0 (départ à vide en Drop D) sont omises
+        counts = [[string for string, _ in nps].count(string) for string in range(lowest + 1)]
+        assert max(counts) == notes_per_string
+        assert string_tunings != STANDARD or min(counts) == notes_per_string
+        assert max(fret for _, fret in box) - box[0][1] < VP.POSITION_BOX_SPAN
+
+
+def test_cache_round_trip(tmp_path):
+    path = str(tmp_path / "positions.json")
+    index = VP.ScalePositionIndex(path)
+    expected = index.get(STANDARD, "major", 0, "box", 1)
+    reloaded = VP.ScalePositionIndex(path)
+    assert reloaded.load() == [] and reloaded.loaded == 1
+    assert reloaded.get(STANDARD, "major", 0, "box", 1) == expected and reloaded.built == 0
+
+
+def test_cache_of_another_version_is_ignored(tmp_path):
+    path = tmp_path / "positions.json"
+    VP.ScalePositionIndex(str(path)).get_table(STANDARD)
+    content = json.loads(path.read_text(encoding="utf-8"))
+    assert content["version"] == VP.POSITIONS_CACHE_VERSION
+    content["version"] -= 1
+    path.write_text(json.dumps(content), encoding="utf-8")
+    stale = VP.ScalePositionIndex(str(path))
+    assert stale.load() == [] and stale.loaded == 0
@@ -0,0 +1,80 @@
+import Visual_Practice as VP
+
+# Table saisie à la main avant build_chords_scales : les gammes générées doivent la reproduire à l'identique
+HAND_TYPED_CHORDS_SCALES = {
+    "C Major": [("C", "major"), ("D", "minor"), ("E", "minor"), ("F", "major"),
+                ("G", "major"), ("A", "minor"), ("B", "diminished")],
+    "G Major": [("G", "major"), ("A", "minor"), ("B", "minor"), ("C", "major"),
+                ("D", "major"), ("E", "minor"), ("F#", "diminished")],
+    "D Major": [("D", "major"), ("E", "minor"), ("F#", "minor"), ("G", "major"),
+                ("A", "major"), ("B", "minor"), ("C#", "diminished")],
+    "A Major": [("A", "major"), ("B", "minor"), ("C#", "minor"), ("D", "major"),
+                ("E", "major"), ("F#", "minor"), ("G#", "diminished")],
+    "E Major": [("E", "major"), ("F#", "minor"), ("G#", "minor"), ("A", "major"),
+                ("B", "major"), ("C#", "minor"), ("D#", "diminished")],
+    "B Major": [("B", "major"), ("C#", "minor"), ("D#", "minor"), ("E", "major"),
+                ("F#", "major"), ("G#", "minor"), ("A#", "diminished")],
+    "F# Major": [("F#", "major"), ("G#", "minor"), ("A#", "minor"), ("B", "major"),
+                 ("C#", "major"), ("D#", "minor"), ("E#", "diminished")],
+    "C# Major": [("C#", "major"), ("D#", "minor"), ("E#", "minor"), ("F#", "major"),
+                 ("G#", "major"), ("A#", "minor"), ("B#", "diminished")],
+    "Ab Major": [("Ab", "major"), ("Bb", "minor"), ("C", "minor"), ("Db", "major"),
+                 ("Eb", "major"), ("F", "minor"), ("G", "diminished")],
+    "Eb Major": [("Eb", "major"), ("F", "minor"), ("G", "minor"), ("Ab", "major"),
+                 ("Bb", "major"), ("C", "minor"), ("D", "diminished")],
+    "Bb Major": [("Bb", "major"), ("C", "minor"), ("D", "minor"), ("Eb", "major"),
+                 ("F", "major"), ("G", "minor"), ("A", "diminished")],
+    "F Major": [("F", "major"), ("G", "minor"), ("A", "minor"), ("Bb", "major"),
+                ("C", "major"), ("D", "minor"), ("E", "diminished")],
+    "A Minor": [("A", "minor"), ("B", "diminished"), ("C", "major"), ("D", "minor"),
+                ("E", "minor"), ("F", "major"), ("G", "major")],
+    "E Minor": [("E", "minor"), ("F#", "diminished"), ("G", "major"), ("A", "minor"),
+                ("B", "minor"), ("C", "major"), ("D", "major")],
+    "B Minor": [("B", "minor"), ("C#", "diminished"), ("D", "major"), ("E", "minor"),
+                ("F#", "minor"), ("G", "major"), ("A", "major")],
+    "F# Minor": [("F#", "minor"), ("G#", "diminished"), ("A", "major"), ("B", "minor"),
+                 ("C#", "minor"), ("D", "major"), ("E", "major")],
+    "C# Minor": [("C#", "minor"), ("D#", "diminished"), ("E", "major"), ("F#", "minor"),
+                 ("G#", "minor"), ("A", "major"), ("B", "major")],
+    "G# Minor": [("G#", "minor"), ("A#", "diminished"), ("B", "major"), ("C#", "minor"),
+                 ("D#", "minor"), ("E", "major"), ("F#", "major")],
+    "D# Minor": [("D#", "minor"), ("E#", "diminished"), ("F#", "major"), ("G#", "minor"),
+                 ("A#", "minor"), ("B", "major"), ("C#", "major")],
+    "A# Minor": [("A#", "minor"), ("B#", "diminished"), ("C#", "major"), ("D#", "minor"),
+                 ("E#", "minor"), ("F#", "major"), ("G#", "major")],
+    "F Minor": [("F", "minor"), ("G", "diminished"), ("Ab", "major"), ("Bb", "minor"),
+                ("C", "minor"), ("Db", "major"), ("Eb", "major")],
+    "C Minor": [("C", "minor"), ("D", "diminished"), ("Eb", "major"), ("F", "minor"),
+                ("G", "minor"), ("Ab", "major"), ("Bb", "major")],
+    "G Minor": [("G", "minor"), ("A", "diminished"), ("Bb", "major"), ("C", "minor"),
+                ("D", "minor"), ("Eb", "major"), ("F", "major")],
+    "D Minor": [("D", "minor"), ("E", "diminished"), ("F", "major"), ("G", "minor"),
+                ("A", "minor"), ("Bb", "major"), ("C", "major")]
+}
+
+
+def test_build_chords_scales_matches_hand_typed_table():
+    chords_scales = VP.build_chords_scales()
+    assert chords_scales == HAND_TYPED_CHORDS_SCALES
+    assert list(chords_scales) == list(HAND_TYPED_CHORDS_SCALES)
+
+
+def test_transpose_mask_rotates_pitch_classes():
+    c_major = VP.get_scale_mask("major", 0)
+    assert VP.mask_to_pitch_classes(c_major) == (0, 2, 4, 5, 7, 9, 11)
+    assert VP.mask_to_pitch_classes(VP.transpose_mask(c_major, 7), 7) == (7, 9, 11, 0, 2, 4, 6)
+    assert VP.transpose_mask(0b1, 11) == 1 << 11
+    assert VP.transpose_mask(1 << 11, 1) == 0b1
+    assert VP.transpose_mask(c_major, -5) == VP.transpose_mask(c_major, 7) == VP.get_scale_mask("major", 7)
+    assert VP.transpose_mask(c_major, 12) == c_major
+
+
+def test_masked_positions_follow_the_tuning():
+    standard = tuple(VP.get_string_tunings(6))
+    positions = VP.get_masked_positions(standard, 12, 1 << VP.NOTE_TO_PITCH_CLASS["E"])
+    assert {(0, 0, 4), (5, 0, 4), (0, 12, 4), (5, 12, 4), (1, 5, 4), (4, 7, 4)} <= set(positions)
+    assert all(pitch_class == 4 for _, _, pitch_class in positions)
+    assert len(positions) == 6 + 2  # un E par corde de la case 0 à 12, deux sur les cordes de E
+    drop_d = ("E", "B", "G", "D", "A", "D")
+    assert (5, 0, 2) in VP.get_masked_positions(drop_d, 12, 1 << 2)
+    assert VP.get_masked_positions(standard, 12, 0) == ()